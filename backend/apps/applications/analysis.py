@@ -0,0 +1,185 @@
+"""
+AI analysis of applications.
+
+Pending applications are packed several to a prompt and sent through the AI
+gateway concurrently. Each analysis is cached by a hash of everything the
+prompt contains for that application (resume contents, job, cover letter), so
+the same resume applying to the same job never goes to the model twice.
+
+Applications waiting for an analysis carry an ``ai_analysis_due_at``, which a
+partial index serves to the sweep. A failed batch (model outage, missing or
+garbled reply) is retried with exponential backoff up to
+``AI_ANALYSIS_MAX_ATTEMPTS`` times, then left FAILED with the last error.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.applications.models import Application
+from apps.core.ai import PAYLOAD_MARKER, get_gateway
+from apps.core.content_cache import ContentCache
+from apps.users.resume import resume_cache
+
+# Bump when the prompt or the expected response changes
+PROMPT_VERSION = 1
+ANALYSIS_SCHEDULED_KEY = 'ai_analysis:scheduled'
+
+ai_analysis_cache = ContentCache('ai_analysis', version=PROMPT_VERSION)
+
+INSTRUCTIONS = f"""You are screening job applications. For each application in the JSON
+list after the {PAYLOAD_MARKER} line, compare the candidate with the job and reply
+with a JSON list containing one object per application, in the same order:
+{{"id": <the application id>, "fit_score": <0-100>, "summary": <two sentences>,
+"strengths": [<short phrases>], "gaps": [<short phrases>]}}
+Reply with the JSON list only."""
+
+
+def schedule_analysis():
+    """Queue one analysis run per debounce window so new applications get batched."""
+    debounce = settings.AI_ANALYSIS_DEBOUNCE_SECONDS
+    if cache.add(ANALYSIS_SCHEDULED_KEY, 1, timeout=debounce * 2):
+        from apps.applications.tasks import analyze_pending_applications
+        analyze_pending_applications.apply_async(countdown=debounce)
+
+
+def _truncate(text, limit):
+    text = (text or '').strip()
+    return text if len(text) <= limit else text[:limit] + '...'
+
+
+def build_item(application):
+    """The JSON payload describing ``application`` to the model."""
+    job = application.job
+    profile = getattr(application.candidate, 'profile', None)
+
+    resume_text = ''
+    if application.resume_sha256:
+        parsed = resume_cache.get(application.resume_sha256)
+        resume_text = parsed['text'] if parsed else ''
+    if not resume_text and profile is not None:
+        resume_text = profile.resume_text
+
+    return {
+        'id': str(application.id),
+        'job': {
+            'title': job.title,
+            'experience_level': job.experience_level,
+            'skills': [skill.name for skill in job.required_skills.all()],
+            'requirements': _truncate(job.requirements, settings.AI_MAX_FIELD_CHARS),
+            'description': _truncate(job.description, settings.AI_MAX_FIELD_CHARS),
+        },
+        'candidate': {
+            'headline': profile.headline if profile else None,
+            'years_of_experience': profile.years_of_experience if profile else None,
+            'skills': [skill.name for skill in profile.skills.all()] if profile else [],
+            'resume': _truncate(resume_text, settings.AI_MAX_RESUME_CHARS),
+        },
+        'cover_letter': _truncate(application.cover_letter, settings.AI_MAX_FIELD_CHARS),
+    }
+
+
+def item_digest(item):
+    """Cache key for an item; the application id is left out so identical content is shared."""
+    content = {key: value for key, value in item.items() if key != 'id'}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def build_prompt(items):
+    return f'{INSTRUCTIONS}\n\n{PAYLOAD_MARKER}\n{json.dumps(items)}'
+
+
+def parse_response(text, items):
+    """Map application id -> analysis from a model response, ignoring unknown ids."""
+    try:
+        rows = json.loads(text)
+    except (TypeError, ValueError):
+        return {}
+    if isinstance(rows, dict):
+        rows = [rows]
+
+    expected = {item['id'] for item in items}
+    results = {}
+    for row in rows if isinstance(rows, list) else []:
+        if isinstance(row, dict) and str(row.get('id')) in expected:
+            results[str(row['id'])] = {
+                'fit_score': row.get('fit_score'),
+                'summary': row.get('summary', ''),
+                'strengths': row.get('strengths', []),
+                'gaps': row.get('gaps', []),
+            }
+    return results
+
+
+def retry_delay(attempts):
+    delay = settings.AI_ANALYSIS_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.AI_ANALYSIS_RETRY_MAX_SECONDS))
+
+
+def analyze_applications(applications):
+    """
+    Fill ``ai_analysis`` for ``applications``. Returns ``(analyzed, cache_hits, failed)``.
+    """
+    gateway = get_gateway()
+    now = timezone.now()
+    analyzed_at = now.isoformat()
+    pending = {}
+    updates = []
+    hits = 0
+
+    for application in applications:
+        item = build_item(application)
+        digest = item_digest(item)
+        cached = ai_analysis_cache.get(digest)
+        application.ai_analysis_attempts += 1
+        if cached is not None:
+            hits += 1
+            application.ai_analysis = {**cached, 'status': 'complete', 'cached': True, 'analyzed_at': analyzed_at}
+            application.ai_analysis_status = Application.AnalysisStatus.COMPLETE
+            application.ai_analysis_due_at = None
+            updates.append(application)
+        else:
+            pending[item['id']] = (application, item, digest)
+
+    entries = list(pending.values())
+    batch_size = settings.AI_BATCH_SIZE
+    batches = [entries[start:start + batch_size] for start in range(0, len(entries), batch_size)]
+    responses = gateway.generate_many([build_prompt([item for _, item, _ in batch]) for batch in batches])
+
+    failed = 0
+    for batch, response in zip(batches, responses):
+        items = [item for _, item, _ in batch]
+        results = {} if isinstance(response, Exception) else parse_response(response, items)
+        for application, item, digest in batch:
+            result = results.get(item['id'])
+            if result is None:
+                failed += 1
+                error = str(response) if isinstance(response, Exception) else 'Missing from model response'
+                application.ai_analysis = {'status': 'failed', 'error': error, 'analyzed_at': analyzed_at}
+                application.ai_analysis_status = Application.AnalysisStatus.FAILED
+                application.ai_analysis_due_at = (
+                    now + retry_delay(application.ai_analysis_attempts)
+                    if application.ai_analysis_attempts < settings.AI_ANALYSIS_MAX_ATTEMPTS else None
+                )
+            else:
+                result['model'] = gateway.model
+                ai_analysis_cache.set(digest, result)
+                application.ai_analysis = {**result, 'status': 'complete', 'cached': False, 'analyzed_at': analyzed_at}
+                application.ai_analysis_status = Application.AnalysisStatus.COMPLETE
+                application.ai_analysis_due_at = None
+            updates.append(application)
+
+    Application.objects.bulk_update(
+        updates, ['ai_analysis', 'ai_analysis_status', 'ai_analysis_attempts', 'ai_analysis_due_at']
+    )
+    return len(updates) - failed, hits, failed
+
+
+def pending_applications():
+    """Applications due for a first analysis or a retry, longest waiting first."""
+    return Application.objects.filter(ai_analysis_due_at__lte=timezone.now()).select_related(
+        'job', 'candidate__profile'
+    ).prefetch_related('job__required_skills', 'candidate__profile__skills').order_by('ai_analysis_due_at')
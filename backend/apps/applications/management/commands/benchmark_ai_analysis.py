@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications import analysis
+from apps.core.ai import get_gateway
+
+
+class Command(BaseCommand):
+    help = 'Push synthetic applications through the AI gateway and report throughput.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=500)
+
+    def handle(self, *args, **options):
+        gateway = get_gateway()
+        if gateway.backend.name != 'stub':
+            raise CommandError('Set AI_BACKEND=stub to benchmark without calling the real model.')
+
+        items = [
+            {
+                'id': str(index),
+                'job': {'title': 'Backend Engineer', 'skills': ['Python', 'Django', 'PostgreSQL']},
+                'candidate': {'skills': ['Python', 'Django'] if index % 2 else ['Go'], 'resume': f'Resume {index}'},
+            }
+            for index in range(options['applications'])
+        ]
+        batch_size = settings.AI_BATCH_SIZE
+        prompts = [
+            analysis.build_prompt(items[start:start + batch_size])
+            for start in range(0, len(items), batch_size)
+        ]
+
+        started = time.perf_counter()
+        responses = gateway.generate_many(prompts)
+        elapsed = time.perf_counter() - started
+
+        analyzed = sum(
+            len(analysis.parse_response(response, items[index * batch_size:(index + 1) * batch_size]))
+            for index, response in enumerate(responses) if not isinstance(response, Exception)
+        )
+        self.stdout.write(
+            f'{analyzed}/{len(items)} applications in {len(prompts)} prompts, '
+            f'{elapsed:.2f}s ({analyzed / elapsed:.0f} applications/s)'
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matchscore',
+            index=models.Index(fields=['job', '-overall_score', '-id'], name='match_scores_job_rank_idx'),
+        ),
+    ]
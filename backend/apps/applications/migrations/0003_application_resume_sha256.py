@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_matchscore_match_scores_job_rank_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='resume_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
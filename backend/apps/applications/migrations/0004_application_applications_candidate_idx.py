@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_application_resume_sha256'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['candidate', '-updated_at', '-id'], name='applications_candidate_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_analysis_state(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    Application.objects.filter(ai_analysis__status='complete').update(
+        ai_analysis_status='COMPLETE', ai_analysis_attempts=1, ai_analysis_due_at=None
+    )
+    # Failures used to be final; give them another try
+    Application.objects.filter(ai_analysis__status='failed').update(
+        ai_analysis_status='FAILED', ai_analysis_attempts=1
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_applications_candidate_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='ai_analysis_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='ai_analysis_due_at',
+            field=models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='ai_analysis_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('COMPLETE', 'Complete'), ('FAILED', 'Failed')], default='PENDING', max_length=10),
+        ),
+        migrations.RunPython(backfill_analysis_state, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('ai_analysis_due_at__isnull', False)), fields=['ai_analysis_due_at'], name='applications_ai_due_idx'),
+        ),
+    ]
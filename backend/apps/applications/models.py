@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import TimeStampedModel
 from apps.users.models import User
@@ -12,21 +13,42 @@ class Application(TimeStampedModel):
         REJECTED = 'REJECTED', _('Rejected')
         ACCEPTED = 'ACCEPTED', _('Accepted')
 
+    class AnalysisStatus(models.TextChoices):
+        PENDING = 'PENDING', _('Pending')
+        COMPLETE = 'COMPLETE', _('Complete')
+        FAILED = 'FAILED', _('Failed')
+
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     candidate = models.ForeignKey(User, on_delete=models.CASCADE, related_name='applications')
     cover_letter = models.TextField(blank=True)
     resume_snapshot = models.FileField(upload_to='application_resumes/', blank=True, null=True)
+    resume_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
     match_score = models.FloatField(default=0.0)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     applied_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(blank=True, null=True)
     ai_analysis = models.JSONField(default=dict, blank=True)
+    ai_analysis_status = models.CharField(
+        max_length=10, choices=AnalysisStatus.choices, default=AnalysisStatus.PENDING
+    )
+    ai_analysis_attempts = models.PositiveSmallIntegerField(default=0)
+    # When the analysis is next tried; null once it is complete or out of attempts
+    ai_analysis_due_at = models.DateTimeField(blank=True, null=True, default=timezone.now)
 
     class Meta:
         unique_together = ('job', 'candidate')
         verbose_name = 'Application'
         verbose_name_plural = 'Applications'
         db_table = 'applications'
+        indexes = [
+            # Keyset pagination of a candidate's applications
+            models.Index(fields=['candidate', '-updated_at', '-id'], name='applications_candidate_idx'),
+            # The analysis sweep; only applications still waiting for one are indexed
+            models.Index(
+                fields=['ai_analysis_due_at'], name='applications_ai_due_idx',
+                condition=models.Q(ai_analysis_due_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.candidate.email} applied for {self.job.title}"
@@ -47,6 +69,10 @@ class MatchScore(TimeStampedModel):
         verbose_name = 'Match Score'
         verbose_name_plural = 'Match Scores'
         db_table = 'match_scores'
+        indexes = [
+            # Serves "best candidates for a job" ranking and its keyset pagination
+            models.Index(fields=['job', '-overall_score', '-id'], name='match_scores_job_rank_idx'),
+        ]
     
     def __str__(self):
         return f"Match: {self.candidate.email} -> {self.job.title} ({self.overall_score}%)"
@@ -0,0 +1,346 @@
+"""
+Vectorized candidate/job match scoring.
+
+Published jobs are loaded once into column arrays (skill bitsets, required
+years, coordinates, salary ranges) and every candidate is scored against all
+of them in a single NumPy pass. Sub-scores are in the 0-1 range internally
+and stored as percentages on ``MatchScore``.
+"""
+import math
+
+import numpy as np
+from django.conf import settings
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.applications.models import Application, MatchScore
+from apps.jobs.models import Job
+from apps.users.models import Profile
+
+EARTH_RADIUS_KM = 6371.0088
+NEUTRAL_SCORE = 0.5
+
+EXPERIENCE_LEVEL_YEARS = {
+    Job.ExperienceLevel.ENTRY: 0,
+    Job.ExperienceLevel.MID: 2,
+    Job.ExperienceLevel.SENIOR: 5,
+    Job.ExperienceLevel.EXECUTIVE: 10,
+}
+
+SCORE_FIELDS = (
+    'overall_score', 'skill_match_score', 'experience_match_score',
+    'location_match_score', 'salary_match_score',
+)
+
+
+def _nullable(values):
+    """Convert a list containing ``None`` into a float array with NaN holes."""
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+class SkillVocabulary:
+    """Maps skill ids to dense bit positions so skill sets can be stored as bitsets."""
+
+    def __init__(self):
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add(self, skill_id):
+        return self.positions.setdefault(skill_id, len(self.positions))
+
+    @property
+    def n_words(self):
+        return max(1, math.ceil(len(self.positions) / 64))
+
+    def bitset(self, skill_ids, n_words=None):
+        words = np.zeros(n_words or self.n_words, dtype=np.uint64)
+        for skill_id in skill_ids:
+            position = self.positions.get(skill_id)
+            if position is not None:
+                words[position >> 6] |= np.uint64(1) << np.uint64(position & 63)
+        return words
+
+
+class JobMatrix:
+    """Column oriented arrays describing a set of published jobs."""
+
+    def __init__(self, vocabulary, job_ids, skill_sets, experience_levels,
+                 is_remote, coordinates, salary_min, salary_max):
+        self.vocabulary = vocabulary
+        self.job_ids = job_ids
+        self.n_words = vocabulary.n_words
+
+        self.skills = np.zeros((len(job_ids), self.n_words), dtype=np.uint64)
+        for row, skill_ids in enumerate(skill_sets):
+            self.skills[row] = vocabulary.bitset(skill_ids, self.n_words)
+        self.skill_counts = np.bitwise_count(self.skills).sum(axis=1, dtype=np.int64)
+
+        self.required_years = np.array(
+            [EXPERIENCE_LEVEL_YEARS.get(level, 0) for level in experience_levels], dtype=np.float64
+        )
+        self.is_remote = np.array(is_remote, dtype=bool)
+        self.lat = np.radians(_nullable([point.y if point else None for point in coordinates]))
+        self.lon = np.radians(_nullable([point.x if point else None for point in coordinates]))
+        self.salary_min = _nullable(salary_min)
+        self.salary_max = _nullable(salary_max)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    @classmethod
+    def load(cls, queryset=None, vocabulary=None):
+        """Load published, non-deleted jobs (optionally narrowed by ``queryset``)."""
+        if queryset is None:
+            queryset = Job.active_objects.all()
+        queryset = queryset.filter(status=Job.Status.PUBLISHED, is_deleted=False)
+        vocabulary = vocabulary or SkillVocabulary()
+
+        rows = list(queryset.values_list(
+            'id', 'experience_level', 'is_remote', 'location__coordinates', 'salary_min', 'salary_max'
+        ))
+        job_ids = [row[0] for row in rows]
+
+        skills_by_job = {job_id: [] for job_id in job_ids}
+        through = Job.required_skills.through.objects.filter(job_id__in=queryset.values('id'))
+        for job_id, skill_id in through.values_list('job_id', 'skill_id').iterator(chunk_size=5000):
+            if job_id in skills_by_job:
+                vocabulary.add(skill_id)
+                skills_by_job[job_id].append(skill_id)
+
+        return cls(
+            vocabulary,
+            job_ids,
+            [skills_by_job[job_id] for job_id in job_ids],
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+            [row[3] for row in rows],
+            [row[4] for row in rows],
+            [row[5] for row in rows],
+        )
+
+
+class Candidate:
+    """Scoring inputs of a single profile."""
+
+    def __init__(self, profile_id, user_id, skills, years, location,
+                 open_to_remote, salary_min, salary_max):
+        self.profile_id = profile_id
+        self.user_id = user_id
+        self.skills = skills
+        self.years = float(years or 0)
+        self.lat = math.radians(location.y) if location else None
+        self.lon = math.radians(location.x) if location else None
+        self.open_to_remote = open_to_remote
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+
+    @classmethod
+    def iter_batches(cls, vocabulary, queryset=None, batch_size=None):
+        """Yield lists of candidates, fetching their skill bitsets one batch at a time."""
+        if queryset is None:
+            queryset = Profile.objects.filter(is_actively_looking=True)
+        batch_size = batch_size or settings.MATCH_SCORE_CANDIDATE_BATCH_SIZE
+
+        rows = queryset.order_by('id').values_list(
+            'id', 'user_id', 'years_of_experience', 'location',
+            'is_open_to_remote', 'desired_salary_min', 'desired_salary_max'
+        )
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield cls._build(vocabulary, batch)
+                batch = []
+        if batch:
+            yield cls._build(vocabulary, batch)
+
+    @classmethod
+    def _build(cls, vocabulary, rows):
+        skills_by_profile = {row[0]: [] for row in rows}
+        through = Profile.skills.through.objects.filter(profile_id__in=list(skills_by_profile))
+        for profile_id, skill_id in through.values_list('profile_id', 'skill_id'):
+            skills_by_profile[profile_id].append(skill_id)
+
+        return [
+            cls(row[0], row[1], vocabulary.bitset(skills_by_profile[row[0]]), *row[2:])
+            for row in rows
+        ]
+
+
+class MatchScoringEngine:
+    def __init__(self, jobs, weights=None):
+        self.jobs = jobs
+        self.weights = weights or settings.MATCH_SCORE_WEIGHTS
+        self.max_distance_km = settings.MATCH_SCORE_MAX_DISTANCE_KM
+
+    def skill_scores(self, candidate):
+        jobs = self.jobs
+        matched = np.bitwise_count(jobs.skills & candidate.skills).sum(axis=1, dtype=np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(jobs.skill_counts > 0, matched / jobs.skill_counts, 1.0)
+        return scores, matched
+
+    def experience_scores(self, candidate):
+        required = self.jobs.required_years
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(required > 0, np.clip(candidate.years / required, 0.0, 1.0), 1.0)
+
+    def location_scores(self, candidate):
+        jobs = self.jobs
+        distance = np.full(len(jobs), np.nan)
+
+        if candidate.lat is not None:
+            dlat = jobs.lat - candidate.lat
+            dlon = jobs.lon - candidate.lon
+            a = np.sin(dlat / 2) ** 2 + math.cos(candidate.lat) * np.cos(jobs.lat) * np.sin(dlon / 2) ** 2
+            distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+        scores = np.clip(1.0 - distance / self.max_distance_km, 0.0, 1.0)
+        scores = np.where(np.isnan(distance), NEUTRAL_SCORE, scores)
+        if candidate.open_to_remote:
+            scores = np.where(jobs.is_remote, 1.0, scores)
+        return scores, distance
+
+    def salary_scores(self, candidate):
+        jobs = self.jobs
+        if candidate.salary_min is None and candidate.salary_max is None:
+            return np.full(len(jobs), NEUTRAL_SCORE)
+
+        wanted_min = candidate.salary_min if candidate.salary_min is not None else candidate.salary_max
+        wanted_max = candidate.salary_max if candidate.salary_max is not None else candidate.salary_min
+        offered_min = np.where(np.isnan(jobs.salary_min), jobs.salary_max, jobs.salary_min)
+        offered_max = np.where(np.isnan(jobs.salary_max), jobs.salary_min, jobs.salary_max)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            low = np.maximum(wanted_min, offered_min)
+            high = np.minimum(wanted_max, offered_max)
+            # Share of the candidate's desired range covered by the offer
+            overlap = np.clip((high - low + 1) / (wanted_max - wanted_min + 1), 0.0, 1.0)
+            shortfall = np.clip(offered_max / wanted_min, 0.0, 1.0) * NEUTRAL_SCORE if wanted_min else 0.0
+
+            scores = np.where(
+                offered_min > wanted_max, 1.0,
+                np.where(high >= low, 0.6 + 0.4 * overlap, shortfall)
+            )
+        return np.where(np.isnan(offered_max), NEUTRAL_SCORE, scores)
+
+    def score(self, candidate):
+        """Score ``candidate`` against every job. Returns a dict of arrays aligned with ``jobs.job_ids``."""
+        skill, matched_skills = self.skill_scores(candidate)
+        experience = self.experience_scores(candidate)
+        location, distance = self.location_scores(candidate)
+        salary = self.salary_scores(candidate)
+
+        weights = self.weights
+        total_weight = sum(weights.values()) or 1
+        overall = (
+            weights['skill'] * skill
+            + weights['experience'] * experience
+            + weights['location'] * location
+            + weights['salary'] * salary
+        ) / total_weight
+
+        return {
+            'overall_score': overall * 100,
+            'skill_match_score': skill * 100,
+            'experience_match_score': experience * 100,
+            'location_match_score': location * 100,
+            'salary_match_score': salary * 100,
+            'matched_skills': matched_skills,
+            'distance_km': distance,
+        }
+
+
+class MatchScoreWriter:
+    """
+    Persists the scores of one batch of candidates against ``jobs`` with a
+    fixed number of statements per batch rather than per candidate: kept
+    pairs are upserted in chunks as they accumulate, and ``finish`` deletes
+    the pairs that fell below ``min_overall`` and syncs the batch's
+    ``Application.match_score`` (0 for dropped pairs).
+    """
+    chunk_size = 1000
+
+    def __init__(self, jobs, min_overall=None):
+        self.jobs = jobs
+        self.min_overall = settings.MATCH_SCORE_MIN_OVERALL if min_overall is None else min_overall
+        # Rows upserted by this batch get a later calculated_at; older ones for its pairs were dropped
+        self.started_at = timezone.now()
+        self.user_ids = []
+        self.pending = []
+        self.written = 0
+
+    def add(self, candidate, scores):
+        jobs = self.jobs
+        keep = scores['overall_score'] >= self.min_overall
+        rounded = {field: np.round(scores[field], 2) for field in SCORE_FIELDS}
+
+        self.user_ids.append(candidate.user_id)
+        for row in np.flatnonzero(keep):
+            distance = scores['distance_km'][row]
+            self.pending.append(MatchScore(
+                job_id=jobs.job_ids[row],
+                candidate_id=candidate.user_id,
+                score_breakdown={
+                    'matched_skills': int(scores['matched_skills'][row]),
+                    'required_skills': int(jobs.skill_counts[row]),
+                    'distance_km': None if np.isnan(distance) else round(float(distance), 1),
+                },
+                **{field: float(rounded[field][row]) for field in SCORE_FIELDS},
+            ))
+        if len(self.pending) >= self.chunk_size:
+            self.upsert()
+
+    def upsert(self):
+        MatchScore.objects.bulk_create(
+            self.pending,
+            batch_size=self.chunk_size,
+            update_conflicts=True,
+            unique_fields=['job', 'candidate'],
+            update_fields=[*SCORE_FIELDS, 'score_breakdown', 'calculated_at', 'updated_at'],
+        )
+        self.written += len(self.pending)
+        self.pending = []
+
+    def finish(self):
+        """Write what is left, drop the pairs that weren't kept and sync applications. Returns rows written."""
+        if self.pending:
+            self.upsert()
+        if not self.user_ids:
+            return self.written
+
+        match = MatchScore.objects.filter(job_id=OuterRef('job_id'), candidate_id=OuterRef('candidate_id'))
+        job_ids = self.jobs.job_ids
+        for start in range(0, len(job_ids), self.chunk_size):
+            pairs = {'candidate_id__in': self.user_ids, 'job_id__in': job_ids[start:start + self.chunk_size]}
+            MatchScore.objects.filter(**pairs, calculated_at__lt=self.started_at).delete()
+            Application.objects.filter(**pairs).update(
+                match_score=Coalesce(Subquery(match.values('overall_score')[:1]), Value(0.0))
+            )
+        return self.written
+
+
+def compute_match_scores(profiles=None, jobs=None, matrix=None):
+    """
+    Score ``profiles`` (default: everyone actively looking) against ``jobs``
+    (default: every published job) and persist the results. A preloaded
+    ``matrix`` can be passed instead of ``jobs`` to reuse it across calls.
+
+    Returns the number of ``MatchScore`` rows written.
+    """
+    if matrix is None:
+        matrix = JobMatrix.load(jobs)
+    if not len(matrix):
+        return 0
+
+    engine = MatchScoringEngine(matrix)
+    written = 0
+    for batch in Candidate.iter_batches(matrix.vocabulary, profiles):
+        writer = MatchScoreWriter(matrix)
+        for candidate in batch:
+            writer.add(candidate, engine.score(candidate))
+        written += writer.finish()
+    return written
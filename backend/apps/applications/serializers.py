@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from apps.applications.models import Application
+from apps.applications.models import Application, MatchScore
 
 
 class ApplicationSerializer(serializers.ModelSerializer):
@@ -18,4 +18,26 @@ class ApplicationReviewSerializer(serializers.ModelSerializer):
     def validate_status(self, value):
         if value not in dict(Application.Status.choices):
             raise serializers.ValidationError("Invalid status.")
-        return value
\ No newline at end of file
+        return value
+
+
+class RankedCandidateSerializer(serializers.ModelSerializer):
+    candidate_id = serializers.UUIDField(source='candidate.id', read_only=True)
+    first_name = serializers.CharField(source='candidate.first_name', read_only=True)
+    last_name = serializers.CharField(source='candidate.last_name', read_only=True)
+    headline = serializers.CharField(source='candidate.profile.headline', read_only=True, default=None)
+    current_title = serializers.CharField(source='candidate.profile.current_title', read_only=True, default=None)
+    years_of_experience = serializers.IntegerField(
+        source='candidate.profile.years_of_experience', read_only=True, default=None)
+    is_actively_looking = serializers.BooleanField(
+        source='candidate.profile.is_actively_looking', read_only=True, default=None)
+    is_open_to_remote = serializers.BooleanField(
+        source='candidate.profile.is_open_to_remote', read_only=True, default=None)
+    application_status = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = MatchScore
+        fields = ('id', 'candidate_id', 'first_name', 'last_name', 'headline', 'current_title',
+                  'years_of_experience', 'is_actively_looking', 'is_open_to_remote',
+                  'overall_score', 'skill_match_score', 'experience_match_score',
+                  'location_match_score', 'salary_match_score', 'calculated_at', 'application_status')
@@ -0,0 +1,60 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.applications import tracking
+from apps.jobs.models import Job, Skill
+from apps.users.models import Profile
+
+PROFILE_SCORING_FIELDS = {
+    'years_of_experience', 'location', 'desired_salary_min', 'desired_salary_max',
+    'is_open_to_remote', 'is_actively_looking',
+}
+JOB_SCORING_FIELDS = {
+    'status', 'is_deleted', 'experience_level', 'is_remote', 'location',
+    'location_id', 'salary_min', 'salary_max',
+}
+M2M_ACTIONS = ('post_add', 'post_remove', 'post_clear')
+
+
+def _affects_scoring(update_fields, scoring_fields):
+    return update_fields is None or not scoring_fields.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Profile)
+def mark_profile_stale(sender, instance, update_fields=None, **kwargs):
+    if _affects_scoring(update_fields, PROFILE_SCORING_FIELDS):
+        tracking.mark_profiles_stale([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def mark_job_stale(sender, instance, update_fields=None, **kwargs):
+    if _affects_scoring(update_fields, JOB_SCORING_FIELDS):
+        tracking.mark_jobs_stale([instance.pk])
+
+
+@receiver(m2m_changed, sender=Profile.skills.through)
+def mark_profile_skills_stale(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in M2M_ACTIONS:
+        return
+    if reverse:
+        # instance is a Skill; post_clear gives no pk_set, so nothing left to rescore by id
+        tracking.mark_profiles_stale(pk_set or [])
+    else:
+        tracking.mark_profiles_stale([instance.pk])
+
+
+@receiver(m2m_changed, sender=Job.required_skills.through)
+def mark_job_skills_stale(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in M2M_ACTIONS:
+        return
+    if reverse:
+        tracking.mark_jobs_stale(pk_set or [])
+    else:
+        tracking.mark_jobs_stale([instance.pk])
+
+
+@receiver(pre_delete, sender=Skill)
+def mark_skill_holders_stale(sender, instance, **kwargs):
+    # Cascading deletes of the through rows don't send m2m_changed
+    tracking.mark_jobs_stale(list(instance.jobs.values_list('id', flat=True)))
+    tracking.mark_profiles_stale(list(instance.profiles.values_list('id', flat=True)))
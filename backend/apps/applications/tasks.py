@@ -0,0 +1,65 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.applications import analysis, scoring, tracking
+from apps.applications.models import Application
+from apps.users import resume
+from apps.jobs.models import Job
+from apps.users.models import Profile
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(ignore_result=True)
+def compute_profile_match_scores(profile_id, job_ids=None):
+    profiles = Profile.objects.filter(id=profile_id)
+    jobs = Job.active_objects.filter(id__in=job_ids) if job_ids else None
+    written = scoring.compute_match_scores(profiles=profiles, jobs=jobs)
+    logger.info(f'Stored {written} match scores for profile {profile_id}')
+
+
+@shared_task(ignore_result=True)
+def compute_job_match_scores(job_id):
+    written = scoring.compute_match_scores(jobs=Job.active_objects.filter(id=job_id))
+    logger.info(f'Stored {written} match scores for job {job_id}')
+
+
+@shared_task(ignore_result=True)
+def recompute_all_match_scores():
+    written = scoring.compute_match_scores()
+    logger.info(f'Recomputed {written} match scores')
+
+
+@shared_task(ignore_result=True)
+def flush_stale_match_scores():
+    written = tracking.flush_stale_scores()
+    logger.info(f'Flushed stale match scores, {written} rows written')
+
+
+@shared_task(ignore_result=True)
+def parse_application_resume(application_id):
+    """Warm the resume cache for an application's snapshot; usually a hit on the profile's resume."""
+    application = Application.objects.filter(id=application_id).first()
+    if application is None or not application.resume_snapshot:
+        return
+    try:
+        _, digest, hit = resume.parse_resume_cached(application.resume_snapshot, application.resume_sha256)
+    except resume.ResumeParseError as exc:
+        logger.warning(f'Could not parse resume snapshot for application {application_id}: {exc}')
+        return
+    logger.info(f'Resume snapshot {digest} for application {application_id} ({"hit" if hit else "parsed"})')
+
+
+@shared_task(ignore_result=True)
+def analyze_pending_applications():
+    # Release the debounce key first so applications arriving from now on schedule another run
+    cache.delete(analysis.ANALYSIS_SCHEDULED_KEY)
+    applications = list(analysis.pending_applications()[:settings.AI_ANALYSIS_MAX_PER_RUN])
+    if not applications:
+        return
+    analyzed, hits, failed = analysis.analyze_applications(applications)
+    logger.info(f'AI analysis: {analyzed} analyzed ({hits} from cache), {failed} failed')
+    if len(applications) == settings.AI_ANALYSIS_MAX_PER_RUN:
+        analysis.schedule_analysis()
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.applications import analysis
+from apps.applications.analysis import analyze_applications, pending_applications
+from apps.applications.models import Application
+from apps.core.tests.factories import make_employer, make_job, make_job_seeker, make_skill
+
+
+class AnalysisTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer, company = make_employer()
+        python = make_skill('Python')
+        cls.application = Application.objects.create(
+            job=make_job(employer, company, skills=[python]), candidate=make_job_seeker(skills=[python])
+        )
+
+    def setUp(self):
+        # Every run goes to the model
+        for method, value in (('get', None), ('set', None)):
+            patcher = mock.patch.object(analysis.ai_analysis_cache, method, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_sweep(self):
+        return analyze_applications(list(pending_applications()))
+
+    def test_successful_analysis_leaves_the_sweep(self):
+        self.assertEqual(self.run_sweep(), (1, 0, 0))
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.ai_analysis_status, Application.AnalysisStatus.COMPLETE)
+        self.assertIsNone(self.application.ai_analysis_due_at)
+        self.assertEqual(self.application.ai_analysis['strengths'], ['python'])
+        self.assertFalse(pending_applications().exists())
+
+    @override_settings(AI_ANALYSIS_MAX_ATTEMPTS=2)
+    def test_failures_are_retried_with_backoff_until_the_cap(self):
+        outage = mock.Mock(model='test')
+        outage.generate_many.side_effect = lambda prompts: [RuntimeError('Model unavailable')] * len(prompts)
+        with mock.patch.object(analysis, 'get_gateway', return_value=outage):
+            self.assertEqual(self.run_sweep(), (0, 0, 1))
+            self.application.refresh_from_db()
+            self.assertEqual(self.application.ai_analysis_status, Application.AnalysisStatus.FAILED)
+            self.assertEqual(self.application.ai_analysis['error'], 'Model unavailable')
+            self.assertEqual(self.application.ai_analysis_attempts, 1)
+            self.assertGreater(self.application.ai_analysis_due_at, timezone.now())
+            # Backing off
+            self.assertFalse(pending_applications().exists())
+
+            Application.objects.update(ai_analysis_due_at=timezone.now())
+            self.assertEqual(self.run_sweep(), (0, 0, 1))
+            self.application.refresh_from_db()
+            self.assertEqual(self.application.ai_analysis_attempts, 2)
+            self.assertIsNone(self.application.ai_analysis_due_at)
+            self.assertFalse(pending_applications().exists())
+
+    def test_failed_analysis_succeeds_on_retry(self):
+        Application.objects.update(
+            ai_analysis={'status': 'failed', 'error': 'timeout'}, ai_analysis_attempts=1,
+            ai_analysis_status=Application.AnalysisStatus.FAILED,
+        )
+        self.assertEqual(self.run_sweep(), (1, 0, 0))
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.ai_analysis_status, Application.AnalysisStatus.COMPLETE)
+        self.assertEqual(self.application.ai_analysis_attempts, 2)
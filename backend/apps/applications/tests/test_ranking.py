@@ -0,0 +1,71 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.applications.models import Application, MatchScore
+from apps.core.pagination import encode_cursor
+from apps.core.tests.factories import make_employer, make_job, make_job_seeker
+
+
+class JobCandidateRankingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        cls.job = make_job(cls.employer, cls.company)
+        # Two candidates share a score so the id tie-break is exercised
+        cls.scores = [
+            MatchScore.objects.create(job=cls.job, candidate=make_job_seeker(), overall_score=score)
+            for score in (90.0, 75.0, 75.0, 40.0, 10.0)
+        ]
+        Application.objects.create(job=cls.job, candidate=cls.scores[3].candidate)
+        cls.ranked = [
+            str(score.id) for score in sorted(cls.scores, key=lambda score: (score.overall_score, score.id), reverse=True)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+        self.url = reverse('job-candidates', args=[self.job.id])
+
+    def test_pages_follow_rank_without_gaps_or_repeats(self):
+        seen = []
+        response = self.client.get(self.url, {'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen += [row['id'] for row in response.data['results']]
+            if response.data['next'] is None:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, self.ranked)
+
+    def test_filters(self):
+        response = self.client.get(self.url, {'applicants_only': 'true'})
+        self.assertEqual([row['id'] for row in response.data['results']], [str(self.scores[3].id)])
+        self.assertEqual(response.data['results'][0]['application_status'], Application.Status.PENDING)
+
+        response = self.client.get(self.url, {'min_score': '50'})
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(self.client.get(self.url, {'min_score': 'high'}).status_code, 400)
+
+    def test_malformed_cursors_are_rejected(self):
+        for values in (['high', str(self.scores[0].id)], [90.0, 'not-a-uuid'], [True, str(self.scores[0].id)], [90.0]):
+            with self.subTest(values=values):
+                response = self.client.get(self.url, {'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'cursor': '!!!'}).status_code, 400)
+
+    def test_stream_returns_every_page_as_ndjson(self):
+        response = self.client.get(self.url, {'stream': 'true', 'page_size': 2})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertTrue(response.is_async)
+        pages = [json.loads(line) for line in b''.join(response).decode().splitlines()]
+        self.assertEqual(len(pages), 3)
+        self.assertEqual([row['id'] for page in pages for row in page['results']], self.ranked)
+        self.assertIsNone(pages[-1]['next_cursor'])
+
+    def test_other_employers_jobs_are_hidden(self):
+        other, _ = make_employer()
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,172 @@
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.applications.models import Application, MatchScore
+from apps.applications.scoring import (
+    Candidate, JobMatrix, MatchScoringEngine, SkillVocabulary, compute_match_scores,
+)
+from apps.core.tests.factories import make_employer, make_job, make_job_seeker, make_location, make_skill
+from apps.jobs.models import Job
+
+WEIGHTS = {'skill': 0.5, 'experience': 0.2, 'location': 0.15, 'salary': 0.15}
+
+
+def point(lng, lat):
+    return SimpleNamespace(x=lng, y=lat)
+
+
+def matrix(vocabulary, *jobs):
+    """``jobs`` are dicts of the JobMatrix columns for one job each."""
+    columns = {
+        'skill_sets': [], 'experience_levels': [], 'is_remote': [],
+        'coordinates': [], 'salary_min': [], 'salary_max': [],
+    }
+    for job in jobs:
+        for skill_id in job.get('skills', ()):
+            vocabulary.add(skill_id)
+        columns['skill_sets'].append(job.get('skills', ()))
+        columns['experience_levels'].append(job.get('level', Job.ExperienceLevel.ENTRY))
+        columns['is_remote'].append(job.get('remote', False))
+        columns['coordinates'].append(job.get('at'))
+        columns['salary_min'].append(job.get('salary_min'))
+        columns['salary_max'].append(job.get('salary_max'))
+    return JobMatrix(vocabulary, [uuid.uuid4() for _ in jobs], **columns)
+
+
+def candidate(vocabulary, skills=(), years=0, at=None, remote=False, salary_min=None, salary_max=None):
+    return Candidate(uuid.uuid4(), uuid.uuid4(), vocabulary.bitset(skills), years, at, remote, salary_min, salary_max)
+
+
+@override_settings(MATCH_SCORE_MAX_DISTANCE_KM=100)
+class MatchScoringEngineTests(SimpleTestCase):
+    def test_bitsets_span_words(self):
+        vocabulary = SkillVocabulary()
+        for skill_id in range(70):
+            vocabulary.add(skill_id)
+        self.assertEqual(vocabulary.n_words, 2)
+        words = vocabulary.bitset([0, 65, 'unknown'])
+        self.assertEqual(list(words), [1, 2])
+
+    def test_skill_score_is_share_of_required_skills(self):
+        vocabulary = SkillVocabulary()
+        jobs = matrix(vocabulary, {'skills': ['a', 'b']}, {'skills': ['a', 'b', 'c', 'd']}, {})
+        scores, matched = MatchScoringEngine(jobs, WEIGHTS).skill_scores(candidate(vocabulary, ['a', 'b']))
+        np.testing.assert_allclose(scores, [1.0, 0.5, 1.0])
+        self.assertEqual(list(matched), [2, 2, 0])
+
+    def test_experience_score(self):
+        vocabulary = SkillVocabulary()
+        jobs = matrix(vocabulary, {'level': Job.ExperienceLevel.SENIOR}, {'level': Job.ExperienceLevel.ENTRY})
+        scores = MatchScoringEngine(jobs, WEIGHTS).experience_scores(candidate(vocabulary, years=2.5))
+        np.testing.assert_allclose(scores, [0.5, 1.0])
+
+    def test_location_score(self):
+        vocabulary = SkillVocabulary()
+        berlin = point(13.405, 52.52)
+        jobs = matrix(
+            vocabulary,
+            {'at': berlin},
+            # About 50 km east
+            {'at': point(14.14, 52.52)},
+            {'at': point(-0.1276, 51.5072)},
+            {},
+            {'at': point(-0.1276, 51.5072), 'remote': True},
+        )
+        engine = MatchScoringEngine(jobs, WEIGHTS)
+        scores, distance = engine.location_scores(candidate(vocabulary, at=berlin, remote=True))
+        self.assertAlmostEqual(scores[0], 1.0)
+        self.assertAlmostEqual(distance[1], 50, delta=1)
+        self.assertAlmostEqual(scores[1], 0.5, delta=0.01)
+        self.assertEqual(scores[2], 0.0)
+        # No coordinates on the job: neutral
+        self.assertEqual(scores[3], 0.5)
+        self.assertEqual(scores[4], 1.0)
+
+        scores, _ = engine.location_scores(candidate(vocabulary))
+        np.testing.assert_allclose(scores, [0.5, 0.5, 0.5, 0.5, 0.5])
+
+    def test_salary_score(self):
+        vocabulary = SkillVocabulary()
+        jobs = matrix(
+            vocabulary,
+            {'salary_min': 120, 'salary_max': 150},
+            {'salary_min': 80, 'salary_max': 120},
+            {'salary_min': 50, 'salary_max': 50},
+            {},
+        )
+        engine = MatchScoringEngine(jobs, WEIGHTS)
+        scores = engine.salary_scores(candidate(vocabulary, salary_min=100, salary_max=110))
+        self.assertEqual(scores[0], 1.0)
+        self.assertAlmostEqual(scores[1], 1.0)
+        self.assertAlmostEqual(scores[2], 0.25)
+        self.assertEqual(scores[3], 0.5)
+        np.testing.assert_allclose(engine.salary_scores(candidate(vocabulary)), [0.5] * 4)
+
+    def test_overall_is_weighted_percentage(self):
+        vocabulary = SkillVocabulary()
+        jobs = matrix(vocabulary, {'skills': ['a', 'b'], 'level': Job.ExperienceLevel.MID})
+        scores = MatchScoringEngine(jobs, WEIGHTS).score(candidate(vocabulary, ['a'], years=2))
+        # skill 0.5, experience 1, location and salary neutral
+        expected = (0.5 * 0.5 + 0.2 * 1.0 + 0.15 * 0.5 + 0.15 * 0.5) * 100
+        self.assertAlmostEqual(scores['overall_score'][0], expected)
+        self.assertAlmostEqual(scores['skill_match_score'][0], 50.0)
+
+
+class ComputeMatchScoresTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer, company = make_employer()
+        cls.python, cls.django = make_skill('Python'), make_skill('Django')
+        location = make_location()
+        cls.job = make_job(employer, company, skills=[cls.python, cls.django], location=location)
+        cls.draft = make_job(employer, company, skills=[cls.python], status=Job.Status.DRAFT)
+        cls.seeker = make_job_seeker(skills=[cls.python])
+        Application.objects.create(job=cls.job, candidate=cls.seeker)
+
+    def test_scores_published_jobs_and_syncs_applications(self):
+        written = compute_match_scores()
+        self.assertEqual(written, 1)
+        score = MatchScore.objects.get(candidate=self.seeker)
+        self.assertEqual(score.job_id, self.job.id)
+        self.assertEqual(score.skill_match_score, 50.0)
+        self.assertEqual(score.score_breakdown['matched_skills'], 1)
+        self.assertEqual(score.score_breakdown['required_skills'], 2)
+        self.assertEqual(Application.objects.get(candidate=self.seeker).match_score, score.overall_score)
+
+    def test_rerun_updates_in_place(self):
+        compute_match_scores()
+        self.seeker.profile.skills.add(self.django)
+        compute_match_scores()
+        score = MatchScore.objects.get(candidate=self.seeker)
+        self.assertEqual(score.skill_match_score, 100.0)
+        self.assertEqual(MatchScore.objects.count(), 1)
+
+    def test_scores_below_the_minimum_are_removed(self):
+        compute_match_scores()
+        with override_settings(MATCH_SCORE_MIN_OVERALL=99.0):
+            self.assertEqual(compute_match_scores(), 0)
+        self.assertFalse(MatchScore.objects.exists())
+
+    def test_dropped_pairs_reset_the_application_score(self):
+        compute_match_scores()
+        self.assertGreater(Application.objects.get(candidate=self.seeker).match_score, 0)
+        with override_settings(MATCH_SCORE_MIN_OVERALL=99.0):
+            compute_match_scores()
+        self.assertEqual(Application.objects.get(candidate=self.seeker).match_score, 0.0)
+
+    def test_statements_do_not_grow_with_candidates(self):
+        def queries_for_job():
+            with CaptureQueriesContext(connection) as queries:
+                compute_match_scores(jobs=Job.objects.filter(id=self.job.id))
+            return len(queries)
+
+        one_candidate = queries_for_job()
+        for _ in range(5):
+            make_job_seeker(skills=[self.python])
+        self.assertEqual(queries_for_job(), one_candidate)
+        self.assertEqual(MatchScore.objects.filter(job=self.job).count(), 6)
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.applications import tracking
+from apps.applications.models import MatchScore
+from apps.applications.scoring import compute_match_scores
+from apps.core.tests.factories import make_employer, make_job, make_job_seeker, make_skill
+from apps.jobs.models import Job
+from apps.users.models import Profile
+
+
+class StaleTrackingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer, company = make_employer()
+        cls.python = make_skill('Python')
+        cls.job = make_job(employer, company, skills=[cls.python])
+        cls.other_job = make_job(employer, company, skills=[cls.python])
+        cls.seeker = make_job_seeker(skills=[cls.python])
+
+    def setUp(self):
+        cache.clear()
+        compute_match_scores()
+        Profile.objects.update(match_scores_changed_at=None, match_scores_computed_at=None)
+        Job.objects.update(match_scores_changed_at=None, match_scores_computed_at=None)
+
+    def test_changes_only_mark_rows_and_schedule_one_flush(self):
+        with mock.patch('apps.applications.tasks.flush_stale_match_scores.apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                profile = Profile.objects.get(user=self.seeker)
+                profile.years_of_experience = 4
+                profile.save()
+                self.job.required_skills.clear()
+        apply_async.assert_called_once()
+        self.assertEqual(set(tracking.stale(Job.objects.all())), {self.job})
+        self.assertEqual(tracking.stale(Profile.objects.all()).count(), 1)
+
+    def test_irrelevant_fields_are_ignored(self):
+        profile = Profile.objects.get(user=self.seeker)
+        profile.headline = 'Backend developer'
+        profile.save(update_fields=['headline'])
+        self.assertFalse(tracking.stale(Profile.objects.all()).exists())
+
+    def test_flush_rescores_stale_rows_and_marks_them_fresh(self):
+        self.job.required_skills.clear()
+        tracking.flush_stale_scores()
+        score = MatchScore.objects.get(job=self.job, candidate=self.seeker)
+        # A job without required skills matches every candidate on skills
+        self.assertEqual(score.skill_match_score, 100.0)
+        self.assertFalse(tracking.stale(Job.objects.all()).exists())
+        self.job.refresh_from_db()
+        self.assertTrue(self.job.match_scores_fresh)
+
+    def test_flush_drops_scores_of_jobs_that_are_no_longer_published(self):
+        self.job.status = Job.Status.CLOSED
+        self.job.save(update_fields=['status', 'updated_at'])
+        self.other_job.is_deleted = True
+        self.other_job.save(update_fields=['is_deleted', 'updated_at'])
+        self.assertEqual(MatchScore.objects.count(), 2)
+
+        tracking.flush_stale_scores()
+        self.assertFalse(MatchScore.objects.exists())
+        self.assertFalse(tracking.stale(Job.objects.all()).exists())
+
+    def test_flush_releases_the_debounce_key(self):
+        cache.set(tracking.FLUSH_SCHEDULED_KEY, 1)
+        tracking.flush_stale_scores()
+        self.assertIsNone(cache.get(tracking.FLUSH_SCHEDULED_KEY))
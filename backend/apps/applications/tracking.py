@@ -0,0 +1,96 @@
+"""
+Dirty tracking for match scores.
+
+Changes to profiles and jobs only stamp ``match_scores_changed_at`` on the
+affected rows and schedule a single debounced flush. The flush rescores the
+stale profiles against every job and the stale jobs against every candidate,
+in batches, then stamps ``match_scores_computed_at`` with the time it started.
+Anything that changed while the flush ran stays stale for the next one. Stale
+jobs that are no longer published lose their scores instead.
+
+The debounce key lives in the default cache, which is only shared between
+processes with Redis; Beat also runs the flush every
+``MATCH_SCORE_SWEEP_SECONDS`` so nothing stays stale if a scheduled run is lost.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.applications import scoring
+from apps.applications.models import MatchScore
+from apps.jobs.models import Job
+from apps.users.models import Profile
+
+FLUSH_SCHEDULED_KEY = 'match_scores:flush_scheduled'
+
+
+def stale(queryset):
+    return queryset.filter(match_scores_changed_at__isnull=False).filter(
+        Q(match_scores_computed_at__isnull=True)
+        | Q(match_scores_changed_at__gt=F('match_scores_computed_at'))
+    )
+
+
+def schedule_flush():
+    """Queue one flush per debounce window, however many changes arrive in it."""
+    debounce = settings.MATCH_SCORE_DEBOUNCE_SECONDS
+    if cache.add(FLUSH_SCHEDULED_KEY, 1, timeout=debounce * 2):
+        from apps.applications.tasks import flush_stale_match_scores
+        flush_stale_match_scores.apply_async(countdown=debounce)
+
+
+def mark_profiles_stale(profile_ids):
+    profile_ids = [profile_id for profile_id in profile_ids if profile_id]
+    if not profile_ids:
+        return
+    Profile.objects.filter(id__in=profile_ids).update(match_scores_changed_at=timezone.now())
+    transaction.on_commit(schedule_flush)
+
+
+def mark_jobs_stale(job_ids):
+    job_ids = [job_id for job_id in job_ids if job_id]
+    if not job_ids:
+        return
+    Job.objects.filter(id__in=job_ids).update(match_scores_changed_at=timezone.now())
+    transaction.on_commit(schedule_flush)
+
+
+def _batched_ids(queryset, batch_size):
+    ids = list(queryset.order_by('match_scores_changed_at').values_list('id', flat=True))
+    for start in range(0, len(ids), batch_size):
+        yield ids[start:start + batch_size]
+
+
+def flush_stale_scores():
+    """Rescore every stale profile and job. Returns the number of rows written."""
+    # Release the debounce key first so changes made from now on schedule another run
+    cache.delete(FLUSH_SCHEDULED_KEY)
+    started_at = timezone.now()
+    batch_size = settings.MATCH_SCORE_DIRTY_BATCH_SIZE
+    written = 0
+
+    stale_profile_ids = list(stale(Profile.objects.all()).values_list('id', flat=True))
+    if stale_profile_ids:
+        matrix = scoring.JobMatrix.load()
+        for start in range(0, len(stale_profile_ids), batch_size):
+            batch = stale_profile_ids[start:start + batch_size]
+            written += scoring.compute_match_scores(
+                profiles=Profile.objects.filter(id__in=batch), matrix=matrix
+            )
+            Profile.objects.filter(id__in=batch).update(match_scores_computed_at=started_at)
+
+    # Stale profiles were just scored against every job, so skip them here
+    candidates = Profile.objects.filter(is_actively_looking=True).exclude(id__in=stale_profile_ids)
+    for batch in _batched_ids(stale(Job.objects.all()), batch_size):
+        # Closed, unpublished and deleted jobs drop out of the matrix; remove their old scores
+        MatchScore.objects.filter(job_id__in=batch).exclude(
+            job__status=Job.Status.PUBLISHED, job__is_deleted=False
+        ).delete()
+        written += scoring.compute_match_scores(
+            profiles=candidates, jobs=Job.objects.filter(id__in=batch)
+        )
+        Job.objects.filter(id__in=batch).update(match_scores_computed_at=started_at)
+
+    return written
@@ -1,3 +1,10 @@
+import json
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
@@ -7,15 +14,27 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
 
 from apps.core.permissions import IsEmployer, IsJobSeeker
+from apps.core.pagination import KeysetPaginationMixin, encode_cursor, decode_cursor
+from apps.core.content_cache import hash_file
 
-from apps.applications.models import Application
-from apps.applications.serializers import ApplicationSerializer, ApplicationReviewSerializer
+from apps.applications.models import Application, MatchScore
+from apps.applications import analysis, tasks
+from apps.notifications import broker
+from apps.notifications.services import NotificationType, notify
+from apps.users.models import Profile
+from apps.applications.serializers import (
+    ApplicationSerializer, ApplicationReviewSerializer, RankedCandidateSerializer
+)
+from apps.jobs.models import Job
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationSerializer
+    keyset_ordering = ('-updated_at', '-id')
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
@@ -33,7 +52,26 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        serializer.save(candidate=request.user)
+        snapshot = serializer.validated_data.get('resume_snapshot')
+        resume_sha256 = hash_file(snapshot) if snapshot else ''
+        with transaction.atomic():
+            application = serializer.save(candidate=request.user, resume_sha256=resume_sha256)
+            Job.objects.filter(pk=job.pk).update(application_count=F('application_count') + 1)
+            notify(
+                [job.employer_id],
+                NotificationType.APPLICATION_RECEIVED,
+                'New application',
+                f'{request.user.get_full_name() or request.user.email} applied for {job.title}.',
+                target=application,
+            )
+        if snapshot:
+            tasks.parse_application_resume.delay_on_commit(application.id)
+        transaction.on_commit(analysis.schedule_analysis)
+
+        profile_id = Profile.objects.filter(user=request.user).values_list('id', flat=True).first()
+        if profile_id:
+            tasks.compute_profile_match_scores.delay_on_commit(profile_id, [job.id])
+
         return Response(
             {'message': 'Application sent!', 'status_code': status.HTTP_201_CREATED},
             status=status.HTTP_201_CREATED
@@ -55,7 +93,11 @@ class ApplicationViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.delete()
+        with transaction.atomic():
+            instance.delete()
+            Job.objects.filter(pk=instance.job_id, application_count__gt=0).update(
+                application_count=F('application_count') - 1
+            )
         return Response(
             {'message': 'Application deleted.'},
             status=status.HTTP_200_OK
@@ -74,7 +116,20 @@ class ApplicationReviewView(APIView):
             
             serializer = ApplicationReviewSerializer(application, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save(reviewed_at=timezone.now())
+            previous_status = application.status
+            with transaction.atomic():
+                serializer.save(reviewed_at=timezone.now())
+                if application.status != previous_status:
+                    notify(
+                        [application.candidate_id],
+                        NotificationType.APPLICATION_STATUS,
+                        'Application update',
+                        f'Your application for {application.job.title} is now {application.get_status_display()}.',
+                        target=application,
+                    )
+                    transaction.on_commit(lambda: broker.publish([application.candidate_id], 'application', {
+                        'id': application.id, 'job': application.job_id, 'status': application.status
+                    }))
             return Response(
                 {'message': 'Application reviewed successfully.',
                     'status_code': status.HTTP_200_OK},
@@ -82,3 +137,104 @@ class ApplicationReviewView(APIView):
             )
         except Application.DoesNotExist:
             return Response({'message': "Application not found", 'status_code':  status.HTTP_404_NOT_FOUND}, status=status.HTTP_404_NOT_FOUND)
+
+
+class JobCandidateRankingView(APIView):
+    """
+    Candidates for one of the employer's jobs, best ``MatchScore`` first.
+
+    Uses keyset pagination on ``(overall_score, id)`` so no page needs a
+    ``COUNT(*)`` or ``OFFSET``. With ``?stream=true`` the ranked pages are
+    streamed back as newline delimited JSON instead; the body is an async
+    iterator so ASGI servers send each page as soon as it is fetched.
+    """
+    permission_classes = (IsEmployer,)
+    page_size = 20
+    max_page_size = 100
+    max_stream_pages = 50
+
+    def get_queryset(self, job):
+        params = self.request.query_params
+        queryset = MatchScore.objects.filter(job=job).select_related('candidate', 'candidate__profile')
+
+        for field in ('is_actively_looking', 'is_open_to_remote'):
+            value = params.get(field)
+            if value is not None:
+                queryset = queryset.filter(**{f'candidate__profile__{field}': value.lower() in ('1', 'true')})
+
+        if params.get('min_score'):
+            try:
+                queryset = queryset.filter(overall_score__gte=float(params['min_score']))
+            except ValueError:
+                raise ValidationError({'min_score': 'Must be a number.'})
+
+        applications = Application.objects.filter(job=job, candidate=OuterRef('candidate'))
+        queryset = queryset.annotate(application_status=Subquery(applications.values('status')[:1]))
+        if params.get('applicants_only', '').lower() in ('1', 'true'):
+            queryset = queryset.filter(application_status__isnull=False)
+
+        return queryset.order_by('-overall_score', '-id')
+
+    @staticmethod
+    def validate_cursor(values):
+        """A cursor is ``[overall_score, id]``; anything else would only fail in the query."""
+        if len(values) != 2 or isinstance(values[0], bool) or not isinstance(values[0], (int, float)):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        try:
+            return [values[0], uuid.UUID(str(values[1]))]
+        except ValueError:
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+
+    def get_page(self, queryset, cursor, page_size):
+        if cursor:
+            score, last_id = cursor
+            queryset = queryset.filter(
+                Q(overall_score__lt=score) | Q(overall_score=score, id__lt=last_id)
+            )
+
+        rows = list(queryset[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = [rows[-1].overall_score, str(rows[-1].id)] if has_next else None
+        return RankedCandidateSerializer(rows, many=True).data, next_cursor
+
+    async def stream_pages(self, queryset, cursor, page_size):
+        get_page = sync_to_async(self.get_page)
+        for _ in range(self.max_stream_pages):
+            results, cursor = await get_page(queryset, cursor, page_size)
+            yield json.dumps({
+                'results': results,
+                'next_cursor': encode_cursor(cursor) if cursor else None,
+            }, default=str) + '\n'
+            if cursor is None:
+                break
+
+    def get(self, request, id):
+        job = get_object_or_404(Job.active_objects, id=id, employer=request.user)
+        queryset = self.get_queryset(job)
+
+        try:
+            page_size = min(int(request.query_params.get('page_size', self.page_size)), self.max_page_size)
+        except ValueError:
+            page_size = self.page_size
+        page_size = max(page_size, 1)
+
+        cursor = request.query_params.get('cursor')
+        cursor = self.validate_cursor(decode_cursor(cursor)) if cursor else None
+
+        if request.query_params.get('stream', '').lower() in ('1', 'true'):
+            return StreamingHttpResponse(
+                self.stream_pages(queryset, cursor, page_size),
+                content_type='application/x-ndjson'
+            )
+
+        results, next_cursor = self.get_page(queryset, cursor, page_size)
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', encode_cursor(next_cursor))
+
+        return Response({
+            'next': next_url,
+            'scores_fresh': job.match_scores_fresh,
+            'results': results,
+        }, status=status.HTTP_200_OK)
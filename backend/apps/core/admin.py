@@ -2,7 +2,10 @@ from django.contrib import admin
 from django.contrib.gis import admin as gis_admin
 
 # Register your models here.
-from apps.core.models import Location
+from django.utils import timezone
+
+from apps.core import mail
+from apps.core.models import Location, OutboundEmail, RequestRun, TaskRun
 
 
 @gis_admin.register(Location)
@@ -20,3 +23,34 @@ class LocationAdmin(gis_admin.GISModelAdmin):
             'default_lon': -74.0060,
         }
     }
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'domain']
+    search_fields = ['to_email', 'subject']
+    readonly_fields = ('created_at', 'updated_at', 'claimed_at', 'sent_at', 'last_error')
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        queryset.exclude(status=OutboundEmail.Status.SENT).update(
+            status=OutboundEmail.Status.PENDING, attempts=0, next_attempt_at=timezone.now(), claimed_at=None
+        )
+        mail.schedule_delivery()
+
+
+@admin.register(TaskRun)
+class TaskRunAdmin(admin.ModelAdmin):
+    list_display = ['task_name', 'queue', 'state', 'runtime_ms', 'wait_ms', 'retries', 'finished_at']
+    list_filter = ['state', 'queue', 'task_name']
+    date_hierarchy = 'finished_at'
+
+
+@admin.register(RequestRun)
+class RequestRunAdmin(admin.ModelAdmin):
+    list_display = ['url_name', 'method', 'status_code', 'duration_ms', 'db_queries', 'db_ms', 'finished_at']
+    list_filter = ['method', 'status_code', 'url_name']
+    search_fields = ['url_name']
+    date_hierarchy = 'finished_at'
@@ -0,0 +1,227 @@
+"""
+Gateway to the generative model used for AI analysis.
+
+Nothing is created at import time: the backend (and the Gemini client behind
+it) is built on first use by ``get_gateway()``. Prompts are sent through an
+asyncio executor that bounds concurrency with a semaphore, paces calls with a
+process wide token bucket and retries transient failures with full-jitter
+backoff. Each ``generate_many`` call runs its own event loop, so backends open
+their clients per run rather than keeping connections bound to a closed loop.
+
+``AI_BACKEND = 'stub'`` swaps Gemini for a deterministic local backend so the
+pipeline can run, and be benchmarked, without network access.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+# Everything after this line in a prompt is the JSON payload (read by the stub backend)
+PAYLOAD_MARKER = '### INPUT'
+
+
+class AIError(Exception):
+    """The model call failed and should not be retried."""
+
+
+class AIRetryableError(AIError):
+    """The model call failed in a way that may succeed on retry (rate limit, 5xx, timeout)."""
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` calls per second on average with bursts of up to ``capacity``.
+
+    Not tied to an event loop: each call reserves a token under a thread lock,
+    letting the balance go negative, and sleeps off its share of the deficit.
+    One bucket can therefore pace every run and thread in the process.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class GeminiBackend:
+    name = 'gemini'
+
+    def __init__(self, model, api_key):
+        self.model = model
+        self.api_key = api_key
+
+    @asynccontextmanager
+    async def session(self):
+        """Yield ``generate(prompt)`` backed by a client that lives for this event loop only."""
+        from google import genai
+
+        async with genai.Client(api_key=self.api_key).aio as client:
+            yield partial(self.generate, client)
+
+    async def generate(self, client, prompt):
+        from google.genai import errors, types
+
+        try:
+            response = await client.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=types.GenerateContentConfig(response_mime_type='application/json'),
+            )
+        except errors.APIError as exc:
+            if exc.code in RETRYABLE_STATUS_CODES:
+                raise AIRetryableError(str(exc)) from exc
+            raise AIError(str(exc)) from exc
+        return response.text
+
+
+class StubBackend:
+    """
+    Offline stand-in for Gemini. Answers every item in the prompt's JSON
+    payload with a score derived from its skill overlap and a hash of its
+    contents, so identical inputs always give identical outputs.
+    """
+    name = 'stub'
+
+    def __init__(self, model='stub', latency=0.0):
+        self.model = model
+        self.latency = latency
+
+    @staticmethod
+    def analyze_item(item):
+        required = {skill.lower() for skill in item.get('job', {}).get('skills', [])}
+        candidate = {skill.lower() for skill in item.get('candidate', {}).get('skills', [])}
+        matched = sorted(required & candidate)
+        missing = sorted(required - candidate)
+
+        digest = hashlib.sha256(json.dumps(item, sort_keys=True).encode()).digest()
+        overlap = len(matched) / len(required) if required else 0.5
+        fit_score = round(min(100, overlap * 90 + digest[0] % 10), 2)
+        return {
+            'id': item.get('id'),
+            'fit_score': fit_score,
+            'summary': f'Matches {len(matched)} of {len(required)} required skills.',
+            'strengths': matched,
+            'gaps': missing,
+        }
+
+    @asynccontextmanager
+    async def session(self):
+        yield self.generate
+
+    async def generate(self, prompt):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        _, _, payload = prompt.partition(PAYLOAD_MARKER)
+        items = json.loads(payload) if payload.strip() else []
+        return json.dumps([self.analyze_item(item) for item in items])
+
+
+class AIGateway:
+    def __init__(self, backend, requests_per_minute, max_concurrency, max_retries, timeout, bucket=None):
+        self.backend = backend
+        self.requests_per_minute = requests_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.bucket = bucket or TokenBucket(rate=requests_per_minute / 60, capacity=max(1, max_concurrency))
+
+    @property
+    def model(self):
+        return f'{self.backend.name}:{self.backend.model}'
+
+    @staticmethod
+    def backoff(attempt, base=1.0, cap=30.0):
+        """Full jitter: a random delay up to the exponential backoff for ``attempt``."""
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+    async def _generate(self, generate, prompt, semaphore):
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                try:
+                    return await asyncio.wait_for(generate(prompt), self.timeout)
+                except (AIRetryableError, asyncio.TimeoutError) as exc:
+                    if attempt == self.max_retries:
+                        raise AIRetryableError(f'Gave up after {attempt + 1} attempts: {exc}') from exc
+                    delay = self.backoff(attempt)
+                    logger.warning(f'AI call failed ({exc!r}), retrying in {delay:.1f}s')
+                    await asyncio.sleep(delay)
+
+    async def _generate_many(self, prompts):
+        # Created per run: the semaphore and the backend's client are bound to this event loop
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.backend.session() as generate:
+            return await asyncio.gather(
+                *(self._generate(generate, prompt, semaphore) for prompt in prompts),
+                return_exceptions=True,
+            )
+
+    def generate_many(self, prompts):
+        """
+        Run ``prompts`` concurrently and return their responses in order. A
+        failed prompt yields its exception instead of a response.
+        """
+        if not prompts:
+            return []
+        return asyncio.run(self._generate_many(list(prompts)))
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+# Paces every model call in the process, across runs and threads
+_bucket = None
+
+
+def build_backend():
+    if settings.AI_BACKEND == 'stub':
+        return StubBackend(latency=settings.AI_STUB_LATENCY_MS / 1000)
+    if settings.AI_BACKEND == 'gemini':
+        return GeminiBackend(model=settings.AI_MODEL, api_key=settings.GOOGLE_API_KEY)
+    raise ValueError(f'Unknown AI_BACKEND {settings.AI_BACKEND!r}')
+
+
+def get_gateway():
+    """Return the process wide gateway, creating it on first use."""
+    global _gateway, _bucket
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _bucket = TokenBucket(
+                    rate=settings.AI_REQUESTS_PER_MINUTE / 60,
+                    capacity=max(1, settings.AI_MAX_CONCURRENCY),
+                )
+                _gateway = AIGateway(
+                    backend=build_backend(),
+                    requests_per_minute=settings.AI_REQUESTS_PER_MINUTE,
+                    max_concurrency=settings.AI_MAX_CONCURRENCY,
+                    max_retries=settings.AI_MAX_RETRIES,
+                    timeout=settings.AI_REQUEST_TIMEOUT,
+                    bucket=_bucket,
+                )
+    return _gateway
@@ -0,0 +1,198 @@
+"""
+Location autocomplete.
+
+Every location's label ("city state country") is inserted into a process
+local trie once per word, so "york" and "new york" both reach New York, NY.
+Each trie node keeps its own ranked top-N list, so a lookup is a walk down
+the prefix and a slice. The trie is rebuilt when the shared version number
+is bumped by a Location change, and again in every rank epoch (a wall clock
+window of ``LOCATION_AUTOCOMPLETE_REFRESH_SECONDS``) so the job counts used
+for ranking catch up. Postgres trigram search covers misspelt queries that
+no prefix matches.
+"""
+import re
+import threading
+import time
+import unicodedata
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Greatest
+
+from apps.core.models import Location
+
+VERSION_KEY = 'locations:autocomplete_version'
+
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse punctuation/whitespace to single spaces."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD_RE.sub(' ', text.casefold()).strip()
+
+
+def location_label(location):
+    return ', '.join(part for part in (location.city, location.state, location.country) if part)
+
+
+def location_entry(location):
+    return {
+        'id': str(location.id),
+        'city': location.city,
+        'state': location.state,
+        'country': location.country,
+        'label': location_label(location),
+    }
+
+
+class _Node:
+    __slots__ = ('children', 'ranked')
+
+    def __init__(self):
+        self.children = {}
+        self.ranked = []
+
+
+# One build of the trie; swapped in whole so a search never mixes two builds
+TrieSnapshot = namedtuple('TrieSnapshot', ['version', 'epoch', 'root', 'locations'])
+
+
+def rank_epoch():
+    """Shared by every process, so ETags computed on different workers agree."""
+    return int(time.time() // settings.LOCATION_AUTOCOMPLETE_REFRESH_SECONDS)
+
+
+class LocationTrie:
+    """
+    Prefix trie over location labels. Matches are ranked by where the prefix
+    starts (city before state before country), then by the number of jobs at
+    the location, then alphabetically.
+    """
+
+    def __init__(self):
+        self.snapshot = TrieSnapshot(None, None, _Node(), {})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current_version():
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, timeout=None)
+            version = cache.get(VERSION_KEY, 1)
+        return version
+
+    @staticmethod
+    def _bump_version():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 1, timeout=None)
+
+    @classmethod
+    def invalidate(cls):
+        # Bumping before the writer commits would let a concurrent rebuild
+        # read the old rows and cache them under the new version.
+        transaction.on_commit(cls._bump_version)
+
+    def _is_stale(self, version, epoch):
+        return (version, epoch) != (self.snapshot.version, self.snapshot.epoch)
+
+    def ensure_fresh(self):
+        """Return the snapshot for the current version and rank epoch, rebuilding it if needed."""
+        version, epoch = self.current_version(), rank_epoch()
+        if self._is_stale(version, epoch):
+            with self._lock:
+                if self._is_stale(version, epoch):
+                    self.rebuild(version, epoch)
+        return self.snapshot
+
+    def rebuild(self, version, epoch):
+        root = _Node()
+        locations = {}
+        limit = settings.LOCATION_AUTOCOMPLETE_MAX_RESULTS
+        rows = Location.objects.annotate(
+            job_count=Count('jobs', filter=Q(jobs__is_deleted=False))
+        ).only('id', 'city', 'state', 'country')
+
+        for location in rows.iterator(chunk_size=2000):
+            entry = location_entry(location)
+            locations[entry['id']] = entry
+
+            words = []
+            for field_rank, part in enumerate((location.city, location.state, location.country)):
+                words.extend((field_rank, word) for word in normalize(part).split())
+
+            for start, (field_rank, _) in enumerate(words):
+                phrase = ' '.join(word for _, word in words[start:])
+                rank = (field_rank, -location.job_count, entry['label'].casefold())
+                self._insert(root, phrase, rank, entry['id'], limit)
+
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self._trim(node, limit)
+            node.ranked = [location_id for _, location_id in node.ranked]
+            stack.extend(node.children.values())
+
+        self.snapshot = TrieSnapshot(version, epoch, root, locations)
+
+    @staticmethod
+    def _trim(node, limit):
+        """Keep the best ``limit`` ``(rank, location_id)`` pairs, one per location."""
+        best = {}
+        for rank, location_id in node.ranked:
+            if location_id not in best or rank < best[location_id]:
+                best[location_id] = rank
+        node.ranked = sorted((rank, location_id) for location_id, rank in best.items())[:limit]
+
+    @classmethod
+    def _insert(cls, root, phrase, rank, location_id, limit):
+        node = root
+        for char in phrase:
+            node = node.children.setdefault(char, _Node())
+            node.ranked.append((rank, location_id))
+            # Trim in batches so short prefixes don't accumulate every location
+            if len(node.ranked) > limit * 4:
+                cls._trim(node, limit)
+
+    def search(self, query, limit):
+        snapshot = self.snapshot
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        node = snapshot.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [snapshot.locations[location_id] for location_id in node.ranked[:limit]]
+
+
+location_trie = LocationTrie()
+
+
+def trigram_search(query, limit, exclude=()):
+    """Fuzzy matches for queries the trie can't complete, e.g. typos."""
+    similarity = Greatest(
+        TrigramSimilarity('city', query),
+        TrigramSimilarity('state', query),
+        TrigramSimilarity('country', query),
+    )
+    rows = Location.objects.filter(
+        Q(city__trigram_similar=query) | Q(state__trigram_similar=query) | Q(country__trigram_similar=query)
+    ).exclude(id__in=exclude).annotate(similarity=similarity).order_by('-similarity')[:limit]
+    return [location_entry(location) for location in rows]
+
+
+def autocomplete(query, limit):
+    location_trie.ensure_fresh()
+    results = location_trie.search(query, limit)
+    if len(results) < limit and len(normalize(query)) >= 3:
+        results += trigram_search(query, limit - len(results), exclude=[row['id'] for row in results])
+    return results
@@ -0,0 +1,130 @@
+"""
+Content addressed cache for derived data (parsed resumes, AI analysis).
+
+Entries are keyed by the SHA-256 of the source file's bytes, so the same PDF
+uploaded to several profiles or attached to many applications is processed
+once. Lookups go through a small per-process LRU first and then the shared
+Django cache, whose TTL is refreshed on every hit. Hit and miss counts are
+kept in the shared cache so the hit rate covers every worker.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Every ContentCache instance, for reporting
+registry = []
+
+
+def hash_file(file):
+    """Return the hex SHA-256 of a Django ``File``/``UploadedFile``, read in chunks."""
+    digest = hashlib.sha256()
+    file.open('rb')
+    try:
+        for chunk in file.chunks(chunk_size=HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    finally:
+        file.seek(0)
+    return digest.hexdigest()
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+class ContentCache:
+    """
+    Two tier cache of values derived from file contents.
+
+    ``version`` is part of every key; bump it when the code producing the
+    values changes so stale entries are ignored and age out.
+    """
+
+    def __init__(self, namespace, version=1, timeout=None, local_size=None):
+        self.namespace = namespace
+        self.version = version
+        self.timeout = timeout or settings.CONTENT_CACHE_TIMEOUT
+        self.local_size = local_size or settings.CONTENT_CACHE_LOCAL_SIZE
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def key(self, digest):
+        return f'content:{self.namespace}:v{self.version}:{digest}'
+
+    def _stats_key(self, outcome):
+        return f'content:{self.namespace}:{outcome}'
+
+    def _get_local(self, digest):
+        with self._lock:
+            entry = self._local.get(digest)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._local[digest]
+                return None
+            self._local.move_to_end(digest)
+            return value
+
+    def _set_local(self, digest, value):
+        with self._lock:
+            self._local[digest] = (time.monotonic() + self.timeout, value)
+            self._local.move_to_end(digest)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def get(self, digest):
+        value = self._get_local(digest)
+        if value is None:
+            key = self.key(digest)
+            value = cache.get(key)
+            if value is not None:
+                cache.touch(key, self.timeout)
+                self._set_local(digest, value)
+
+        _incr(self._stats_key('misses' if value is None else 'hits'))
+        return value
+
+    def set(self, digest, value):
+        cache.set(self.key(digest), value, timeout=self.timeout)
+        self._set_local(digest, value)
+
+    def delete(self, digest):
+        cache.delete(self.key(digest))
+        with self._lock:
+            self._local.pop(digest, None)
+
+    def get_or_compute(self, digest, compute):
+        """Return ``(value, hit)``, calling ``compute()`` and storing its result on a miss."""
+        value = self.get(digest)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.set(digest, value)
+        return value, False
+
+    def stats(self):
+        hits = cache.get(self._stats_key('hits'), 0)
+        misses = cache.get(self._stats_key('misses'), 0)
+        lookups = hits + misses
+        return {
+            'namespace': self.namespace,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else None,
+            'local_entries': len(self._local),
+        }
+
+    def reset_stats(self):
+        cache.delete_many([self._stats_key('hits'), self._stats_key('misses')])
+
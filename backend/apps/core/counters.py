@@ -0,0 +1,99 @@
+"""
+Buffered counters for hot, approximate columns such as ``Job.view_count``.
+
+Increments are summed in a per-process accumulator and handed to a Celery
+task every ``COUNTER_FLUSH_SECONDS`` (or once ``COUNTER_MAX_PENDING`` rows are
+pending). A daemon timer started by the first increment after a flush makes
+sure an idle process still flushes on time. The task applies them with ``UPDATE ... SET field = field + n``, one
+statement per distinct delta, so the request path never writes to the row,
+never takes a row lock and never touches ``updated_at``. Increments still in
+the buffer when a process dies are lost, which is acceptable for view counts.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import F
+
+# Every CounterBuffer instance, flushed at interpreter exit
+registry = []
+
+
+def apply_deltas(model, field, deltas):
+    """Add ``deltas`` (``{pk: amount}``) to ``field``. Returns the number of rows updated."""
+    by_amount = defaultdict(list)
+    for pk, amount in deltas.items():
+        if amount:
+            by_amount[amount].append(pk)
+
+    updated = 0
+    for amount, pks in by_amount.items():
+        updated += model._base_manager.filter(pk__in=pks).update(**{field: F(field) + amount})
+    return updated
+
+
+class CounterBuffer:
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.pending = Counter()
+        self.flushed_at = time.monotonic()
+        self._timer = None
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def incr(self, pk, amount=1):
+        with self._lock:
+            self.pending[pk] += amount
+            due = (
+                time.monotonic() - self.flushed_at >= settings.COUNTER_FLUSH_SECONDS
+                or len(self.pending) >= settings.COUNTER_MAX_PENDING
+            )
+            if not due and self._timer is None:
+                self._timer = threading.Timer(settings.COUNTER_FLUSH_SECONDS, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def drain(self):
+        with self._lock:
+            pending, self.pending = self.pending, Counter()
+            self.flushed_at = time.monotonic()
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        return pending
+
+    def flush(self):
+        pending = self.drain()
+        if not pending:
+            return
+        from apps.core.tasks import apply_counter_deltas
+        apply_counter_deltas.delay(
+            self.model._meta.label, self.field, {str(pk): amount for pk, amount in pending.items()}
+        )
+
+
+def _reset_after_fork():
+    # The parent flushes its own increments, and its timer threads don't exist here
+    for buffer in registry:
+        buffer.pending = Counter()
+        buffer._timer = None
+        buffer._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@atexit.register
+def _flush_all():
+    for buffer in registry:
+        try:
+            buffer.flush()
+        except Exception:
+            # The broker may already be gone at shutdown
+            pass
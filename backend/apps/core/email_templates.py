@@ -0,0 +1,100 @@
+"""
+Email template rendering.
+
+Templates under ``templates/emails/`` are compiled once per process and
+split into segments. A segment is either a run of top level nodes that never
+mention a per-recipient variable, or a single node that does. When rendering
+a batch, the static segments are rendered once from the shared base context
+and reused for every recipient. Only the dynamic nodes are rendered per
+recipient, with the recipient's delta pushed onto the same ``Context``, so
+the base context is never copied.
+
+Whether a node depends on a variable is decided from the names in its tag
+tokens, including nested ones, which errs on the side of "dynamic".
+``{% include %}`` and ``{% extends %}`` are always dynamic because their
+contents aren't visible here.
+"""
+import re
+import threading
+
+from django.conf import settings
+from django.template import Context, engines
+from django.template.base import TextNode
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.utils.safestring import mark_safe
+
+_NAME_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+_compiled = {}
+_lock = threading.Lock()
+
+
+def _token_names(node):
+    names = set()
+    token = getattr(node, 'token', None)
+    if token is not None and not isinstance(node, TextNode):
+        names.update(_NAME_RE.findall(token.contents))
+    for attr in node.child_nodelists:
+        for child in getattr(node, attr, None) or ():
+            names |= _token_names(child)
+    return names
+
+
+class CompiledEmail:
+    def __init__(self, template):
+        self.template = template
+        self.nodes = [(node, _token_names(node)) for node in template.nodelist]
+
+    def segments(self, dynamic_keys):
+        """Group the top level nodes into ``(is_dynamic, [nodes])`` runs."""
+        segments = []
+        for node, names in self.nodes:
+            dynamic = isinstance(node, (IncludeNode, ExtendsNode)) or not names.isdisjoint(dynamic_keys)
+            if segments and not dynamic and not segments[-1][0]:
+                segments[-1][1].append(node)
+            else:
+                segments.append((dynamic, [node]))
+        return segments
+
+    def render_many(self, base_context, deltas):
+        """Yield the output for each context in ``deltas``, layered over ``base_context``."""
+        dynamic_keys = set()
+        for delta in deltas:
+            dynamic_keys.update(delta)
+
+        segments = self.segments(dynamic_keys)
+        context = Context(base_context, autoescape=self.template.engine.autoescape)
+        with context.render_context.push_state(self.template), context.bind_template(self.template):
+            context.template_name = self.template.name
+            parts = [
+                None if dynamic else ''.join(node.render_annotated(context) for node in nodes)
+                for dynamic, nodes in segments
+            ]
+            dynamic_nodes = [(index, nodes[0]) for index, (dynamic, nodes) in enumerate(segments) if dynamic]
+            for delta in deltas:
+                output = list(parts)
+                # Fresh render state per recipient so tags like {% cycle %} start over
+                with context.push(delta), context.render_context.push():
+                    for index, node in dynamic_nodes:
+                        output[index] = node.render_annotated(context)
+                yield mark_safe(''.join(output))
+
+
+def get_email_template(template_name):
+    """The compiled ``emails/<template_name>``, loaded once per process (every time with DEBUG on)."""
+    name = f'emails/{template_name}'
+    compiled = None if settings.DEBUG else _compiled.get(name)
+    if compiled is None:
+        compiled = CompiledEmail(engines['django'].get_template(name).template)
+        with _lock:
+            _compiled[name] = compiled
+    return compiled
+
+
+def render_email(template_name, context):
+    return next(get_email_template(template_name).render_many({}, [context]))
+
+
+def render_emails(template_name, contexts, base_context=None):
+    """Render ``template_name`` once per context in ``contexts``, sharing ``base_context``."""
+    return list(get_email_template(template_name).render_many(base_context or {}, contexts))
@@ -0,0 +1,238 @@
+"""
+Outbound mail.
+
+``EmailService`` writes messages to the ``OutboundEmail`` outbox instead of
+talking to SMTP in the request or task that produced them. A delivery task
+claims due messages in batches and sends each batch over one SMTP connection.
+No recipient domain may have more than ``OUTBOX_DOMAIN_CONCURRENCY`` messages
+in flight across all workers. Transient failures are retried with
+exponential backoff and jitter. Permanent ones (5xx replies, refused
+recipients) are marked FAILED with the server's error.
+
+Delivery is at least once: a message claimed by a worker that died is handed
+out again after ``OUTBOX_CLAIM_TIMEOUT`` seconds. A batch can take longer than
+that against a slow server (every SMTP command may wait ``EMAIL_TIMEOUT``), so
+the worker sending it refreshes its claim halfway through the timeout.
+"""
+import logging
+import random
+import smtplib
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.core.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_SCHEDULED_KEY = 'outbox:delivery_scheduled'
+# OutboundEmail.priority, and the Celery priority of the delivery run they trigger
+PRIORITY_LOW = 1
+PRIORITY_NORMAL = 5
+PRIORITY_HIGH = 9
+# pg_advisory_xact_lock key serializing batch claims, so per-domain in-flight counts stay exact
+CLAIM_LOCK_ID = 7_140_001
+
+
+def recipient_domain(email):
+    return email.rsplit('@', 1)[-1].strip().lower()
+
+
+def build_email(to_email, subject, body='', html_body='', from_email=None, attachments=None,
+                priority=PRIORITY_NORMAL):
+    """An unsaved ``OutboundEmail``; pass a list of them to ``enqueue``."""
+    return OutboundEmail(
+        to_email=to_email,
+        domain=recipient_domain(to_email),
+        from_email=from_email or settings.EMAIL_HOST_USER,
+        subject=subject[:255],
+        body=body,
+        html_body=html_body,
+        attachments=list(attachments or []),
+        priority=priority,
+        next_attempt_at=timezone.now(),
+    )
+
+
+def enqueue(emails):
+    """Insert ``emails`` into the outbox and schedule delivery once they are committed."""
+    if not emails:
+        return 0
+    OutboundEmail.objects.bulk_create(emails, batch_size=1000)
+    if max(email.priority for email in emails) >= PRIORITY_HIGH:
+        transaction.on_commit(schedule_urgent_delivery)
+    else:
+        transaction.on_commit(schedule_delivery)
+    return len(emails)
+
+
+def schedule_delivery():
+    """Queue a delivery run unless one is already waiting; bursts share a single run."""
+    if cache.add(DELIVERY_SCHEDULED_KEY, 1, timeout=settings.OUTBOX_DEBOUNCE_SECONDS * 2 + 60):
+        from apps.core.tasks import deliver_outbound_emails
+        deliver_outbound_emails.apply_async(countdown=settings.OUTBOX_DEBOUNCE_SECONDS)
+
+
+def schedule_urgent_delivery():
+    """Start a delivery run right away, ahead of other io tasks; it claims by message priority."""
+    from apps.core.tasks import deliver_outbound_emails
+    deliver_outbound_emails.apply_async(kwargs={'urgent': True}, priority=PRIORITY_HIGH)
+
+
+def claim_batch(size=None):
+    """Mark up to ``size`` due messages SENDING, honouring the per-domain limit, and return them."""
+    size = size or settings.OUTBOX_BATCH_SIZE
+    limit = settings.OUTBOX_DOMAIN_CONCURRENCY
+    now = timezone.now()
+
+    with transaction.atomic():
+        with db_connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CLAIM_LOCK_ID])
+
+        OutboundEmail.objects.filter(
+            status=OutboundEmail.Status.SENDING,
+            claimed_at__lt=now - timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT),
+        ).update(status=OutboundEmail.Status.PENDING, next_attempt_at=now, claimed_at=None)
+
+        in_flight = Counter(dict(
+            OutboundEmail.objects.filter(status=OutboundEmail.Status.SENDING).order_by()
+            .values('domain').annotate(count=Count('id')).values_list('domain', 'count')
+        ))
+        # Over-fetch so a backlog for one busy domain doesn't starve the others
+        due = OutboundEmail.objects.filter(
+            status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now
+        ).order_by('-priority', 'next_attempt_at').values_list('id', 'domain')[:size * 4]
+
+        claimed = []
+        for email_id, domain in due:
+            if in_flight[domain] < limit:
+                in_flight[domain] += 1
+                claimed.append(email_id)
+                if len(claimed) >= size:
+                    break
+        OutboundEmail.objects.filter(id__in=claimed).update(
+            status=OutboundEmail.Status.SENDING, claimed_at=now
+        )
+
+    return list(OutboundEmail.objects.filter(id__in=claimed).order_by('domain'))
+
+
+def to_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=[email.to_email],
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    for path in email.attachments:
+        message.attach_file(path)
+    return message
+
+
+def is_permanent(exc):
+    if isinstance(exc, (smtplib.SMTPRecipientsRefused, FileNotFoundError)):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+def retry_delay(attempts):
+    delay = min(settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.OUTBOX_RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def refresh_claim(emails):
+    """Push back the claim timeout of ``emails`` that are still SENDING."""
+    OutboundEmail.objects.filter(
+        id__in=[email.id for email in emails], status=OutboundEmail.Status.SENDING
+    ).update(claimed_at=timezone.now())
+
+
+def deliver(emails):
+    """
+    Send ``emails`` (claimed by ``claim_batch``) over one SMTP connection and
+    record the outcome of each. Returns ``(sent, retrying, failed)`` counts.
+    """
+    connection = get_connection(fail_silently=False)
+    sent, unsent = [], []
+    needs_open = True
+    claimed_at = time.monotonic()
+    try:
+        for index, email in enumerate(emails):
+            if time.monotonic() - claimed_at > settings.OUTBOX_CLAIM_TIMEOUT / 2:
+                # Sent messages stay SENDING until the batch is recorded, so refresh the whole batch
+                refresh_claim(emails)
+                claimed_at = time.monotonic()
+            if needs_open:
+                # Opened here rather than inside send_messages, which would close it after one message
+                try:
+                    connection.open()
+                    needs_open = False
+                except (smtplib.SMTPException, OSError) as exc:
+                    unsent.extend((pending, exc) for pending in emails[index:])
+                    break
+            try:
+                connection.send_messages([to_message(email, connection)])
+                sent.append(email.id)
+            except (smtplib.SMTPException, OSError) as exc:
+                unsent.append((email, exc))
+                if not isinstance(exc, (smtplib.SMTPRecipientsRefused, FileNotFoundError)):
+                    # The session may be unusable; reconnect for the next message
+                    connection.close()
+                    needs_open = True
+    finally:
+        connection.close()
+
+    now = timezone.now()
+    if sent:
+        OutboundEmail.objects.filter(id__in=sent).update(
+            status=OutboundEmail.Status.SENT, sent_at=now, claimed_at=None,
+            attempts=F('attempts') + 1, last_error='', updated_at=now,
+        )
+
+    failed = 0
+    for email, exc in unsent:
+        email.attempts += 1
+        email.claimed_at = None
+        email.updated_at = now
+        email.last_error = f'{type(exc).__name__}: {exc}'[:2000]
+        if is_permanent(exc) or email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboundEmail.Status.FAILED
+            failed += 1
+        else:
+            email.status = OutboundEmail.Status.PENDING
+            email.next_attempt_at = now + retry_delay(email.attempts)
+    OutboundEmail.objects.bulk_update(
+        [email for email, _ in unsent],
+        ['status', 'attempts', 'claimed_at', 'last_error', 'next_attempt_at', 'updated_at'],
+    )
+    return len(sent), len(unsent) - failed, failed
+
+
+def deliver_pending():
+    """Deliver due messages batch by batch. Returns ``(sent, retrying, failed)`` totals."""
+    totals = Counter()
+    for _ in range(settings.OUTBOX_MAX_BATCHES_PER_RUN):
+        emails = claim_batch()
+        if not emails:
+            break
+        sent, retrying, failed = deliver(emails)
+        totals.update(sent=sent, retrying=retrying, failed=failed)
+    else:
+        # Still more to send: hand over to a fresh run instead of holding this worker
+        schedule_delivery()
+
+    if totals:
+        logger.info(
+            f"Outbox: {totals['sent']} sent, {totals['retrying']} to retry, {totals['failed']} failed"
+        )
+    return totals['sent'], totals['retrying'], totals['failed']
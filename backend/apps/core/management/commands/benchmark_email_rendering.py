@@ -0,0 +1,92 @@
+import random
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from apps.core.email_templates import render_emails
+
+DIGEST_TEMPLATE = 'job_alert_digest.html'
+JOB_TEMPLATE = 'partials/job_alert_job.html'
+
+
+class Command(BaseCommand):
+    help = (
+        'Render synthetic job alert digests with render_to_string and with the batch renderer and compare. '
+        'Both sides reuse the rendered job blocks, so this measures the renderer alone; expect roughly 1.2-1.3x.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--digests', type=int, default=10000)
+        parser.add_argument('--jobs', type=int, default=300, help='Distinct jobs shared by the digests.')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per renderer; the fastest one counts.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        location = SimpleNamespace(city='Berlin', state='Berlin', country='Germany')
+        company = SimpleNamespace(company_name='Acme')
+        jobs = [
+            SimpleNamespace(
+                id=uuid.UUID(int=rng.getrandbits(128)), title=f'Backend Engineer {index}',
+                company=company, is_remote=index % 3 == 0, location=location,
+            )
+            for index in range(options['jobs'])
+        ]
+        digests = [
+            (
+                SimpleNamespace(first_name=f'User {index}'),
+                [
+                    (f'Search {section}', rng.sample(jobs, rng.randint(1, 5)))
+                    for section in range(rng.randint(1, 3))
+                ],
+            )
+            for index in range(options['digests'])
+        ]
+
+        def job_context(job):
+            return {'job': job, 'url': f'https://example.com/jobs/{job.id}'}
+
+        def sections(searches, blocks):
+            return [
+                {'label': label, 'jobs': [blocks[job.id] for job in picked], 'more': 0}
+                for label, picked in searches
+            ]
+
+        # Both sides render each job's block once and reuse it, as send_job_alert_digests does,
+        # so only the rendering strategy differs
+        def baseline():
+            blocks = {job.id: render_to_string(f'emails/{JOB_TEMPLATE}', job_context(job)) for job in jobs}
+            return [
+                render_to_string(f'emails/{DIGEST_TEMPLATE}', {'user': user, 'sections': sections(searches, blocks)})
+                for user, searches in digests
+            ]
+
+        def batched():
+            blocks = dict(zip((job.id for job in jobs), render_emails(JOB_TEMPLATE, [job_context(job) for job in jobs])))
+            return render_emails(DIGEST_TEMPLATE, [
+                {'user': user, 'sections': sections(searches, blocks)} for user, searches in digests
+            ])
+
+        def best_of(render):
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                output = render()
+                timings.append(time.perf_counter() - started)
+            return output, min(timings)
+
+        baseline, baseline_seconds = best_of(baseline)
+        batched, batched_seconds = best_of(batched)
+
+        count = len(digests)
+        self.stdout.write(f'render_to_string: {baseline_seconds:.3f}s ({count / baseline_seconds:.0f} digests/s)')
+        self.stdout.write(f'batch renderer:   {batched_seconds:.3f}s ({count / batched_seconds:.0f} digests/s)')
+        if batched != baseline:
+            self.stdout.write(self.style.ERROR('Outputs differ.'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Identical output, batch renderer {baseline_seconds / batched_seconds:.2f}x as fast.'
+        ))
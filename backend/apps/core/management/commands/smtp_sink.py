@@ -0,0 +1,37 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from apps.core.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = (
+        'Run a local SMTP server that records mail instead of delivering it. Point the app at it with '
+        'EMAIL_HOST=localhost EMAIL_PORT=1025 EMAIL_USE_TLS=false.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=1025)
+        parser.add_argument('--outdir', help='Write each message to this directory as a .eml file.')
+        parser.add_argument(
+            '--reject-domain', action='append', default=[],
+            help='Refuse recipients at this domain with a permanent 550 (repeatable).'
+        )
+        parser.add_argument(
+            '--fail-rate', type=float, default=0.0,
+            help='Share of messages answered with a transient 451, between 0 and 1.'
+        )
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(options['outdir'], options['reject_domain'], options['fail_rate'])
+        self.stdout.write(f"SMTP sink listening on {options['host']}:{options['port']}")
+        try:
+            asyncio.run(sink.serve(options['host'], options['port']))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f'Accepted {len(sink.messages)} message(s) over {sink.connections} connection(s), '
+            f'deferred {sink.deferred}.'
+        ))
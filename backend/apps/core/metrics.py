@@ -0,0 +1,95 @@
+"""
+Shared pieces of the task and request metrics: a ``percentile_cont``
+aggregate and an in-process buffer of rows written with ``bulk_create``.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Aggregate, FloatField
+
+logger = logging.getLogger(__name__)
+
+# Every RunBuffer instance, reset in forked children
+registry = []
+
+
+class Percentile(Aggregate):
+    function = 'PERCENTILE_CONT'
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+class RunBuffer:
+    """
+    Rows of ``model`` waiting to be written. ``<prefix>_FLUSH_SIZE`` and
+    ``<prefix>_FLUSH_SECONDS`` decide when ``add`` reports a flush as due;
+    the caller flushes, so it can do so off the event loop. A daemon timer
+    started by the first row after a flush writes the rows of a process that
+    goes idle before another one arrives.
+    """
+
+    def __init__(self, model, setting_prefix):
+        self.model = model
+        self.setting_prefix = setting_prefix
+        self.rows = []
+        self.flushed_at = time.monotonic()
+        self._timer = None
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def add(self, row):
+        seconds = getattr(settings, f'{self.setting_prefix}_FLUSH_SECONDS')
+        with self._lock:
+            self.rows.append(row)
+            due = (
+                len(self.rows) >= getattr(settings, f'{self.setting_prefix}_FLUSH_SIZE')
+                or time.monotonic() - self.flushed_at >= seconds
+            )
+            if not due and self._timer is None:
+                self._timer = threading.Timer(seconds, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        return due
+
+    def drain(self):
+        with self._lock:
+            rows, self.rows = self.rows, []
+            self.flushed_at = time.monotonic()
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        return rows
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        finally:
+            # bulk_create opened a connection for this thread, which ends here
+            connections.close_all()
+
+    def flush(self):
+        rows = self.drain()
+        if rows:
+            try:
+                self.model.objects.bulk_create(rows, batch_size=500)
+            except Exception:
+                # Metrics must never fail the work that produced them
+                logger.exception(f"Dropped {len(rows)} {self.model._meta.verbose_name_plural.lower()}")
+
+
+def _reset_after_fork():
+    # The parent writes its own rows, and its timer threads don't exist here
+    for buffer in registry:
+        buffer.rows = []
+        buffer._timer = None
+        buffer._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,7 +1,13 @@
 import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.http import JsonResponse
 from django.conf import settings
 
+from apps.core import request_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,3 +47,89 @@ class JsonExceptionMiddleware:
             }, status=500)
 
         return None  # Let Django handle non-API requests (e.g. Admin) Normally
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures each request (wall time, SQL, cache, serializers, see
+    ``apps.core.request_metrics``), adds a ``Server-Timing`` header if
+    ``REQUEST_METRICS_SERVER_TIMING`` is on and records the numbers under the
+    resolved view name. Works in both sync and async
+    stacks; for streaming responses the time is up to the headers.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+        metrics, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_metrics.current.reset(token)
+            duration_ms = self.duration_ms(metrics)
+            if metrics.profiler is not None:
+                request_metrics.finish_profile(metrics, self.url_name(request), duration_ms)
+        if self.finish(request, response, metrics, duration_ms):
+            request_metrics.buffer.flush()
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return await self.get_response(request)
+        metrics, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_metrics.current.reset(token)
+            duration_ms = self.duration_ms(metrics)
+            if metrics.profiler is not None:
+                # Same request context, so the same thread the view ran in
+                await sync_to_async(request_metrics.finish_profile, thread_sensitive=True)(
+                    metrics, self.url_name(request), duration_ms
+                )
+        if self.finish(request, response, metrics, duration_ms):
+            await sync_to_async(request_metrics.buffer.flush, thread_sensitive=True)()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Runs in the view's thread; async views run on the event loop, which
+        # can't be profiled per request
+        metrics = request_metrics.current.get()
+        if (
+            metrics is not None and metrics.wants_profile and metrics.profiler is None
+            and not iscoroutinefunction(view_func)
+        ):
+            request_metrics.start_profile(metrics)
+        return None
+
+    def start(self, request):
+        metrics = request_metrics.RequestMetrics(
+            wants_profile=random.random() < settings.REQUEST_PROFILE_SAMPLE_RATE
+        )
+        return metrics, request_metrics.current.set(metrics)
+
+    def duration_ms(self, metrics):
+        return (time.perf_counter() - metrics.started_at) * 1000
+
+    def url_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        return match.view_name if match else ''
+
+    def finish(self, request, response, metrics, duration_ms):
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing(duration_ms)
+            if settings.CORS_ALLOWED_ORIGINS:
+                # Cross-origin pages only see Server-Timing with this header
+                response['Timing-Allow-Origin'] = ', '.join(settings.CORS_ALLOWED_ORIGINS)
+        sampled = random.random() < settings.REQUEST_METRICS_SAMPLE_RATE
+        return request_metrics.record(request, response, metrics, self.url_name(request), duration_ms, sampled)
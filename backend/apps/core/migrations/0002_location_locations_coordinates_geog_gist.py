@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:24
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='location',
+            index=django.contrib.postgres.indexes.GistIndex(django.db.models.functions.comparison.Cast('coordinates', output_field=django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326)), name='locations_coordinates_geog_gist'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_outboundemail'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='outboundemail',
+            name='outbound_emails_due_idx',
+        ),
+        migrations.AddField(
+            model_name='outboundemail',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=5),
+        ),
+        migrations.AddIndex(
+            model_name='outboundemail',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['-priority', 'next_attempt_at'], name='outbound_emails_due_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:10
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_outboundemail_priority'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('task_name', models.CharField(max_length=255)),
+                ('queue', models.CharField(blank=True, max_length=50)),
+                ('state', models.CharField(max_length=20)),
+                ('runtime_ms', models.FloatField()),
+                ('wait_ms', models.FloatField(blank=True, null=True)),
+                ('retries', models.PositiveSmallIntegerField(default=0)),
+                ('finished_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Task Run',
+                'verbose_name_plural': 'Task Runs',
+                'db_table': 'task_runs',
+                'indexes': [models.Index(fields=['finished_at'], name='task_runs_finished_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:05
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_taskrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('url_name', models.CharField(blank=True, max_length=255)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField()),
+                ('db_queries', models.PositiveIntegerField(default=0)),
+                ('db_ms', models.FloatField(default=0)),
+                ('cache_hits', models.PositiveIntegerField(default=0)),
+                ('cache_misses', models.PositiveIntegerField(default=0)),
+                ('cache_ms', models.FloatField(default=0)),
+                ('serializer_ms', models.FloatField(default=0)),
+                ('profile', models.CharField(blank=True, max_length=255)),
+                ('finished_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Request Run',
+                'verbose_name_plural': 'Request Runs',
+                'db_table': 'request_runs',
+                'indexes': [models.Index(fields=['finished_at'], name='request_runs_finished_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.db.models.functions import Cast
 import uuid
 
 
@@ -25,6 +27,115 @@ class Location(TimeStampedModel):
         verbose_name = 'Location'
         verbose_name_plural = 'Locations'
         db_table = 'locations'
+        indexes = [
+            # Geography cast used by ST_DWithin / <-> in apps.jobs.geo
+            GistIndex(
+                Cast('coordinates', output_field=models.PointField(geography=True, srid=4326)),
+                name='locations_coordinates_geog_gist'
+            ),
+            # Trigram indexes for fuzzy autocomplete in apps.core.autocomplete
+            GinIndex(fields=['city'], opclasses=['gin_trgm_ops'], name='locations_city_trgm'),
+            GinIndex(fields=['state'], opclasses=['gin_trgm_ops'], name='locations_state_trgm'),
+            GinIndex(fields=['country'], opclasses=['gin_trgm_ops'], name='locations_country_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.city}, {self.state}, {self.country}"
+
+
+class OutboundEmail(TimeStampedModel):
+    """A message waiting in, or delivered from, the outbox (see ``apps.core.mail``)."""
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        SENDING = 'SENDING', 'Sending'
+        SENT = 'SENT', 'Sent'
+        FAILED = 'FAILED', 'Failed'
+
+    to_email = models.EmailField()
+    # Recipient domain, for per-domain concurrency limits
+    domain = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    attachments = models.JSONField(default=list, blank=True)
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    # Higher is sent first: verification mail overtakes a digest backlog
+    priority = models.PositiveSmallIntegerField(default=5)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        db_table = 'outbound_emails'
+        indexes = [
+            # Claiming due messages; SENT and FAILED rows stay out of the index
+            models.Index(
+                fields=['-priority', 'next_attempt_at'], name='outbound_emails_due_idx',
+                condition=models.Q(status='PENDING'),
+            ),
+            models.Index(
+                fields=['domain', 'claimed_at'], name='outbound_emails_sending_idx',
+                condition=models.Q(status='SENDING'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to_email} ({self.status})"
+
+
+class TaskRun(TimeStampedModel):
+    """One finished Celery task execution, recorded by ``apps.core.task_metrics``."""
+    task_name = models.CharField(max_length=255)
+    queue = models.CharField(max_length=50, blank=True)
+    state = models.CharField(max_length=20)
+    runtime_ms = models.FloatField()
+    # Time between publishing and starting; null for tasks with a countdown or eta
+    wait_ms = models.FloatField(blank=True, null=True)
+    retries = models.PositiveSmallIntegerField(default=0)
+    finished_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Task Run'
+        verbose_name_plural = 'Task Runs'
+        db_table = 'task_runs'
+        indexes = [
+            models.Index(fields=['finished_at'], name='task_runs_finished_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} {self.state} in {self.runtime_ms:.0f}ms"
+
+
+class RequestRun(TimeStampedModel):
+    """One sampled HTTP request, recorded by ``apps.core.middleware.RequestMetricsMiddleware``."""
+    # Resolved view name (e.g. 'jobs:job-detail'); blank for requests that didn't resolve
+    url_name = models.CharField(max_length=255, blank=True)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    db_queries = models.PositiveIntegerField(default=0)
+    db_ms = models.FloatField(default=0)
+    cache_hits = models.PositiveIntegerField(default=0)
+    cache_misses = models.PositiveIntegerField(default=0)
+    cache_ms = models.FloatField(default=0)
+    serializer_ms = models.FloatField(default=0)
+    # Path of the saved cProfile trace when the request was profiled and slow
+    profile = models.CharField(max_length=255, blank=True)
+    finished_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Request Run'
+        verbose_name_plural = 'Request Runs'
+        db_table = 'request_runs'
+        indexes = [
+            models.Index(fields=['finished_at'], name='request_runs_finished_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.url_name or '-'} {self.status_code} in {self.duration_ms:.0f}ms"
@@ -1,7 +1,168 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class VariableResultsSetPagination(PageNumberPagination):
     page_size = '10'
     page_size_query_param = 'page_size'
-    max_page_size  = 100
\ No newline at end of file
+    max_page_size  = 100
+
+
+def encode_cursor(values):
+    """Encode the keyset position ``values`` (a list of JSON-able values) as an opaque token."""
+    payload = json.dumps(values, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    if not isinstance(values, list):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    return values
+
+
+def estimate_count(queryset):
+    """
+    Cheap row estimate for ``queryset``: ``pg_class.reltuples`` for an unfiltered
+    table, otherwise the planner's row estimate. ``None`` if unknown.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for tables that have never been vacuumed or analyzed
+        return row[0] if row and row[0] >= 0 else None
+
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return plan[0]['Plan']['Plan Rows']
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a fixed, unique ordering such as ``('-updated_at', '-id')``.
+
+    Each page is fetched with a ``WHERE (key) < (last key)`` condition instead of
+    ``OFFSET``, so deep pages cost the same as the first one, and no ``COUNT(*)``
+    is run. ``?estimate=true`` adds an ``estimated_count`` from Postgres'
+    statistics. Cursors are opaque and only move forward.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    estimate_query_param = 'estimate'
+    ordering = ('-updated_at', '-id')
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    @staticmethod
+    def keyset_filter(ordering, values):
+        """
+        Rows strictly after ``values`` in ``ordering``: for ``(a, b)`` that is
+        ``a after va OR (a = va AND b after vb)``, for any mix of directions.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        self.estimated_count = None
+        if request.query_params.get(self.estimate_query_param, '').lower() in ('1', 'true'):
+            self.estimated_count = estimate_count(queryset)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(self.ordering):
+                raise ValidationError({'cursor': 'Invalid cursor.'})
+            queryset = queryset.filter(self.keyset_filter(self.ordering, values))
+
+        try:
+            rows = list(queryset[:page_size + 1])
+        except (DjangoValidationError, ValueError):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        values = [getattr(self.last, field.lstrip('-')) for field in self.ordering]
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, encode_cursor(values)
+        )
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([('next', self.get_next_link())])
+        if self.estimated_count is not None:
+            response['estimated_count'] = self.estimated_count
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'estimated_count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Opt-in keyset pagination for a view that otherwise pages by number.
+    Clients switch with ``?pagination=cursor`` (or by sending a ``cursor``);
+    the view's ``keyset_ordering`` must end in a unique field.
+    """
+    keyset_ordering = ('-updated_at', '-id')
+
+    def use_keyset_pagination(self):
+        params = self.request.query_params
+        return params.get('pagination') == 'cursor' or KeysetPagination.cursor_query_param in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.use_keyset_pagination():
+            self._paginator = KeysetPagination()
+        return super().paginator
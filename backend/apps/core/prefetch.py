@@ -0,0 +1,87 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+
+def _related_field(model, source):
+    try:
+        return model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+
+
+def _collect(serializer, model, prefix, in_prefetch, select, prefetch):
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        source = field.source.replace('.', '__')
+        if '__' in source:
+            # Dotted sources (e.g. 'company.name') only need the first hop planned
+            source = source.split('__')[0]
+
+        model_field = _related_field(model, source)
+        if model_field is None or not model_field.is_relation:
+            continue
+
+        path = f'{prefix}{source}'
+        many = model_field.many_to_many or model_field.one_to_many
+
+        if isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+            prefetch.add(path)
+            child = getattr(field, 'child', None)
+            if isinstance(child, serializers.BaseSerializer):
+                _collect(child, model_field.related_model, f'{path}__', True, select, prefetch)
+            continue
+
+        if isinstance(field, PrimaryKeyRelatedField) and not many:
+            # Forward FKs rendered as a pk read the local "<name>_id" column
+            continue
+
+        if isinstance(field, serializers.BaseSerializer):
+            if many or in_prefetch:
+                prefetch.add(path)
+            else:
+                select.add(path)
+            _collect(field, model_field.related_model, f'{path}__', in_prefetch or many, select, prefetch)
+        elif many or in_prefetch:
+            prefetch.add(path)
+        else:
+            select.add(path)
+
+
+@lru_cache(maxsize=None)
+def get_queryset_plan(serializer_class, model):
+    """
+    Walk the (nested) fields of ``serializer_class`` and work out which relations
+    of ``model`` have to be joined or prefetched to serialize it without N+1 queries.
+
+    Returns a ``(select_related, prefetch_related)`` pair of sorted tuples.
+    """
+    select, prefetch = set(), set()
+    _collect(serializer_class(), model, '', False, select, prefetch)
+
+    # A prefetch through a path that is already joined is redundant
+    prefetch = {path for path in prefetch if path not in select}
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+def plan_queryset(queryset, serializer_class):
+    select, prefetch = get_queryset_plan(serializer_class, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class QuerysetPlannerMixin:
+    """
+    View mixin that applies the select/prefetch plan of the view's serializer
+    to ``get_queryset()``. Put it before the DRF generic view in the bases.
+    """
+
+    def get_queryset(self):
+        return plan_queryset(super().get_queryset(), self.get_serializer_class())
@@ -0,0 +1,263 @@
+"""
+Per-request performance metrics.
+
+``RequestMetricsMiddleware`` opens a ``RequestMetrics`` for each request
+and keeps it in a context variable, which ``sync_to_async`` carries into
+the thread a sync view runs in. While one is open:
+
+* every SQL statement is counted and timed by a wrapper added to each
+  database connection as it is created;
+* ``get``/``get_many`` on the configured cache backends count hits, misses
+  and time spent;
+* ``serializer.data`` and ``serializer.is_valid`` are timed (outermost call
+  only, so nested serializers aren't counted twice). Queries run while
+  serializing count towards both the database and serializer time.
+
+Outside a request (Celery, management commands) the hooks only look up the
+empty context variable.
+
+A sampled share of requests is written to ``RequestRun`` through the same
+buffer as the task metrics, and every request is logged as one JSON line to
+the ``apps.core.request_metrics`` logger. ``summarize`` aggregates per view
+name. With ``REQUEST_PROFILE_SAMPLE_RATE`` above zero, that share of requests
+runs under cProfile and traces of the ones slower than
+``REQUEST_PROFILE_SLOW_MS`` are saved to ``REQUEST_PROFILE_DIR`` as pstats
+files (``python -m pstats`` or snakeviz open them).
+"""
+import atexit
+import contextvars
+import cProfile
+import json
+import logging
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.backends.signals import connection_created
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from apps.core.metrics import Percentile, RunBuffer
+from apps.core.models import RequestRun
+
+logger = logging.getLogger(__name__)
+
+current = contextvars.ContextVar('request_metrics', default=None)
+buffer = RunBuffer(RequestRun, 'REQUEST_METRICS')
+
+_MISSING = object()
+
+
+class RequestMetrics:
+    __slots__ = (
+        'started_at', 'db_queries', 'db_ms', 'cache_hits', 'cache_misses', 'cache_ms',
+        'serializer_ms', 'wants_profile', 'profiler', 'profile', 'in_cache', 'in_serializer',
+    )
+
+    def __init__(self, wants_profile=False):
+        self.started_at = time.perf_counter()
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_ms = 0.0
+        self.serializer_ms = 0.0
+        self.wants_profile = wants_profile
+        self.profiler = None
+        self.profile = ''
+        self.in_cache = False
+        self.in_serializer = False
+
+    def server_timing(self, duration_ms):
+        """``Server-Timing`` header value; the entries overlap, ``app`` covers all of them."""
+        return ', '.join([
+            f'app;dur={duration_ms:.1f}',
+            f'db;dur={self.db_ms:.1f};desc="{self.db_queries} queries"',
+            f'cache;dur={self.cache_ms:.1f};desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'serializer;dur={self.serializer_ms:.1f}',
+        ])
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_queries += 1
+        metrics.db_ms += (time.perf_counter() - started) * 1000
+
+
+def add_query_wrapper(sender, connection, **kwargs):
+    # Connections are reopened on the same wrapper object, keep one hook each
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _timed_cache_get(get):
+    def wrapper(self, key, default=None, version=None):
+        metrics = current.get()
+        if metrics is None or metrics.in_cache:
+            return get(self, key, default, version)
+        metrics.in_cache = True
+        started = time.perf_counter()
+        try:
+            value = get(self, key, _MISSING, version)
+        finally:
+            metrics.cache_ms += (time.perf_counter() - started) * 1000
+            metrics.in_cache = False
+        if value is _MISSING:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+    return wrapper
+
+
+def _timed_cache_get_many(get_many):
+    def wrapper(self, keys, version=None):
+        metrics = current.get()
+        if metrics is None or metrics.in_cache:
+            return get_many(self, keys, version)
+        keys = list(keys)
+        metrics.in_cache = True
+        started = time.perf_counter()
+        try:
+            found = get_many(self, keys, version)
+        finally:
+            metrics.cache_ms += (time.perf_counter() - started) * 1000
+            metrics.in_cache = False
+        metrics.cache_hits += len(found)
+        metrics.cache_misses += len(keys) - len(found)
+        return found
+    return wrapper
+
+
+def _timed_serializer(method):
+    def wrapper(*args, **kwargs):
+        metrics = current.get()
+        if metrics is None or metrics.in_serializer:
+            return method(*args, **kwargs)
+        metrics.in_serializer = True
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.serializer_ms += (time.perf_counter() - started) * 1000
+            metrics.in_serializer = False
+    return wrapper
+
+
+_installed = False
+
+
+def install():
+    """Hook the database, cache backends and serializers. Called once from ``CoreConfig.ready``."""
+    global _installed
+    if _installed or not settings.REQUEST_METRICS_ENABLED:
+        return
+    _installed = True
+
+    connection_created.connect(add_query_wrapper, dispatch_uid='request_metrics_query_wrapper')
+
+    for backend in {type(caches[alias]) for alias in settings.CACHES}:
+        backend.get = _timed_cache_get(backend.get)
+        backend.get_many = _timed_cache_get_many(backend.get_many)
+
+    BaseSerializer.data = property(_timed_serializer(BaseSerializer.data.fget))
+    for serializer_class in (BaseSerializer, ListSerializer):
+        if 'is_valid' in vars(serializer_class):
+            serializer_class.is_valid = _timed_serializer(serializer_class.is_valid)
+
+
+def start_profile(metrics):
+    """Profile the calling thread, the one the view runs in."""
+    metrics.profiler = cProfile.Profile()
+    metrics.profiler.enable()
+
+
+def finish_profile(metrics, url_name, duration_ms):
+    """Stop the profiler (from the thread that started it) and keep the trace if the request was slow."""
+    metrics.profiler.disable()
+    if duration_ms < settings.REQUEST_PROFILE_SLOW_MS:
+        return
+    directory = Path(settings.REQUEST_PROFILE_DIR)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        name = (url_name or 'unresolved').replace(':', '.')
+        path = directory / f"{timezone.now():%Y%m%dT%H%M%S}-{name}-{duration_ms:.0f}ms-{uuid.uuid4().hex[:8]}.prof"
+        metrics.profiler.dump_stats(path)
+        # Oldest traces go first once the directory is full
+        traces = sorted(directory.glob('*.prof'), key=lambda trace: trace.stat().st_mtime)
+        for trace in traces[:-settings.REQUEST_PROFILE_MAX_FILES]:
+            trace.unlink(missing_ok=True)
+    except OSError:
+        logger.exception(f"Could not save the profile of a {duration_ms:.0f}ms request")
+        return
+    metrics.profile = str(path)
+
+
+def record(request, response, metrics, url_name, duration_ms, sampled):
+    """Log the request and buffer a ``RequestRun`` if it was sampled. Returns whether a flush is due."""
+    logger.info(json.dumps({
+        'method': request.method,
+        'url_name': url_name,
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 2),
+        'db_queries': metrics.db_queries,
+        'db_ms': round(metrics.db_ms, 2),
+        'cache_hits': metrics.cache_hits,
+        'cache_misses': metrics.cache_misses,
+        'cache_ms': round(metrics.cache_ms, 2),
+        'serializer_ms': round(metrics.serializer_ms, 2),
+        'profile': metrics.profile or None,
+    }))
+    if not sampled:
+        return False
+    return buffer.add(RequestRun(
+        url_name=url_name,
+        method=request.method,
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        db_queries=metrics.db_queries,
+        db_ms=metrics.db_ms,
+        cache_hits=metrics.cache_hits,
+        cache_misses=metrics.cache_misses,
+        cache_ms=metrics.cache_ms,
+        serializer_ms=metrics.serializer_ms,
+        profile=metrics.profile,
+        finished_at=timezone.now(),
+    ))
+
+
+atexit.register(buffer.flush)
+
+
+def summarize(since):
+    """Per view name and method: request count, errors, p50/p95 duration and the average cost breakdown since ``since``."""
+    rows = RequestRun.objects.filter(finished_at__gte=since).values('url_name', 'method').annotate(
+        requests=Count('id'),
+        errors=Count('id', filter=Q(status_code__gte=500)),
+        duration_p50_ms=Percentile('duration_ms', 0.5),
+        duration_p95_ms=Percentile('duration_ms', 0.95),
+        db_queries_avg=Avg('db_queries'),
+        db_ms_p95=Percentile('db_ms', 0.95),
+        serializer_ms_avg=Avg('serializer_ms'),
+        cache_hits=Sum('cache_hits'),
+        cache_misses=Sum('cache_misses'),
+        profiles=Count('id', filter=~Q(profile='')),
+    ).order_by('-duration_p95_ms')
+    return list(rows)
+
+
+def prune():
+    """Delete runs older than ``REQUEST_METRICS_RETENTION_DAYS``. Returns the number deleted."""
+    cutoff = timezone.now() - timedelta(days=settings.REQUEST_METRICS_RETENTION_DAYS)
+    deleted, _ = RequestRun.objects.filter(finished_at__lt=cutoff).delete()
+    return deleted
@@ -1,47 +1,55 @@
 from django.conf import settings
-from django.core.mail import EmailMessage, EmailMultiAlternatives
 
-from django.template.loader import render_to_string
 from celery.utils.log import get_task_logger
 
+from apps.core import mail
+from apps.core.email_templates import render_email, render_emails
+
 logger = get_task_logger(__name__)
 
 
 class EmailService:
+    """
+    Emails are written to the outbox and delivered in batches by
+    ``apps.core.tasks.deliver_outbound_emails`` (see ``apps.core.mail``).
+    """
     @staticmethod
     def send_email(subject, message, to_email, from_email=None, attachments = None):
-        email = EmailMessage(
-            subject=subject,
-            body=message,
-            from_email=from_email or settings.EMAIL_HOST_USER,
-            to=[to_email] if isinstance(to_email, str) else to_email
-        )
-
-        if attachments:
-            for attachment in attachments:
-                email.attach_file(attachment)
-            
-        email.send(fail_silently=True)
+        recipients = [to_email] if isinstance(to_email, str) else to_email
+        mail.enqueue([
+            mail.build_email(recipient, subject, body=message, from_email=from_email, attachments=attachments)
+            for recipient in recipients
+        ])
     
 
     @staticmethod
-    def send_template_email(subject, template_name, context, to_email, from_email=None, attachments=None):
-        html_content = render_to_string(template_name=f'emails/{template_name}', context=context)
-
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body='',
-            from_email=from_email or settings.EMAIL_HOST_USER,
-            to=[to_email] if isinstance(to_email, str) else to_email
-        )
-        email.attach_alternative(html_content, 'text/html')
+    def send_template_email(subject, template_name, context, to_email, from_email=None, attachments=None,
+                            priority=mail.PRIORITY_NORMAL):
+        html_content = render_email(template_name, context)
 
-        if attachments:
-            for attchment in attachments:
-                email.attach_file(attchment)
-        
-        email.send(fail_silently=True)
+        recipients = [to_email] if isinstance(to_email, str) else to_email
+        mail.enqueue([
+            mail.build_email(
+                recipient, subject, html_body=html_content, from_email=from_email,
+                attachments=attachments, priority=priority
+            )
+            for recipient in recipients
+        ])
 
+    @staticmethod
+    def send_template_emails(messages, template_name, from_email=None, base_context=None,
+                             priority=mail.PRIORITY_LOW):
+        """
+        Render ``template_name`` for each ``(subject, context, to_email)`` in
+        ``messages`` in one batch, each context layered over the shared
+        ``base_context``, and queue them all with one insert at low priority
+        by default, since bulk mail can wait. Returns the number queued.
+        """
+        html_contents = render_emails(template_name, [context for _, context, _ in messages], base_context)
+        return mail.enqueue([
+            mail.build_email(to_email, subject, html_body=html_content, from_email=from_email, priority=priority)
+            for (subject, _, to_email), html_content in zip(messages, html_contents)
+        ])
     
     @staticmethod
     def send_welcome_email(user):
@@ -59,7 +67,8 @@ class EmailService:
             subject='Verify your email',
             template_name='welcome.html',
             context={'user': user, 'verification_url': verification_url},
-            to_email=user.email
+            to_email=user.email,
+            priority=mail.PRIORITY_HIGH
         )
     
     @staticmethod
@@ -70,5 +79,6 @@ class EmailService:
             subject='Verify your email',
             template_name='resendverification.html',
             context={'user': user, 'verification_url': verification_url},
-            to_email=user.email
+            to_email=user.email,
+            priority=mail.PRIORITY_HIGH
         )
\ No newline at end of file
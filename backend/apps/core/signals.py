@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.autocomplete import LocationTrie
+from apps.core.models import Location
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_autocomplete(sender, **kwargs):
+    LocationTrie.invalidate()
@@ -0,0 +1,122 @@
+"""
+A local SMTP server that accepts and records mail instead of delivering it.
+
+Speaks enough of RFC 5321 for ``smtplib`` and Django's SMTP backend (EHLO,
+AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT) on asyncio, so one
+process can take many concurrent connections. Recipient domains can be
+refused with a permanent 550, and a share of messages can get a transient
+451, to exercise the outbox's retry and failure handling.
+"""
+import asyncio
+import random
+from email import message_from_bytes, policy
+from pathlib import Path
+
+MAX_MESSAGE_BYTES = 10 * 1024 * 1024
+
+
+def parse_address(argument):
+    """'FROM:<a@b.com> SIZE=123' -> 'a@b.com'"""
+    return argument.partition(':')[2].strip().split(' ')[0].strip('<>')
+
+
+class SMTPSink:
+    def __init__(self, outdir=None, reject_domains=(), fail_rate=0.0):
+        self.outdir = Path(outdir) if outdir else None
+        self.reject_domains = {domain.lower() for domain in reject_domains}
+        self.fail_rate = fail_rate
+        self.messages = []
+        self.connections = 0
+        self.deferred = 0
+
+    def store(self, sender, recipients, data):
+        message = message_from_bytes(data, policy=policy.default)
+        record = {'from': sender, 'to': recipients, 'subject': message.get('Subject', '')}
+        self.messages.append(record)
+        if self.outdir:
+            self.outdir.mkdir(parents=True, exist_ok=True)
+            (self.outdir / f'{len(self.messages):06d}.eml').write_bytes(data)
+        return record
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+
+        async def reply(line):
+            writer.write(f'{line}\r\n'.encode())
+            await writer.drain()
+
+        sender, recipients = None, []
+        await reply('220 cleverhire-sink ESMTP')
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+                verb, _, argument = line.partition(' ')
+                verb = verb.upper()
+
+                if verb == 'EHLO':
+                    writer.write(b'250-cleverhire-sink\r\n250-AUTH PLAIN LOGIN\r\n')
+                    await reply(f'250 SIZE {MAX_MESSAGE_BYTES}')
+                elif verb == 'HELO':
+                    await reply('250 cleverhire-sink')
+                elif verb == 'AUTH':
+                    mechanism = argument.split(' ')[0].upper()
+                    if mechanism == 'LOGIN':
+                        await reply('334 VXNlcm5hbWU6')
+                        await reader.readline()
+                        await reply('334 UGFzc3dvcmQ6')
+                        await reader.readline()
+                    elif mechanism == 'PLAIN' and ' ' not in argument:
+                        await reply('334 ')
+                        await reader.readline()
+                    await reply('235 Authentication successful')
+                elif verb == 'MAIL':
+                    sender, recipients = parse_address(argument), []
+                    await reply('250 OK')
+                elif verb == 'RCPT':
+                    recipient = parse_address(argument)
+                    if recipient.rsplit('@', 1)[-1].lower() in self.reject_domains:
+                        await reply('550 Mailbox unavailable')
+                    else:
+                        recipients.append(recipient)
+                        await reply('250 OK')
+                elif verb == 'DATA':
+                    if not recipients:
+                        await reply('503 No valid recipients')
+                        continue
+                    await reply('354 End data with <CR><LF>.<CR><LF>')
+                    lines = []
+                    while True:
+                        data_line = await reader.readline()
+                        if data_line in (b'.\r\n', b'.\n', b''):
+                            break
+                        # Undo dot-stuffing
+                        lines.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                    if random.random() < self.fail_rate:
+                        self.deferred += 1
+                        await reply('451 Try again later')
+                    else:
+                        self.store(sender, recipients, b''.join(lines))
+                        await reply('250 OK: queued')
+                    sender, recipients = None, []
+                elif verb == 'RSET':
+                    sender, recipients = None, []
+                    await reply('250 OK')
+                elif verb == 'NOOP':
+                    await reply('250 OK')
+                elif verb == 'QUIT':
+                    await reply('221 Bye')
+                    break
+                else:
+                    await reply('502 Command not implemented')
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=1025):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,28 @@
+from celery import shared_task
+from django.apps import apps
+from django.core.cache import cache
+
+from apps.core import counters, mail, request_metrics, task_metrics
+
+
+@shared_task(ignore_result=True)
+def apply_counter_deltas(model_label, field, deltas):
+    counters.apply_deltas(apps.get_model(model_label), field, deltas)
+
+
+@shared_task(ignore_result=True)
+def deliver_outbound_emails(urgent=False):
+    if not urgent:
+        # Cleared first so messages queued during this run schedule another one
+        cache.delete(mail.DELIVERY_SCHEDULED_KEY)
+    mail.deliver_pending()
+
+
+@shared_task(ignore_result=True)
+def prune_task_runs():
+    task_metrics.prune()
+
+
+@shared_task(ignore_result=True)
+def prune_request_runs():
+    request_metrics.prune()
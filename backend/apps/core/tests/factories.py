@@ -0,0 +1,81 @@
+"""Small model builders shared by the app test suites."""
+import itertools
+
+from django.contrib.gis.geos import Point
+
+from apps.core.models import Location
+from apps.jobs.models import Job, Skill
+from apps.users.models import CompanyProfile, Profile, User
+
+_sequence = itertools.count(1)
+
+
+def make_user(**fields):
+    n = next(_sequence)
+    fields.setdefault('email', f'user{n}@example.com')
+    fields.setdefault('username', f'user{n}')
+    fields.setdefault('first_name', 'Test')
+    fields.setdefault('last_name', f'User {n}')
+    return User.objects.create_user(password='password', **fields)
+
+
+def make_employer(**fields):
+    """A user who owns a company, i.e. ``is_employer``. Returns ``(user, company)``."""
+    user = make_user(role=User.Role.EMPLOYER, **fields)
+    company = CompanyProfile.objects.create(user=user, company_name=f'{user.first_name} Co')
+    return user, company
+
+
+def make_job_seeker(skills=(), **profile_fields):
+    user = make_user()
+    profile = Profile.objects.create(user=user, **profile_fields)
+    if skills:
+        profile.skills.set(skills)
+    return user
+
+
+def make_skill(name=None, **fields):
+    return Skill.objects.create(name=name or f'Skill {next(_sequence)}', **fields)
+
+
+def make_location(city='Berlin', lng=13.405, lat=52.52, **fields):
+    fields.setdefault('state', city)
+    fields.setdefault('country', 'Germany')
+    return Location.objects.create(city=city, coordinates=Point(lng, lat, srid=4326), **fields)
+
+
+def make_job(employer, company=None, skills=(), **fields):
+    fields.setdefault('title', f'Engineer {next(_sequence)}')
+    fields.setdefault('description', 'Build and run services.')
+    fields.setdefault('requirements', 'Experience with web backends.')
+    fields.setdefault('status', Job.Status.PUBLISHED)
+    job = Job.objects.create(employer=employer, company=company, **fields)
+    if skills:
+        job.required_skills.set(skills)
+    return job
+
+
+def make_pdf(*pages):
+    """Bytes of a minimal PDF with one line of text per page."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        content = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\nendstream')
+        objects.append(
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>'
+        )
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    body = b'%PDF-1.4\n'
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f'{number} 0 obj\n{obj}\nendobj\n'.encode()
+    xref = len(body)
+    body += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    body += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode()
+    body += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return body
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.core.ai import PAYLOAD_MARKER, AIGateway, AIRetryableError, StubBackend, TokenBucket
+
+
+class FlakyBackend:
+    """Fails each prompt ``failures`` times before answering; records the loop of every session."""
+    name = 'flaky'
+    model = 'test'
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = {}
+        self.session_loops = []
+
+    @asynccontextmanager
+    async def session(self):
+        self.session_loops.append(asyncio.get_running_loop())
+        yield self.generate
+
+    async def generate(self, prompt):
+        self.calls[prompt] = self.calls.get(prompt, 0) + 1
+        if self.calls[prompt] <= self.failures:
+            raise AIRetryableError('503')
+        return prompt.upper()
+
+
+def make_gateway(backend, max_retries=2, bucket=None):
+    return AIGateway(
+        backend, requests_per_minute=6000, max_concurrency=2, max_retries=max_retries, timeout=5, bucket=bucket,
+    )
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_reservations_beyond_the_burst_wait_their_turn(self):
+        bucket = TokenBucket(rate=1e-6, capacity=2)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 1e6, delta=1)
+        self.assertAlmostEqual(bucket.reserve(), 2e6, delta=1)
+
+    def test_refills_up_to_capacity(self):
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        bucket.updated_at -= 60
+        bucket.reserve()
+        self.assertAlmostEqual(bucket.tokens, 1.0, places=2)
+
+
+@mock.patch.object(AIGateway, 'backoff', return_value=0)
+class AIGatewayTests(SimpleTestCase):
+    def test_responses_keep_prompt_order(self, backoff):
+        self.assertEqual(make_gateway(FlakyBackend()).generate_many(['a', 'b', 'c']), ['A', 'B', 'C'])
+
+    def test_retries_transient_failures(self, backoff):
+        backend = FlakyBackend(failures=2)
+        self.assertEqual(make_gateway(backend).generate_many(['a']), ['A'])
+        self.assertEqual(backend.calls['a'], 3)
+
+    def test_gives_up_after_max_retries(self, backoff):
+        backend = FlakyBackend(failures=5)
+        [result] = make_gateway(backend, max_retries=1).generate_many(['a'])
+        self.assertIsInstance(result, AIRetryableError)
+        self.assertEqual(backend.calls['a'], 2)
+
+    def test_each_run_gets_its_own_session(self, backoff):
+        backend = FlakyBackend()
+        gateway = make_gateway(backend)
+        gateway.generate_many(['a'])
+        gateway.generate_many(['b'])
+        self.assertEqual(len(backend.session_loops), 2)
+        self.assertIsNot(backend.session_loops[0], backend.session_loops[1])
+        self.assertTrue(all(loop.is_closed() for loop in backend.session_loops))
+
+    def test_rate_limit_spans_runs(self, backoff):
+        bucket = TokenBucket(rate=1e-6, capacity=3)
+        gateway = make_gateway(FlakyBackend(), bucket=bucket)
+        gateway.generate_many(['a', 'b'])
+        gateway.generate_many(['c'])
+        self.assertAlmostEqual(bucket.tokens, 0, places=3)
+
+
+class StubBackendTests(SimpleTestCase):
+    def test_answers_every_item_deterministically(self):
+        items = [
+            {'id': '1', 'job': {'skills': ['Python', 'Go']}, 'candidate': {'skills': ['python']}},
+            {'id': '2', 'job': {'skills': []}, 'candidate': {'skills': []}},
+        ]
+        prompt = f'Rate these.\n{PAYLOAD_MARKER}\n{json.dumps(items)}'
+        first = make_gateway(StubBackend()).generate_many([prompt, prompt])
+        self.assertEqual(first[0], first[1])
+        answers = json.loads(first[0])
+        self.assertEqual([answer['id'] for answer in answers], ['1', '2'])
+        self.assertEqual((answers[0]['strengths'], answers[0]['gaps']), (['python'], ['go']))
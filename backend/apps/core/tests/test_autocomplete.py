@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core import autocomplete
+from apps.core.autocomplete import LocationTrie, normalize
+from apps.core.tests.factories import make_employer, make_job, make_location
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_folds_case_accents_and_punctuation(self):
+        self.assertEqual(normalize('  São-Paulo, BRAZIL '), 'sao paulo brazil')
+        self.assertEqual(normalize(None), '')
+
+
+class LocationTrieTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.new_york = make_location('New York', state='New York', country='United States')
+        cls.york = make_location('York', state='North Yorkshire', country='United Kingdom')
+        cls.newark = make_location('Newark', state='New Jersey', country='United States')
+        cls.munich = make_location('München', state='Bavaria')
+        employer, company = make_employer()
+        for _ in range(2):
+            make_job(employer, company, location=cls.newark)
+
+    def setUp(self):
+        cache.clear()
+        self.trie = LocationTrie()
+        self.trie.ensure_fresh()
+
+    def labels(self, query, limit=10):
+        return [row['city'] for row in self.trie.search(query, limit)]
+
+    def test_every_word_is_a_prefix(self):
+        # Both match on a city word with no jobs, so alphabetical by label
+        self.assertEqual(self.labels('york'), ['New York', 'York'])
+        self.assertEqual(self.labels('new york'), ['New York'])
+        self.assertEqual(self.labels('munc'), ['München'])
+
+    def test_job_count_breaks_ties_within_a_field(self):
+        # Both match on the city; Newark has jobs
+        self.assertEqual(self.labels('new'), ['Newark', 'New York'])
+        self.assertEqual(self.labels('new', limit=1), ['Newark'])
+
+    def test_unknown_prefix(self):
+        self.assertEqual(self.labels('zzz'), [])
+        self.assertEqual(self.labels(' , '), [])
+
+    def test_rebuild_swaps_the_whole_snapshot(self):
+        old = self.trie.snapshot
+        with self.captureOnCommitCallbacks(execute=True):
+            make_location('Yonkers', state='New York', country='United States')
+        snapshot = self.trie.ensure_fresh()
+        self.assertIsNot(snapshot, old)
+        self.assertEqual(self.labels('yonk'), ['Yonkers'])
+        self.assertNotIn('Yonkers', [entry['city'] for entry in old.locations.values()])
+
+    def test_rebuilt_in_each_rank_epoch(self):
+        snapshot = self.trie.ensure_fresh()
+        self.assertIs(self.trie.ensure_fresh(), snapshot)
+        with mock.patch.object(autocomplete, 'rank_epoch', return_value=snapshot.epoch + 1):
+            self.assertIsNot(self.trie.ensure_fresh(), snapshot)
+
+    def test_trigram_fallback_for_typos(self):
+        with mock.patch.object(autocomplete, 'location_trie', self.trie):
+            results = autocomplete.autocomplete('Nwark', 5)
+        self.assertIn(str(self.newark.id), [row['id'] for row in results])
+
+
+class LocationAutocompleteViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_location('Berlin')
+        self.client = APIClient()
+        self.url = reverse('location-autocomplete')
+
+    def test_etag_revalidation(self):
+        response = self.client.get(self.url, {'q': 'ber'})
+        self.assertEqual([row['city'] for row in response.data], ['Berlin'])
+        etag = response['ETag']
+
+        response = self.client.get(self.url, {'q': 'ber'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_data_and_rank_epoch(self):
+        etag = self.client.get(self.url, {'q': 'ber'})['ETag']
+        with mock.patch('apps.core.views.rank_epoch', return_value=0):
+            self.assertNotEqual(self.client.get(self.url, {'q': 'ber'})['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_location('Bern', country='Switzerland')
+        self.assertNotEqual(self.client.get(self.url, {'q': 'ber'})['ETag'], etag)
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase
+
+from apps.core import content_cache
+from apps.core.content_cache import ContentCache, hash_file
+from apps.core.tests.factories import make_pdf
+from apps.users import resume
+
+
+class ContentCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def make_cache(self, **options):
+        instance = ContentCache('test', **options)
+        self.addCleanup(content_cache.registry.remove, instance)
+        return instance
+
+    def test_hash_file_is_sha256_and_rewinds(self):
+        file = ContentFile(b'resume bytes' * 10000)
+        self.assertEqual(hash_file(file), hash_file(ContentFile(b'resume bytes' * 10000)))
+        self.assertEqual(file.read(6), b'resume')
+
+    def test_computes_once_and_counts_hits(self):
+        store = self.make_cache()
+        compute = mock.Mock(return_value={'text': 'cv'})
+        self.assertEqual(store.get_or_compute('abc', compute), ({'text': 'cv'}, False))
+        self.assertEqual(store.get_or_compute('abc', compute), ({'text': 'cv'}, True))
+        compute.assert_called_once()
+        self.assertEqual(store.stats()['hit_rate'], 0.5)
+
+    def test_shared_cache_serves_other_processes(self):
+        self.make_cache().set('abc', 'parsed')
+        # A second instance stands in for another worker with an empty LRU
+        other = self.make_cache()
+        self.assertEqual(other.get('abc'), 'parsed')
+        self.assertEqual(other.stats()['local_entries'], 1)
+
+    def test_version_is_part_of_the_key(self):
+        self.make_cache(version=1).set('abc', 'old')
+        self.assertIsNone(self.make_cache(version=2).get('abc'))
+
+    def test_local_tier_is_bounded(self):
+        store = self.make_cache(local_size=2)
+        for digest in ('a', 'b', 'c'):
+            store.set(digest, digest)
+        self.assertEqual(list(store._local), ['b', 'c'])
+
+    def test_delete(self):
+        store = self.make_cache()
+        store.set('abc', 'parsed')
+        store.delete('abc')
+        self.assertIsNone(store.get('abc'))
+
+
+class ResumeParseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        resume.resume_cache._local.clear()
+
+    def test_same_file_is_parsed_once(self):
+        content = make_pdf('Summary', 'Backend developer')
+        with mock.patch.object(resume, 'parse_resume_file', wraps=resume.parse_resume_file) as parse:
+            first, digest, hit = resume.parse_resume_cached(ContentFile(content, name='a.pdf'))
+            second, same_digest, second_hit = resume.parse_resume_cached(ContentFile(content, name='b.pdf'))
+        parse.assert_called_once()
+        self.assertEqual((hit, second_hit), (False, True))
+        self.assertEqual(digest, same_digest)
+        self.assertEqual(first, second)
+
+        # Callers get their own copy
+        second.pop('sections')
+        self.assertIn('sections', resume.parse_resume_cached(ContentFile(content, name='c.pdf'))[0])
@@ -0,0 +1,69 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core import counters
+from apps.core.counters import CounterBuffer, apply_deltas
+from apps.core.tests.factories import make_employer, make_job
+from apps.jobs.models import Job
+
+
+@override_settings(COUNTER_FLUSH_SECONDS=60, COUNTER_MAX_PENDING=3)
+class CounterBufferTests(SimpleTestCase):
+    def setUp(self):
+        self.buffer = CounterBuffer(Job, 'view_count')
+        self.addCleanup(counters.registry.remove, self.buffer)
+        self.addCleanup(self.buffer.drain)
+        patcher = mock.patch('apps.core.tasks.apply_counter_deltas.delay')
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_increments_are_summed_until_flushed(self):
+        self.buffer.incr('a')
+        self.buffer.incr('a', 2)
+        self.buffer.incr('b')
+        self.delay.assert_not_called()
+
+        self.buffer.flush()
+        self.delay.assert_called_once_with('jobs.Job', 'view_count', {'a': 3, 'b': 1})
+        self.buffer.flush()
+        self.delay.assert_called_once()
+
+    def test_flushes_once_max_pending_rows_are_buffered(self):
+        for pk in ('a', 'b', 'c'):
+            self.buffer.incr(pk)
+        self.delay.assert_called_once_with('jobs.Job', 'view_count', {'a': 1, 'b': 1, 'c': 1})
+
+    def test_idle_buffer_is_flushed_by_its_timer(self):
+        flushed = threading.Event()
+        self.delay.side_effect = lambda *args: flushed.set()
+        with override_settings(COUNTER_FLUSH_SECONDS=0.05):
+            self.buffer.incr('a')
+        self.assertTrue(flushed.wait(5))
+        self.delay.assert_called_once_with('jobs.Job', 'view_count', {'a': 1})
+
+    def test_flush_cancels_the_timer(self):
+        self.buffer.incr('a')
+        timer = self.buffer._timer
+        self.assertTrue(timer.is_alive())
+        self.buffer.flush()
+        timer.join(5)
+        self.assertFalse(timer.is_alive())
+        self.assertIsNone(self.buffer._timer)
+
+
+class ApplyDeltasTests(TestCase):
+    def test_adds_deltas_without_touching_updated_at(self):
+        employer, company = make_employer()
+        jobs = [make_job(employer, company) for _ in range(3)]
+        updated_at = [job.updated_at for job in jobs]
+
+        # Two rows share a delta, so two statements cover three rows
+        with self.assertNumQueries(2):
+            updated = apply_deltas(Job, 'view_count', {jobs[0].pk: 2, jobs[1].pk: 2, jobs[2].pk: 5})
+        self.assertEqual(updated, 3)
+        for job, expected, previous in zip(jobs, (2, 2, 5), updated_at):
+            job.refresh_from_db()
+            self.assertEqual(job.view_count, expected)
+            self.assertEqual(job.updated_at, previous)
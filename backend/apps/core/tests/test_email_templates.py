@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.email_templates import CompiledEmail, get_email_template, render_email, render_emails
+
+
+def compile_email(source):
+    return CompiledEmail(engines['django'].from_string(source).template)
+
+
+def shape(segments):
+    return [(dynamic, len(nodes)) for dynamic, nodes in segments]
+
+
+class SegmentTests(SimpleTestCase):
+    def test_static_nodes_are_merged_between_dynamic_ones(self):
+        email = compile_email('<h1>{{ site }}</h1><p>Hi {{ user.first_name }}</p>{% if site %}{{ site }}{% endif %}')
+        self.assertEqual(shape(email.segments({'user'})), [(False, 3), (True, 1), (False, 2)])
+        self.assertEqual(shape(email.segments(set())), [(False, 6)])
+
+    def test_names_in_nested_nodes_make_the_parent_dynamic(self):
+        email = compile_email('{% for job in jobs %}{% if job.remote %}{{ user }}{% endif %}{% endfor %}')
+        self.assertEqual(shape(email.segments({'user'})), [(True, 1)])
+        self.assertEqual(shape(email.segments({'other'})), [(False, 1)])
+
+    def test_includes_are_always_dynamic(self):
+        email = compile_email('a{% include "emails/partials/job_alert_job.html" %}b')
+        self.assertEqual(shape(email.segments(set())), [(False, 1), (True, 1), (False, 1)])
+
+
+class RenderTests(SimpleTestCase):
+    def test_render_many_matches_rendering_each_context(self):
+        source = '{{ site }}|{% for n in numbers %}{% cycle "odd" "even" %}{{ n }}{% endfor %}|{{ name|upper }}'
+        email = compile_email(source)
+        template = engines['django'].from_string(source)
+        deltas = [{'name': 'ann', 'numbers': [1, 2, 3]}, {'name': '<b>', 'numbers': [4]}]
+
+        outputs = list(email.render_many({'site': 'CleverHire'}, deltas))
+        self.assertEqual(outputs, [template.render({'site': 'CleverHire', **delta}) for delta in deltas])
+        # Autoescaping applies and the cycle starts over for every recipient
+        self.assertEqual(outputs[1], 'CleverHire|odd4|&lt;B&gt;')
+
+    def test_render_emails_matches_render_to_string(self):
+        user = SimpleNamespace(first_name='Ann')
+        contexts = [
+            {'user': user, 'sections': [{'label': 'Python', 'jobs': ['<li>Job</li>'], 'more': 2}]},
+            {'user': user, 'sections': []},
+        ]
+        self.assertEqual(
+            render_emails('job_alert_digest.html', contexts),
+            [render_to_string('emails/job_alert_digest.html', context) for context in contexts],
+        )
+        self.assertEqual(
+            render_email('job_alert_digest.html', contexts[0]),
+            render_to_string('emails/job_alert_digest.html', contexts[0]),
+        )
+
+    @override_settings(DEBUG=False)
+    def test_compiled_templates_are_cached(self):
+        self.assertIs(get_email_template('welcome.html'), get_email_template('welcome.html'))
+
+    @override_settings(DEBUG=True)
+    def test_debug_reloads_templates(self):
+        self.assertIsNot(get_email_template('welcome.html'), get_email_template('welcome.html'))
@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core import mail
+from apps.core.models import OutboundEmail
+from apps.core.smtp_sink import SMTPSink
+
+
+def outbox(*addresses):
+    emails = [
+        mail.build_email(address, f'Hello {address}', 'Body', from_email='jobs@cleverhire.test')
+        for address in addresses
+    ]
+    mail.enqueue(emails)
+    return emails
+
+
+class SinkServer:
+    """Runs an ``SMTPSink`` on a free local port in a background event loop."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self.sink.handle, '127.0.0.1', 0), self.loop
+        ).result(5)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.close()
+        asyncio.run_coroutine_threadsafe(self.server.wait_closed(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+    def settings(self):
+        return override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.port, EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        )
+
+
+class ClaimTests(TestCase):
+    @override_settings(OUTBOX_DOMAIN_CONCURRENCY=2)
+    def test_domain_limit_counts_messages_in_flight(self):
+        outbox('a@busy.test', 'b@busy.test', 'c@busy.test', 'd@quiet.test')
+        self.assertEqual(
+            sorted(email.domain for email in mail.claim_batch()), ['busy.test', 'busy.test', 'quiet.test']
+        )
+        self.assertEqual(mail.claim_batch(), [])
+
+    def test_stale_claims_are_handed_out_again(self):
+        stale, fresh = outbox('a@example.test', 'b@example.test')
+        mail.claim_batch()
+        OutboundEmail.objects.filter(id=stale.id).update(claimed_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual([email.id for email in mail.claim_batch()], [stale.id])
+
+
+class DeliveryTests(TestCase):
+    def test_batch_is_sent_over_one_connection(self):
+        sink = SMTPSink(reject_domains=['gone.test'])
+        outbox('a@example.test', 'b@example.test', 'c@other.test', 'd@gone.test')
+        with SinkServer(sink) as server, server.settings():
+            self.assertEqual(mail.deliver_pending(), (3, 0, 1))
+
+        self.assertEqual(sink.connections, 1)
+        self.assertEqual(
+            sorted(message['to'][0] for message in sink.messages),
+            ['a@example.test', 'b@example.test', 'c@other.test'],
+        )
+        self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.Status.SENT).count(), 3)
+        refused = OutboundEmail.objects.get(to_email='d@gone.test')
+        self.assertEqual(refused.status, OutboundEmail.Status.FAILED)
+        self.assertIn('SMTPRecipientsRefused', refused.last_error)
+
+    def test_transient_failures_reconnect_and_back_off(self):
+        sink = SMTPSink(fail_rate=1.0)
+        outbox('a@example.test', 'b@example.test')
+        with SinkServer(sink) as server, server.settings():
+            self.assertEqual(mail.deliver_pending(), (0, 2, 0))
+
+        self.assertEqual(sink.deferred, 2)
+        self.assertEqual(sink.connections, 2)
+        for email in OutboundEmail.objects.all():
+            self.assertEqual(email.status, OutboundEmail.Status.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            self.assertIsNone(email.claimed_at)
+
+    def test_refresh_claim_only_touches_messages_in_flight(self):
+        outbox('a@example.test', 'b@example.test')
+        emails = mail.claim_batch()
+        claimed_at = timezone.now() - timedelta(hours=1)
+        OutboundEmail.objects.update(claimed_at=claimed_at)
+        OutboundEmail.objects.filter(id=emails[1].id).update(status=OutboundEmail.Status.SENT)
+
+        mail.refresh_claim(emails)
+        self.assertGreater(OutboundEmail.objects.get(id=emails[0].id).claimed_at, claimed_at)
+        self.assertEqual(OutboundEmail.objects.get(id=emails[1].id).claimed_at, claimed_at)
+
+    def test_long_batches_refresh_their_claim(self):
+        outbox('a@example.test', 'b@example.test')
+        emails = mail.claim_batch()
+        # Every message appears to take longer than the claim timeout
+        clock = itertools.count(0, 60 * 60)
+        with mock.patch.object(mail.time, 'monotonic', side_effect=lambda: next(clock)), \
+                mock.patch.object(mail, 'refresh_claim') as refresh_claim:
+            self.assertEqual(mail.deliver(emails), (2, 0, 0))
+        self.assertEqual(refresh_claim.call_count, 2)
@@ -0,0 +1,81 @@
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from apps.core.pagination import KeysetPagination, decode_cursor, encode_cursor
+from apps.core.tests.factories import make_employer, make_job, make_skill
+from apps.jobs.models import Job
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        values = [12.5, 'a0b1', None]
+        cursor = encode_cursor(values)
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor), values)
+
+    def test_rejects_garbage(self):
+        for cursor in ('%%%', encode_cursor({'a': 1})[:-2], 'eyJhIjoxfQ'):
+            with self.subTest(cursor=cursor), self.assertRaises(ValidationError):
+                decode_cursor(cursor)
+
+    def test_keyset_filter_handles_mixed_directions(self):
+        self.assertEqual(
+            KeysetPagination.keyset_filter(('-score', 'name', 'id'), (5, 'b', 7)),
+            Q(score__lt=5) | (Q(score=5) & Q(name__gt='b')) | (Q(score=5) & Q(name='b') & Q(id__gt=7)),
+        )
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        cls.jobs = [make_job(cls.employer, cls.company) for _ in range(5)]
+        # Equal timestamps so the id tie-break decides the order
+        Job.objects.update(updated_at=timezone.now())
+        for name in ('Go', 'Rust', 'Python', 'Django'):
+            make_skill(name)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def collect(self, url, params):
+        ids, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids += [row['id'] for row in response.data['results']]
+            pages += 1
+            if response.data['next'] is None:
+                return ids, pages
+            response = self.client.get(response.data['next'])
+
+    def test_walks_every_job_once_in_order(self):
+        ids, pages = self.collect(reverse('job-list-create'), {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(ids, sorted((str(job.id) for job in self.jobs), reverse=True))
+        self.assertEqual(pages, 3)
+
+    def test_ascending_ordering(self):
+        _, pages = self.collect(reverse('skills'), {'pagination': 'cursor', 'page_size': 3})
+        response = self.client.get(reverse('skills'), {'pagination': 'cursor', 'page_size': 10})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Django', 'Go', 'Python', 'Rust'])
+        self.assertEqual(pages, 2)
+
+    def test_page_numbers_stay_the_default(self):
+        response = self.client.get(reverse('job-list-create'))
+        self.assertEqual(response.data['count'], 5)
+
+    def test_cursor_must_match_the_ordering(self):
+        response = self.client.get(reverse('job-list-create'), {'cursor': encode_cursor(['2026-01-01'])})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('job-list-create'), {'cursor': encode_cursor(['yesterday', 'x'])})
+        self.assertEqual(response.status_code, 400)
+
+    def test_estimated_count(self):
+        response = self.client.get(reverse('job-list-create'), {'pagination': 'cursor', 'estimate': 'true'})
+        self.assertIsInstance(response.data['estimated_count'], int)
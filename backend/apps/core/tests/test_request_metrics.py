@@ -0,0 +1,191 @@
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core import metrics, request_metrics
+from apps.core.metrics import RunBuffer
+from apps.core.models import RequestRun
+from apps.core.request_metrics import RequestMetrics
+from apps.core.tests.factories import make_skill, make_user
+
+
+class FakeRuns:
+    """Stands in for a model; ``bulk_create`` records the rows and the thread that wrote them."""
+
+    def __init__(self):
+        self.written = []
+        self.threads = []
+        self.done = threading.Event()
+        self.objects = self
+        self._meta = SimpleNamespace(verbose_name_plural='Fake Runs')
+
+    def bulk_create(self, rows, batch_size):
+        self.written += rows
+        self.threads.append(threading.current_thread())
+        self.done.set()
+
+
+@override_settings(REQUEST_METRICS_FLUSH_SIZE=3, REQUEST_METRICS_FLUSH_SECONDS=60)
+class RunBufferTests(SimpleTestCase):
+    def setUp(self):
+        self.model = FakeRuns()
+        self.buffer = RunBuffer(self.model, 'REQUEST_METRICS')
+        self.addCleanup(self.buffer.drain)
+
+    def test_add_reports_a_flush_once_full(self):
+        self.assertEqual([self.buffer.add(row) for row in 'abc'], [False, False, True])
+        self.buffer.flush()
+        self.assertEqual(self.model.written, ['a', 'b', 'c'])
+        self.assertIsNone(self.buffer._timer)
+
+    def test_idle_buffer_is_flushed_by_its_timer(self):
+        with override_settings(REQUEST_METRICS_FLUSH_SECONDS=0.05):
+            self.assertFalse(self.buffer.add('a'))
+        self.assertTrue(self.model.done.wait(5))
+        self.assertEqual(self.model.written, ['a'])
+        self.assertIsNot(self.model.threads[0], threading.current_thread())
+        self.assertIsNone(self.buffer._timer)
+
+    def test_one_timer_per_flush(self):
+        self.buffer.add('a')
+        timer = self.buffer._timer
+        self.buffer.add('b')
+        self.assertIs(self.buffer._timer, timer)
+        self.buffer.flush()
+        self.assertTrue(timer.finished.is_set())
+
+    def test_timer_closes_its_database_connections(self):
+        with mock.patch.object(metrics, 'connections') as connections:
+            self.buffer.add('a')
+            self.buffer._flush_on_timer()
+        connections.close_all.assert_called_once_with()
+        self.assertEqual(self.model.written, ['a'])
+
+    def test_forked_children_start_empty(self):
+        self.buffer.add('a')
+        metrics._reset_after_fork()
+        self.assertEqual(self.buffer.rows, [])
+        self.assertIsNone(self.buffer._timer)
+        self.buffer.add('b')
+        self.assertIsNotNone(self.buffer._timer)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def measure(self):
+        measured = RequestMetrics()
+        token = request_metrics.current.set(measured)
+        self.addCleanup(request_metrics.current.reset, token)
+        return measured
+
+    def test_queries_and_cache_reads_are_counted_inside_a_request(self):
+        measured = self.measure()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        cache.set('present', 1)
+        cache.get('present')
+        cache.get('absent')
+        cache.get_many(['present', 'absent', 'other'])
+
+        self.assertEqual(measured.db_queries, 1)
+        self.assertGreater(measured.db_ms, 0)
+        self.assertEqual((measured.cache_hits, measured.cache_misses), (2, 3))
+        self.assertEqual(cache.get('absent', 'default'), 'default')
+
+    def test_nothing_is_counted_outside_a_request(self):
+        measured = RequestMetrics()
+        cache.get('absent')
+        self.assertEqual((measured.db_queries, measured.cache_misses), (0, 0))
+
+    def test_server_timing(self):
+        measured = RequestMetrics()
+        measured.db_queries, measured.db_ms = 3, 1.25
+        self.assertEqual(
+            measured.server_timing(10),
+            'app;dur=10.0, db;dur=1.2;desc="3 queries", cache;dur=0.0;desc="0 hits, 0 misses", serializer;dur=0.0',
+        )
+
+
+class MiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_skill('Python')
+
+    def setUp(self):
+        patcher = mock.patch.object(request_metrics, 'buffer', RunBuffer(RequestRun, 'REQUEST_METRICS'))
+        self.buffer = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.buffer.drain)
+        self.url = reverse('skills')
+
+    def test_server_timing_is_off_by_default(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('Timing-Allow-Origin', response)
+
+    @override_settings(REQUEST_METRICS_SERVER_TIMING=True)
+    def test_server_timing_when_enabled(self):
+        response = self.client.get(self.url)
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_unsampled_requests_are_only_logged(self):
+        with self.assertLogs(request_metrics.logger, 'INFO') as logs:
+            self.client.get(self.url)
+        self.assertIn('"status": 200', logs.output[0])
+        self.assertEqual(self.buffer.rows, [])
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0, REQUEST_METRICS_FLUSH_SIZE=1)
+    def test_sampled_requests_are_stored(self):
+        self.client.get(self.url)
+        run = RequestRun.objects.get()
+        self.assertEqual((run.url_name, run.method, run.status_code), (resolve(self.url).view_name, 'GET', 200))
+        self.assertGreater(run.db_queries, 0)
+        self.assertGreater(run.serializer_ms, 0)
+
+
+class SummaryTests(TestCase):
+    def make_run(self, url_name, duration_ms, status_code=200, finished_at=None):
+        return RequestRun.objects.create(
+            url_name=url_name, method='GET', status_code=status_code, duration_ms=duration_ms,
+            db_queries=2, finished_at=finished_at or timezone.now(),
+        )
+
+    def test_summarize_orders_by_slowest_p95(self):
+        for duration_ms in (10, 20, 30, 40):
+            self.make_run('skills', duration_ms)
+        self.make_run('job-detail', 900, status_code=500)
+        self.make_run('job-detail', 5000, finished_at=timezone.now() - timedelta(days=2))
+
+        slow, fast = request_metrics.summarize(timezone.now() - timedelta(hours=1))
+        self.assertEqual((slow['url_name'], slow['requests'], slow['errors']), ('job-detail', 1, 1))
+        self.assertEqual((fast['url_name'], fast['requests'], fast['errors']), ('skills', 4, 0))
+        self.assertAlmostEqual(fast['duration_p50_ms'], 25)
+        self.assertEqual(fast['db_queries_avg'], 2)
+
+    @override_settings(REQUEST_METRICS_RETENTION_DAYS=1)
+    def test_prune_deletes_expired_runs(self):
+        self.make_run('skills', 10, finished_at=timezone.now() - timedelta(days=2))
+        kept = self.make_run('skills', 10)
+        self.assertEqual(request_metrics.prune(), 1)
+        self.assertEqual(list(RequestRun.objects.all()), [kept])
+
+    def test_view_is_for_admins(self):
+        self.make_run('skills', 10)
+        client = APIClient()
+        client.force_authenticate(make_user())
+        self.assertEqual(client.get(reverse('request-metrics')).status_code, 403)
+
+        client.force_authenticate(make_user(is_staff=True))
+        response = client.get(reverse('request-metrics'))
+        self.assertEqual(response.data['sample_rate'], 0.0)
+        self.assertEqual([row['url_name'] for row in response.data['views']], ['skills'])
@@ -0,0 +1,112 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core import task_metrics
+from apps.core.metrics import RunBuffer
+from apps.core.models import TaskRun
+from apps.core.tests.factories import make_user
+
+
+def fake_task(name='apps.jobs.tasks.run_job_alerts', published_at=None, eta=None, retries=0):
+    request = SimpleNamespace(eta=eta, retries=retries, delivery_info={'routing_key': 'alerts'})
+    if published_at is not None:
+        setattr(request, task_metrics.PUBLISHED_HEADER, published_at)
+    return SimpleNamespace(name=name, request=request)
+
+
+def make_run(task_name, runtime_ms, state='SUCCESS', finished_at=None, wait_ms=None):
+    return TaskRun.objects.create(
+        task_name=task_name, queue='io', state=state, runtime_ms=runtime_ms, wait_ms=wait_ms,
+        finished_at=finished_at or timezone.now(),
+    )
+
+
+@override_settings(TASK_METRICS_ENABLED=True)
+class RecordRunTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(task_metrics, 'buffer', RunBuffer(TaskRun, 'TASK_METRICS'))
+        self.buffer = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.buffer.drain)
+
+    def run_task(self, task, state='SUCCESS'):
+        task_metrics.start_timer(task_id='t1', task=task)
+        task_metrics.record_run(task_id='t1', task=task, state=state)
+
+    def test_publish_time_is_stamped_only_when_enabled(self):
+        headers = {}
+        task_metrics.stamp_publish_time(headers=headers)
+        self.assertIn(task_metrics.PUBLISHED_HEADER, headers)
+        with override_settings(TASK_METRICS_ENABLED=False):
+            headers = {}
+            task_metrics.stamp_publish_time(headers=headers)
+        self.assertEqual(headers, {})
+
+    def test_run_is_buffered_with_wait_and_retries(self):
+        self.run_task(fake_task(published_at=time.time() - 2, retries=1), state='RETRY')
+        run, = self.buffer.rows
+        self.assertEqual((run.task_name, run.queue, run.state, run.retries), (
+            'apps.jobs.tasks.run_job_alerts', 'alerts', 'RETRY', 1
+        ))
+        self.assertGreaterEqual(run.wait_ms, 2000)
+        self.assertGreaterEqual(run.runtime_ms, 0)
+        self.assertEqual(task_metrics._started, {})
+
+    def test_countdown_and_unstamped_tasks_have_no_wait(self):
+        self.run_task(fake_task(published_at=time.time() - 2, eta='2026-01-01T00:00:00'))
+        self.run_task(fake_task())
+        self.assertEqual([run.wait_ms for run in self.buffer.rows], [None, None])
+
+    def test_nothing_is_recorded_when_disabled(self):
+        with override_settings(TASK_METRICS_ENABLED=False):
+            self.run_task(fake_task())
+        self.assertEqual(self.buffer.rows, [])
+
+    @override_settings(TASK_METRICS_FLUSH_SIZE=2)
+    def test_full_buffer_is_written(self):
+        self.run_task(fake_task())
+        self.assertFalse(TaskRun.objects.exists())
+        self.run_task(fake_task())
+        self.assertEqual(TaskRun.objects.count(), 2)
+        self.assertEqual(self.buffer.rows, [])
+
+
+class SummaryTests(TestCase):
+    def test_summarize_orders_by_slowest_p95(self):
+        for runtime_ms in (10, 20, 30, 40):
+            make_run('fast', runtime_ms, wait_ms=runtime_ms)
+        make_run('slow', 500, state='FAILURE')
+        make_run('slow', 1000, state='RETRY')
+        make_run('old', 5000, finished_at=timezone.now() - timedelta(days=2))
+
+        slow, fast = task_metrics.summarize(timezone.now() - timedelta(hours=1))
+        self.assertEqual((slow['task_name'], slow['runs'], slow['failures'], slow['retries']), ('slow', 2, 1, 1))
+        self.assertEqual(fast['task_name'], 'fast')
+        self.assertAlmostEqual(fast['runtime_p50_ms'], 25)
+        self.assertAlmostEqual(fast['wait_p95_ms'], 38.5)
+        self.assertIsNone(slow['wait_p50_ms'])
+
+    @override_settings(TASK_METRICS_RETENTION_DAYS=1)
+    def test_prune_deletes_expired_runs(self):
+        make_run('old', 10, finished_at=timezone.now() - timedelta(days=2))
+        kept = make_run('new', 10)
+        self.assertEqual(task_metrics.prune(), 1)
+        self.assertEqual(list(TaskRun.objects.all()), [kept])
+
+    def test_view_is_for_admins(self):
+        make_run('fast', 10)
+        client = APIClient()
+        client.force_authenticate(make_user())
+        self.assertEqual(client.get(reverse('task-metrics')).status_code, 403)
+
+        client.force_authenticate(make_user(is_staff=True))
+        response = client.get(reverse('task-metrics'), {'hours': 'all'})
+        self.assertEqual(response.data['hours'], 24)
+        self.assertEqual([row['task_name'] for row in response.data['tasks']], ['fast'])
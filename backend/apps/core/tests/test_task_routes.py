@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase
+
+from config.celery import app
+
+
+def queue_for(task_name):
+    return app.amqp.router.route({}, task_name)['queue'].name
+
+
+class TaskRouteTests(SimpleTestCase):
+    def test_job_notifications_run_on_io(self):
+        self.assertEqual(queue_for('apps.jobs.tasks.notify_instant_searches'), 'io')
+        self.assertEqual(queue_for('apps.jobs.tasks.notify_job_closed'), 'io')
+
+    def test_other_job_tasks_run_on_alerts(self):
+        self.assertEqual(queue_for('apps.jobs.tasks.run_job_alerts'), 'alerts')
+        self.assertEqual(queue_for('apps.jobs.tasks.send_job_alert_digests'), 'alerts')
+
+    def test_unrouted_tasks_use_the_default_queue(self):
+        self.assertEqual(queue_for('apps.core.tasks.deliver_outbound_emails'), 'io')
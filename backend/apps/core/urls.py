@@ -1,9 +1,16 @@
 from django.urls import path
 
-from apps.core.views import LocationsView, LocationRetrieveUpdateDestroyView
+from apps.core.views import (
+    LocationsView, LocationRetrieveUpdateDestroyView, LocationAutocompleteView, ContentCacheStatsView, TaskMetricsView,
+    RequestMetricsView,
+)
 
 
 urlpatterns = [
     path('locations/', LocationsView.as_view(), name='locations'),
+    path('locations/autocomplete/', LocationAutocompleteView.as_view(), name='location-autocomplete'),
     path('locations/<uuid:id>/', LocationRetrieveUpdateDestroyView.as_view(), name='location'),
+    path('cache-stats/', ContentCacheStatsView.as_view(), name='content-cache-stats'),
+    path('task-metrics/', TaskMetricsView.as_view(), name='task-metrics'),
+    path('request-metrics/', RequestMetricsView.as_view(), name='request-metrics'),
 ]
@@ -1,9 +1,18 @@
-from django.http import JsonResponse
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
 
 
+from apps.core import content_cache, request_metrics, task_metrics
+from apps.core.autocomplete import LocationTrie, autocomplete, normalize, rank_epoch
 from apps.core.models import Location
 from apps.core.serializers import LocationSerializer
 
@@ -20,6 +29,74 @@ class LocationRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdminUser]
 
 
+class LocationAutocompleteView(generics.GenericAPIView):
+    """
+    Ranked prefix matches on city, state and country. The response only depends
+    on the query, the location data version and the rank epoch, so it is
+    cacheable and served with an ETag derived from all three.
+    """
+    permission_classes = [AllowAny]
+    default_limit = 10
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, settings.LOCATION_AUTOCOMPLETE_MAX_RESULTS))
+
+        version = LocationTrie.current_version()
+        key = f'{version}:{rank_epoch()}:{normalize(query)}:{limit}'
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = Response(autocomplete(query, limit))
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.LOCATION_AUTOCOMPLETE_MAX_AGE)
+        return response
+
+
+class ContentCacheStatsView(generics.GenericAPIView):
+    """Hit rates of the content addressed caches (resume parses, AI analysis)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response([cache.stats() for cache in content_cache.registry])
+
+
+class TaskMetricsView(generics.GenericAPIView):
+    """Per task p50/p95 runtime and queue wait, failures and retries over the last ``?hours=`` (default 24)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            hours = min(max(int(request.query_params.get('hours', 24)), 1), 24 * settings.TASK_METRICS_RETENTION_DAYS)
+        except ValueError:
+            hours = 24
+        since = timezone.now() - timedelta(hours=hours)
+        return Response({'hours': hours, 'tasks': task_metrics.summarize(since)})
+
+
+class RequestMetricsView(generics.GenericAPIView):
+    """Per view p50/p95 duration, errors and query, cache and serializer cost over the last ``?hours=`` (default 24)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            hours = min(max(int(request.query_params.get('hours', 24)), 1), 24 * settings.REQUEST_METRICS_RETENTION_DAYS)
+        except ValueError:
+            hours = 24
+        since = timezone.now() - timedelta(hours=hours)
+        return Response({
+            'hours': hours,
+            'sample_rate': settings.REQUEST_METRICS_SAMPLE_RATE,
+            'views': request_metrics.summarize(since),
+        })
+
+
 def custom404(request, exception=None):
     return JsonResponse({
         'success': False,
@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.utils import timezone
 
 # Register your models here.
-from apps.jobs.models import Skill, Job, SavedJob, SavedSearch
+from apps.jobs.models import Skill, SkillAlias, Job, SavedJob, SavedSearch
+from apps.jobs.taxonomy import merge_skills
 from apps.core.models import Location
 from apps.applications.models import Application
 
@@ -15,13 +17,36 @@ class ApplicationInline(admin.StackedInline):
 
 
 
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+    fields = ('name', 'normalized_name')
+    readonly_fields = ('normalized_name',)
+
+
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ['name', 'category', 'created_at', 'updated_at']
     list_filter = ['category']
     readonly_fields = ('created_at', 'updated_at')
-    search_fields = ['name']
+    search_fields = ['name', 'aliases__name']
     ordering = ['name']
+    inlines = (SkillAliasInline,)
+    actions = ['merge_into_oldest']
+
+    @admin.action(description='Merge selected skills into the oldest one')
+    def merge_into_oldest(self, request, queryset):
+        skills = list(queryset.order_by('created_at'))
+        merged = merge_skills(skills[0], skills[1:])
+        self.message_user(request, f"Merged {merged} skill(s) into {skills[0].name}.")
+
+
+@admin.register(SkillAlias)
+class SkillAliasAdmin(admin.ModelAdmin):
+    list_display = ['name', 'skill', 'normalized_name']
+    readonly_fields = ('normalized_name', 'created_at', 'updated_at')
+    search_fields = ['name', 'skill__name']
+    autocomplete_fields = ['skill']
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
@@ -45,5 +70,6 @@ class SavedSearchAdmin(admin.ModelAdmin):
     actions = ['make_inactive']
 
     def make_inactive(self, request, queryset):
-        queryset.update(is_active=False)
+        # Touch updated_at so the instant alert index picks the change up
+        queryset.update(is_active=False, updated_at=timezone.now())
 
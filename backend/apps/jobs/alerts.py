@@ -0,0 +1,204 @@
+"""
+Saved search alert engine.
+
+A run for one frequency loads the jobs published since the oldest due search
+was last sent, up to the run's own timestamp, once, into memory. Saved
+searches are grouped by their canonical query so each distinct query is
+evaluated once: structured filters run against the in-memory window and full
+text terms run one Postgres query per distinct term. Each subscriber then
+gets the matches published since their own ``last_sent_at``, and the digests
+are handed to email tasks in batches. Searches are stamped with the run's
+timestamp, so a job published while a run is in progress waits for the next.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.jobs.filters import search_jobs
+from apps.jobs.models import Job, SavedSearch
+from apps.jobs.serializers import JobSearchRequestSerializer
+
+logger = logging.getLogger(__name__)
+
+FREQUENCY_PERIODS = {
+    SavedSearch.Frequency.DAILY: timedelta(days=1),
+    SavedSearch.Frequency.WEEKLY: timedelta(days=7),
+}
+MULTI_VALUE_KEYS = ('skills', 'employment_type', 'experience_level')
+QUERY_KEYS = ('q', 'skills', 'employment_type', 'experience_level', 'is_remote', 'salary_min', 'location')
+
+
+def parse_query_params(query_params):
+    """
+    Validate a saved ``query_params`` dict with the search endpoint's rules and
+    return it in canonical form (sorted lists, strings for ids, no empty
+    values), or ``None`` if it is invalid.
+    """
+    data = {}
+    for key, value in (query_params or {}).items():
+        if key in MULTI_VALUE_KEYS and isinstance(value, str):
+            value = [item for item in value.split(',') if item]
+        data[key] = value
+
+    serializer = JobSearchRequestSerializer(data=data)
+    if not serializer.is_valid():
+        return None
+
+    params = {}
+    for key in QUERY_KEYS:
+        value = serializer.validated_data.get(key)
+        if value in (None, '', []):
+            continue
+        if key in MULTI_VALUE_KEYS:
+            value = sorted({str(item) for item in value})
+        elif key == 'location':
+            value = str(value)
+        elif key == 'q':
+            value = ' '.join(value.lower().split())
+        params[key] = value
+    return params
+
+
+def canonical_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def load_window(since, until):
+    """
+    Jobs published after ``since`` and up to ``until`` as plain dicts, with
+    their skill ids as sets of strings.
+    """
+    jobs = {
+        row['id']: dict(row, skills=set())
+        for row in Job.active_objects.filter(
+            status=Job.Status.PUBLISHED, published_at__gt=since, published_at__lte=until
+        ).values(
+            'id', 'published_at', 'employment_type', 'experience_level',
+            'is_remote', 'salary_max', 'location_id'
+        )
+    }
+    skill_rows = Job.required_skills.through.objects.filter(job_id__in=list(jobs)).values_list('job_id', 'skill_id')
+    for job_id, skill_id in skill_rows:
+        jobs[job_id]['skills'].add(str(skill_id))
+    return sorted(jobs.values(), key=lambda job: job['published_at'], reverse=True)
+
+
+def matches(params, job):
+    """Python equivalent of ``apply_job_filters`` for one job from ``load_window``."""
+    if 'skills' in params and job['skills'].isdisjoint(params['skills']):
+        return False
+    if 'employment_type' in params and job['employment_type'] not in params['employment_type']:
+        return False
+    if 'experience_level' in params and job['experience_level'] not in params['experience_level']:
+        return False
+    if 'is_remote' in params and job['is_remote'] != params['is_remote']:
+        return False
+    if 'salary_min' in params and (job['salary_max'] is None or job['salary_max'] < params['salary_min']):
+        return False
+    if 'location' in params and str(job['location_id']) != params['location']:
+        return False
+    return True
+
+
+def evaluate_queries(queries, jobs):
+    """Map each canonical key in ``queries`` to its matching jobs, newest first."""
+    window_ids = [job['id'] for job in jobs]
+    text_matches = {}
+    results = {}
+    for key, params in queries.items():
+        text = params.get('q')
+        if text and text not in text_matches:
+            text_matches[text] = set(
+                search_jobs(Job.objects.filter(id__in=window_ids), text).values_list('id', flat=True)
+            )
+        results[key] = [
+            job for job in jobs
+            if matches(params, job) and (not text or job['id'] in text_matches[text])
+        ]
+    return results
+
+
+def run_alerts(frequency, now=None):
+    """
+    Evaluate every due saved search with ``frequency`` and queue the digests.
+    Returns ``(searches, digests)`` counts.
+    """
+    from apps.jobs.tasks import send_job_alert_digests
+
+    now = now or timezone.now()
+    period = FREQUENCY_PERIODS[frequency]
+    # A little slack so a run that starts a few seconds early doesn't skip a search for a whole period
+    due_before = now - period + timedelta(minutes=5)
+    default_since = now - period
+
+    due = SavedSearch.objects.filter(is_active=True, alert_frequency=frequency).exclude(
+        last_sent_at__gt=due_before
+    ).values_list('id', 'user_id', 'query_params', 'last_sent_at')
+
+    groups = {}
+    queries = {}
+    search_ids = []
+    since = now
+    for search_id, user_id, query_params, last_sent_at in due.iterator(chunk_size=5000):
+        search_ids.append(search_id)
+        params = parse_query_params(query_params)
+        if params is None:
+            logger.warning(f"Skipping saved search {search_id} with invalid query params")
+            continue
+        key = canonical_key(params)
+        queries[key] = params
+        search_since = last_sent_at or default_since
+        groups.setdefault(key, []).append((search_id, user_id, search_since))
+        since = min(since, search_since)
+
+    digests = {}
+    if groups:
+        results = evaluate_queries(queries, load_window(since, now))
+        limit = settings.ALERT_DIGEST_MAX_JOBS
+        for key, subscribers in groups.items():
+            jobs = results[key]
+            if not jobs:
+                continue
+            for search_id, user_id, search_since in subscribers:
+                new_jobs = [str(job['id']) for job in jobs if search_since < job['published_at'] <= now]
+                if new_jobs:
+                    digests.setdefault(str(user_id), []).append({
+                        'search_id': str(search_id),
+                        'query': queries[key],
+                        'job_ids': new_jobs[:limit],
+                        'total': len(new_jobs),
+                    })
+
+    payloads = [{'user_id': user_id, 'searches': searches} for user_id, searches in digests.items()]
+    batch_size = settings.ALERT_EMAIL_BATCH_SIZE
+
+    # Advance the watermark before queueing so a retried run can't email the same jobs twice
+    with transaction.atomic():
+        for start in range(0, len(search_ids), 5000):
+            SavedSearch.objects.filter(id__in=search_ids[start:start + 5000]).update(last_sent_at=now)
+        for start in range(0, len(payloads), batch_size):
+            send_job_alert_digests.delay_on_commit(payloads[start:start + batch_size])
+
+    logger.info(
+        f"{frequency} alerts: {len(search_ids)} searches, {len(queries)} distinct queries, {len(payloads)} digests"
+    )
+    return len(search_ids), len(payloads)
+
+
+def describe_query(params):
+    """Short human readable label for a canonical query, for email subjects and headings."""
+    parts = []
+    if params.get('q'):
+        parts.append(f'"{params["q"]}"')
+    for key in ('employment_type', 'experience_level'):
+        if params.get(key):
+            parts.append(', '.join(value.replace('_', ' ').title() for value in params[key]))
+    if params.get('is_remote'):
+        parts.append('Remote')
+    if params.get('salary_min'):
+        parts.append(f'{params["salary_min"]}+')
+    return ' · '.join(parts) or 'All jobs'
@@ -0,0 +1,86 @@
+from django_elasticsearch_dsl import Document, fields
+from django_elasticsearch_dsl.registries import registry
+
+from apps.core.models import Location
+from apps.jobs.models import Job, Skill
+from apps.users.models import CompanyProfile
+
+
+@registry.register_document
+class JobDocument(Document):
+    id = fields.KeywordField()
+    title = fields.TextField(
+        analyzer='english',
+        fields={'raw': fields.KeywordField()}
+    )
+    description = fields.TextField(analyzer='english')
+    requirements = fields.TextField(analyzer='english')
+    skills = fields.NestedField(properties={
+        'id': fields.KeywordField(),
+        'name': fields.TextField(fields={'raw': fields.KeywordField()}),
+        'category': fields.KeywordField(),
+    })
+    company = fields.ObjectField(properties={
+        'id': fields.KeywordField(),
+        'company_name': fields.TextField(fields={'raw': fields.KeywordField()}),
+    })
+    location = fields.GeoPointField()
+    location_id = fields.KeywordField()
+    city = fields.KeywordField()
+    country = fields.KeywordField()
+    status = fields.KeywordField()
+    employment_type = fields.KeywordField()
+    experience_level = fields.KeywordField()
+
+    class Index:
+        name = 'jobs'
+        settings = {
+            'number_of_shards': 1,
+            'number_of_replicas': 0,
+        }
+
+    class Django:
+        model = Job
+        fields = [
+            'salary_min', 'salary_max', 'currency', 'is_remote',
+            'is_deleted', 'created_at', 'updated_at',
+        ]
+        related_models = [Skill, CompanyProfile, Location]
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'company', 'location'
+        ).prefetch_related('required_skills')
+
+    def get_instances_from_related(self, related_instance):
+        if isinstance(related_instance, (Skill, CompanyProfile, Location)):
+            return related_instance.jobs.all()
+
+    def prepare_id(self, instance):
+        return str(instance.id)
+
+    def prepare_skills(self, instance):
+        return [
+            {'id': str(skill.id), 'name': skill.name, 'category': skill.category}
+            for skill in instance.required_skills.all()
+        ]
+
+    def prepare_company(self, instance):
+        if not instance.company:
+            return None
+        return {'id': str(instance.company.id), 'company_name': instance.company.company_name}
+
+    def prepare_location(self, instance):
+        if not instance.location or not instance.location.coordinates:
+            return None
+        point = instance.location.coordinates
+        return {'lat': point.y, 'lon': point.x}
+
+    def prepare_location_id(self, instance):
+        return str(instance.location_id) if instance.location_id else None
+
+    def prepare_city(self, instance):
+        return instance.location.city if instance.location else None
+
+    def prepare_country(self, instance):
+        return instance.location.country if instance.location else None
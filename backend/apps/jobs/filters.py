@@ -0,0 +1,72 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from apps.jobs.models import Job
+
+SEARCH_CONFIG = 'english'
+
+
+def apply_job_filters(queryset, params):
+    """
+    Apply the structured job filters shared by search, saved searches and alerts.
+
+    ``params`` is a plain dict; unknown or empty keys are ignored.
+    """
+    if params.get('skills'):
+        # Subquery instead of a join so jobs matching several skills aren't duplicated
+        job_ids = Job.required_skills.through.objects.filter(
+            skill_id__in=params['skills']
+        ).values('job_id')
+        queryset = queryset.filter(id__in=job_ids)
+    if params.get('employment_type'):
+        queryset = queryset.filter(employment_type__in=params['employment_type'])
+    if params.get('experience_level'):
+        queryset = queryset.filter(experience_level__in=params['experience_level'])
+    if params.get('is_remote') is not None:
+        queryset = queryset.filter(is_remote=params['is_remote'])
+    if params.get('salary_min') is not None:
+        queryset = queryset.filter(salary_max__gte=params['salary_min'])
+    if params.get('location'):
+        queryset = queryset.filter(location_id=params['location'])
+    return queryset
+
+
+def search_jobs(queryset, text):
+    """
+    Filter ``queryset`` to jobs matching ``text`` using the stored ``search_vector``
+    column (GIN indexed) and annotate each row with its ``search_rank``.
+    """
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F('search_vector'), query)
+    )
+
+
+class JobSearchRankFilter(BaseFilterBackend):
+    """
+    Drop-in replacement for ``SearchFilter`` on jobs. Matches against the full
+    text index instead of ``ILIKE`` and orders by relevance unless the client
+    asked for an explicit ordering.
+    """
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+
+        queryset = search_jobs(queryset, text)
+        if api_settings.ORDERING_PARAM in request.query_params:
+            return queryset
+        return queryset.order_by('-search_rank', *queryset.query.order_by)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Full text search over title, requirements and description.',
+            'schema': {'type': 'string'},
+        }]
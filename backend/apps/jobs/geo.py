@@ -0,0 +1,143 @@
+"""
+"Jobs near me" queries.
+
+Distances are computed on ``geography`` so radii are in metres on the
+spheroid. The cast of ``Location.coordinates`` to geography has its own GiST
+index (see ``Location.Meta.indexes``). It serves the ``ST_DWithin`` radius
+filter on the joined locations and, through the ``<->`` operator, walks
+locations nearest first for ``nearest_jobs``, so that query reads the jobs at
+the closest locations instead of sorting every job left after the filters.
+Large result sets are summarized into geohash cells instead of returning every
+job; remote jobs without a location are counted beside the cells.
+"""
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import GeoHash
+from django.db.models import Avg, BooleanField, Count, F, FloatField, Func, Q, Value
+from django.db.models.functions import Cast
+
+from apps.core.models import Location
+
+METRES_PER_KM = 1000
+COORDINATES = 'location__coordinates'
+
+# Nearest locations read in the first KNN pass of ``nearest_jobs``; each pass
+# that finds too few jobs reads four times as many, up to the maximum
+NEAREST_LOCATIONS_FIRST = 64
+NEAREST_LOCATIONS_MAX = 4096
+
+# Geohash precision for a search radius: (minimum radius in km, precision)
+GEOHASH_PRECISION_BY_RADIUS = ((1000, 2), (250, 3), (50, 4), (10, 5), (0, 6))
+
+
+def as_geography(expression):
+    return Cast(expression, output_field=PointField(geography=True, srid=4326))
+
+
+class GeographyPoint(Func):
+    template = 'ST_SetSRID(ST_MakePoint(%(expressions)s), 4326)::geography'
+    output_field = PointField(geography=True, srid=4326)
+
+    def __init__(self, lng, lat):
+        super().__init__(Value(float(lng)), Value(float(lat)))
+
+
+class DWithin(Func):
+    function = 'ST_DWithin'
+    output_field = BooleanField()
+
+
+class KNNDistance(Func):
+    """The ``<->`` operator, which a GiST index can return nearest first."""
+    arg_joiner = ' <-> '
+    template = '(%(expressions)s)'
+    output_field = FloatField()
+
+
+class GeographyDistance(Func):
+    function = 'ST_Distance'
+    output_field = FloatField()
+
+
+class PointX(Func):
+    function = 'ST_X'
+    output_field = FloatField()
+
+
+class PointY(Func):
+    function = 'ST_Y'
+    output_field = FloatField()
+
+
+def geohash_precision(radius_km):
+    for min_radius, precision in GEOHASH_PRECISION_BY_RADIUS:
+        if radius_km >= min_radius:
+            return precision
+    return GEOHASH_PRECISION_BY_RADIUS[-1][1]
+
+
+def jobs_within(queryset, lng, lat, radius_km, include_remote=False):
+    """
+    Jobs located within ``radius_km`` of the point, annotated with ``distance_km``
+    (``NULL`` for remote jobs without a location) and ordered nearest first.
+    """
+    point = GeographyPoint(lng, lat)
+    geography = as_geography(COORDINATES)
+    near = Q(DWithin(geography, point, Value(radius_km * METRES_PER_KM)))
+    if include_remote:
+        near |= Q(is_remote=True)
+
+    return queryset.filter(near).annotate(
+        distance_km=GeographyDistance(geography, point) / METRES_PER_KM
+    ).order_by(F('distance_km').asc(nulls_last=True), 'id')
+
+
+def nearest_jobs(queryset, lng, lat, limit):
+    """
+    The ``limit`` jobs of ``queryset`` nearest the point, as ``(job_id,
+    distance_km)`` pairs nearest first.
+
+    Each pass takes the nearest locations by KNN and keeps the jobs at them.
+    Once a pass finds ``limit`` jobs, or runs out of locations, no job
+    elsewhere can be closer. Filters that leave too few jobs near the point
+    fall back to sorting every located job.
+    """
+    point = GeographyPoint(lng, lat)
+    located = queryset.filter(**{f'{COORDINATES}__isnull': False}).annotate(
+        distance_km=GeographyDistance(as_geography(COORDINATES), point) / METRES_PER_KM
+    ).order_by('distance_km', 'id').values_list('id', 'distance_km')
+
+    locations = Location.objects.filter(coordinates__isnull=False).order_by(
+        KNNDistance(as_geography('coordinates'), point)
+    ).values_list('id', flat=True)
+    batch = NEAREST_LOCATIONS_FIRST
+    while batch <= NEAREST_LOCATIONS_MAX:
+        location_ids = list(locations[:batch])
+        rows = list(located.filter(location_id__in=location_ids)[:limit])
+        if len(rows) >= limit or len(location_ids) < batch:
+            return rows
+        batch *= 4
+    return list(located[:limit])
+
+
+def count_located(queryset):
+    """``(located, unlocated)`` job counts in one query; remote jobs may have no location."""
+    counts = queryset.aggregate(
+        located=Count('id', filter=Q(**{f'{COORDINATES}__isnull': False})),
+        unlocated=Count('id', filter=Q(**{f'{COORDINATES}__isnull': True})),
+    )
+    return counts['located'], counts['unlocated']
+
+
+def cluster_jobs(queryset, precision):
+    """Group located jobs into geohash cells with a job count and mean position."""
+    rows = queryset.filter(**{f'{COORDINATES}__isnull': False}).order_by().annotate(
+        cell=GeoHash(COORDINATES, precision=precision)
+    ).values('cell').annotate(
+        count=Count('id'),
+        lng=Avg(PointX(COORDINATES)),
+        lat=Avg(PointY(COORDINATES)),
+    ).order_by('-count')
+    return [
+        {'geohash': row['cell'], 'count': row['count'], 'lat': row['lat'], 'lng': row['lng']}
+        for row in rows
+    ]
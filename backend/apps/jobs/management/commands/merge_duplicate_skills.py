@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.taxonomy import merge_duplicate_skills
+
+
+class Command(BaseCommand):
+    help = 'Merge skills whose names only differ in case, accents or punctuation into the oldest one.'
+
+    def handle(self, *args, **options):
+        merged = merge_duplicate_skills()
+        self.stdout.write(self.style.SUCCESS(f'Merged {merged} duplicate skill(s).'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='match_scores_changed_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='match_scores_computed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:20
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_application_count(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('applications', 'Application')
+    counts = Application.objects.filter(job=OuterRef('pk')).order_by().values('job').annotate(
+        total=Count('id')
+    ).values('total')
+    Job.objects.update(application_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_application_resume_sha256'),
+        ('jobs', '0006_job_match_scores_changed_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_application_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_backfill_job_application_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employer', '-updated_at', '-id'], name='jobs_employer_updated_idx'),
+        ),
+    ]
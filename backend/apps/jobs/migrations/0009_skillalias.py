@@ -0,0 +1,67 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:31
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+# Common alternative names, added only for canonical skills that already exist
+DEFAULT_ALIASES = {
+    'python': ['python3', 'py'],
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'typescript': ['ts'],
+    'postgresql': ['postgres', 'psql'],
+    'kubernetes': ['k8s'],
+    'go': ['golang'],
+    'node.js': ['node', 'nodejs'],
+    'react': ['react.js', 'reactjs'],
+    'vue.js': ['vue', 'vuejs'],
+    'c#': ['csharp'],
+    'c++': ['cpp'],
+    'amazon web services': ['aws'],
+    'google cloud platform': ['gcp'],
+    'machine learning': ['ml'],
+    'django rest framework': ['drf'],
+}
+
+
+def seed_aliases(apps, schema_editor):
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+
+    skills = {skill.name.strip().casefold(): skill for skill in Skill.objects.all()}
+    aliases = []
+    for name, alternatives in DEFAULT_ALIASES.items():
+        skill = skills.get(name)
+        if skill is None:
+            continue
+        for alias in alternatives:
+            if alias not in skills:
+                aliases.append(SkillAlias(skill=skill, name=alias, normalized_name=alias))
+    SkillAlias.objects.bulk_create(aliases, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_jobs_employer_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(editable=False, max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.skill')),
+            ],
+            options={
+                'verbose_name': 'Skill Alias',
+                'verbose_name_plural': 'Skill Aliases',
+                'db_table': 'skill_aliases',
+            },
+        ),
+        migrations.RunPython(seed_aliases, migrations.RunPython.noop),
+    ]
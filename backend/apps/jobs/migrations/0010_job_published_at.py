@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 17:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_published_at(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.filter(status='PUBLISHED', published_at__isnull=True).update(published_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_skillalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='published_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_published_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['updated_at'], name='saved_searches_updated_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import TimeStampedModel, Location
 from apps.users.models import User, CompanyProfile
@@ -19,6 +21,26 @@ class Skill(TimeStampedModel):
         db_table = 'skills'
 
 
+class SkillAlias(TimeStampedModel):
+    """Another name for a canonical ``Skill`` ('python3', 'Py' -> Python)."""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True, editable=False)
+
+    def __str__(self):
+        return f"{self.name} -> {self.skill.name}"
+
+    def save(self, *args, **kwargs):
+        from apps.jobs.taxonomy import normalize_skill_name
+        self.normalized_name = normalize_skill_name(self.name)
+        super().save(*args, **kwargs)
+
+    class Meta:
+        verbose_name = 'Skill Alias'
+        verbose_name_plural = 'Skill Aliases'
+        db_table = 'skill_aliases'
+
+
 class Job(TimeStampedModel):
     class ExperienceLevel(models.TextChoices):
         ENTRY = 'ENTRY', _('Entry Level')
@@ -62,9 +84,23 @@ class Job(TimeStampedModel):
     status = models.CharField(
         max_length=20, choices=Status.choices, default=Status.DRAFT)
     expires_at = models.DateTimeField(blank=True, null=True)
+    # Set when the job is published; saved search alerts only consider jobs published since their last run
+    published_at = models.DateTimeField(blank=True, null=True, db_index=True)
     view_count = models.PositiveIntegerField(default=0)
     application_count = models.PositiveIntegerField(default=0)
     is_deleted = models.BooleanField(default=False)
+    # Staleness watermark for this job's MatchScore rows
+    match_scores_changed_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    match_scores_computed_at = models.DateTimeField(blank=True, null=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('requirements', weight='B', config='english')
+            + SearchVector('description', weight='C', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     active_objects = JobModelManager()
     objects = models.Manager()
@@ -72,10 +108,21 @@ class Job(TimeStampedModel):
     def __str__(self):
         return self.title
 
+    @property
+    def match_scores_fresh(self):
+        if self.match_scores_changed_at is None:
+            return True
+        return bool(self.match_scores_computed_at) and self.match_scores_computed_at >= self.match_scores_changed_at
+
     class Meta:
         verbose_name = 'Job'
         verbose_name_plural = 'Jobs'
         db_table = 'jobs'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='jobs_search_vector_gin'),
+            # Keyset pagination of an employer's jobs
+            models.Index(fields=['employer', '-updated_at', '-id'], name='jobs_employer_updated_idx'),
+        ]
 
 
 class SavedJob(TimeStampedModel):
@@ -115,3 +162,7 @@ class SavedSearch(TimeStampedModel):
         verbose_name = 'Saved Search'
         verbose_name_plural = 'Saved Searches'
         db_table = 'saved_searches'
+        indexes = [
+            # Incremental sync of the instant alert index
+            models.Index(fields=['updated_at'], name='saved_searches_updated_idx'),
+        ]
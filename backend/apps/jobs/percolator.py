@@ -0,0 +1,212 @@
+"""
+Instant saved search matching.
+
+Active INSTANT saved searches are kept in a process local reverse index: for
+every filter dimension (skills, employment type, experience level, remote,
+location) a posting list maps each value to the searches that ask for it.
+Matching a newly published job walks only the postings for the job's own
+values and counts, per search, how many of its constrained dimensions were
+hit; a search matches when every dimension it constrains was hit. The cost is
+proportional to the postings touched, not to the number of saved searches.
+Salary floors and full text terms are checked on the few candidates left.
+
+The index follows ``SavedSearch.updated_at``: each use pulls the rows changed
+since the last sync and re-indexes only those. Deletes bump a version key
+and force a full rebuild.
+"""
+import threading
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.jobs.alerts import parse_query_params
+from apps.jobs.filters import SEARCH_CONFIG
+from apps.jobs.models import Job, SavedSearch
+from apps.notifications.services import NotificationType, notify
+
+VERSION_KEY = 'saved_searches:instant_index_version'
+DIMENSIONS = ('skills', 'employment_type', 'experience_level', 'is_remote', 'location')
+
+# Rows are re-read this far behind the watermark so a save that committed
+# late (its updated_at predates our last sync) isn't missed
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def job_values(job, skill_ids):
+    """The values ``job`` has in each dimension, in the form the postings are keyed by."""
+    return {
+        'skills': {str(skill_id) for skill_id in skill_ids},
+        'employment_type': {job.employment_type},
+        'experience_level': {job.experience_level},
+        'is_remote': {job.is_remote},
+        'location': {str(job.location_id)} if job.location_id else set(),
+    }
+
+
+class InstantSearchIndex:
+    def __init__(self):
+        self.version = None
+        self.synced_at = None
+        # search id -> (user id, constrained dimension count, salary_min, q, indexed values)
+        self.searches = {}
+        self.postings = {dimension: defaultdict(set) for dimension in DIMENSIONS}
+        # Searches with no dimension filters: every published job is a candidate
+        self.unconstrained = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current_version():
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, timeout=None)
+            version = cache.get(VERSION_KEY, 1)
+        return version
+
+    @staticmethod
+    def _bump_version():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 1, timeout=None)
+
+    @classmethod
+    def invalidate(cls):
+        # Bumping before the writer commits would let a concurrent rebuild
+        # read the old rows and cache them under the new version.
+        transaction.on_commit(cls._bump_version)
+
+    def ensure_fresh(self):
+        version = self.current_version()
+        with self._lock:
+            if version != self.version:
+                self._reset()
+                self.version = version
+            self._sync()
+        return self
+
+    def _reset(self):
+        self.synced_at = None
+        self.searches = {}
+        self.postings = {dimension: defaultdict(set) for dimension in DIMENSIONS}
+        self.unconstrained = set()
+
+    def _sync(self):
+        now = timezone.now()
+        rows = SavedSearch.objects.all()
+        if self.synced_at is None:
+            rows = rows.filter(is_active=True, alert_frequency=SavedSearch.Frequency.INSTANT)
+        else:
+            rows = rows.filter(updated_at__gt=self.synced_at - SYNC_OVERLAP)
+
+        for search_id, user_id, query_params, is_active, frequency in rows.values_list(
+            'id', 'user_id', 'query_params', 'is_active', 'alert_frequency'
+        ).iterator(chunk_size=5000):
+            self._remove(search_id)
+            if is_active and frequency == SavedSearch.Frequency.INSTANT:
+                params = parse_query_params(query_params)
+                if params is not None:
+                    self._add(search_id, user_id, params)
+        self.synced_at = now
+
+    def _add(self, search_id, user_id, params):
+        values = {}
+        for dimension in DIMENSIONS:
+            if dimension not in params:
+                continue
+            value = params[dimension]
+            values[dimension] = set(value) if isinstance(value, list) else {value}
+            for item in values[dimension]:
+                self.postings[dimension][item].add(search_id)
+        if not values:
+            self.unconstrained.add(search_id)
+        self.searches[search_id] = (user_id, len(values), params.get('salary_min'), params.get('q'), values)
+
+    def _remove(self, search_id):
+        entry = self.searches.pop(search_id, None)
+        if entry is None:
+            return
+        self.unconstrained.discard(search_id)
+        for dimension, items in entry[4].items():
+            postings = self.postings[dimension]
+            for item in items:
+                postings[item].discard(search_id)
+                if not postings[item]:
+                    del postings[item]
+
+    def candidates(self, values):
+        """Ids of searches whose dimension filters all accept a job with ``values``."""
+        hits = Counter()
+        for dimension, items in values.items():
+            postings = self.postings[dimension]
+            matched = set()
+            for item in items:
+                matched |= postings.get(item, set())
+            hits.update(matched)
+        return [
+            search_id for search_id, count in hits.items() if count == self.searches[search_id][1]
+        ] + list(self.unconstrained)
+
+    def match(self, job):
+        """``{search_id: user_id}`` for every indexed search ``job`` satisfies."""
+        skill_ids = Job.required_skills.through.objects.filter(job_id=job.id).values_list('skill_id', flat=True)
+        matched = {}
+        terms = set()
+        for search_id in self.candidates(job_values(job, skill_ids)):
+            user_id, _, salary_min, q, _ = self.searches[search_id]
+            if salary_min is not None and (job.salary_max is None or job.salary_max < salary_min):
+                continue
+            matched[search_id] = user_id
+            if q:
+                terms.add(q)
+
+        if terms:
+            found = matching_terms(job.id, terms)
+            matched = {
+                search_id: user_id for search_id, user_id in matched.items()
+                if not self.searches[search_id][3] or self.searches[search_id][3] in found
+            }
+        return matched
+
+
+def matching_terms(job_id, terms):
+    """The subset of ``terms`` whose full text query matches the job, in one query."""
+    terms = list(terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT term FROM unnest(%s::text[]) AS term, jobs '
+            'WHERE jobs.id = %s AND jobs.search_vector @@ websearch_to_tsquery(%s::regconfig, term)',
+            [terms, job_id, SEARCH_CONFIG],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+instant_index = InstantSearchIndex()
+
+
+def get_instant_index():
+    return instant_index.ensure_fresh()
+
+
+def notify_instant_searches(job):
+    """
+    Notify every user with an INSTANT saved search matching ``job``, once per
+    user. Returns the number of notifications created.
+    """
+    matched = get_instant_index().match(job)
+    if not matched:
+        return 0
+
+    recipients = {user_id for user_id in matched.values() if user_id != job.employer_id}
+    with transaction.atomic():
+        created = notify(
+            recipients,
+            NotificationType.JOB_ALERT,
+            'New job matching your saved search',
+            f'{job.title} was just published and matches one of your saved searches.',
+            target=job,
+        )
+        SavedSearch.objects.filter(id__in=list(matched)).update(last_sent_at=timezone.now())
+    return created
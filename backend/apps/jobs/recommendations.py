@@ -0,0 +1,168 @@
+import hashlib
+import heapq
+import threading
+import time
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.jobs.models import Job
+from apps.users.models import Profile
+
+INDEX_VERSION_KEY = 'job_recommendations:index_version'
+SKILL_VERSION_KEY = 'job_recommendations:skill_version:{}'
+
+# An immutable build of the index; readers take one reference and use only that
+IndexSnapshot = namedtuple('IndexSnapshot', ['version', 'built_at', 'postings', 'skill_counts'])
+EMPTY_SNAPSHOT = IndexSnapshot(None, 0.0, {}, {})
+
+
+class SkillJobIndex:
+    """
+    Process local inverted index from skill id to the published jobs requiring it.
+
+    Rebuilt lazily when the shared version number changes, but at most once every
+    ``RECOMMENDATION_INDEX_REBUILD_SECONDS`` so bursts of job edits don't turn
+    every request into a rebuild. A rebuild replaces the whole snapshot in one
+    assignment, so concurrent readers never mix postings and counts from two
+    builds.
+
+    Every change also bumps a version per affected skill; cached
+    recommendations are keyed on the versions of the profile's skills only.
+    """
+
+    def __init__(self):
+        self.snapshot = EMPTY_SNAPSHOT
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current_version():
+        version = cache.get(INDEX_VERSION_KEY)
+        if version is None:
+            cache.add(INDEX_VERSION_KEY, 1, timeout=None)
+            version = cache.get(INDEX_VERSION_KEY, 1)
+        return version
+
+    @staticmethod
+    def _bump(key):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+    @classmethod
+    def invalidate(cls, skill_ids=()):
+        """Mark the index stale and drop cached recommendations that involve ``skill_ids``.
+
+        The bumps wait for the surrounding transaction to commit so a rebuild
+        can't cache pre-commit rows under the new version. ``skill_ids`` is
+        read now because querysets over deleted rows are empty by then.
+        """
+        skill_ids = set(skill_ids)
+
+        def bump():
+            cls._bump(INDEX_VERSION_KEY)
+            for skill_id in skill_ids:
+                cls._bump(SKILL_VERSION_KEY.format(skill_id))
+
+        transaction.on_commit(bump)
+
+    @staticmethod
+    def skill_versions_digest(skill_ids):
+        """Changes whenever a job requiring any of ``skill_ids`` changes."""
+        keys = [SKILL_VERSION_KEY.format(skill_id) for skill_id in sorted(map(str, skill_ids))]
+        versions = cache.get_many(keys)
+        payload = ','.join(f'{key}={versions.get(key, 0)}' for key in keys)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def ensure_fresh(self):
+        """Return ``(snapshot, is_current)``; the snapshot may lag while rebuilds are rate limited."""
+        version = self.current_version()
+        snapshot = self.snapshot
+        if version == snapshot.version:
+            return snapshot, True
+        if snapshot.version is not None and time.monotonic() - snapshot.built_at < settings.RECOMMENDATION_INDEX_REBUILD_SECONDS:
+            return snapshot, False
+
+        with self._lock:
+            if version != self.snapshot.version:
+                self.rebuild(version)
+        return self.snapshot, True
+
+    def rebuild(self, version):
+        postings = {}
+        skill_counts = Counter()
+        published = Job.active_objects.filter(status=Job.Status.PUBLISHED).values('id')
+        rows = Job.required_skills.through.objects.filter(job_id__in=published).values_list('skill_id', 'job_id')
+        for skill_id, job_id in rows.iterator(chunk_size=10000):
+            postings.setdefault(skill_id, []).append(job_id)
+            skill_counts[job_id] += 1
+
+        self.snapshot = IndexSnapshot(version, time.monotonic(), postings, skill_counts)
+
+    @staticmethod
+    def shortlist(snapshot, skill_ids, size):
+        """
+        Return up to ``size`` ``(coverage, shared, job_id)`` tuples for the jobs sharing
+        the most skills with ``skill_ids``, where coverage is the share of the job's
+        required skills the candidate has.
+        """
+        shared = Counter()
+        for skill_id in skill_ids:
+            shared.update(snapshot.postings.get(skill_id, ()))
+
+        return heapq.nlargest(
+            size,
+            ((count / snapshot.skill_counts[job_id], count, job_id) for job_id, count in shared.items())
+        )
+
+
+skill_job_index = SkillJobIndex()
+
+
+def recommend_jobs(profile, limit):
+    """
+    Return ``[(job_id, score), ...]`` for the ``limit`` best published jobs for ``profile``.
+
+    Jobs sharing skills with the profile are pulled from the inverted index and
+    pruned with a bounded heap; only that shortlist goes through the full match
+    scoring engine. Results are cached per user and keyed on the profile's match
+    score watermark and the versions of its skills, so they are dropped when its
+    skills change or a job requiring one of them does. Profiles without skills
+    get the newest openings, which any job change can affect.
+    """
+    from apps.applications.scoring import Candidate, JobMatrix, MatchScoringEngine
+
+    snapshot, is_current = skill_job_index.ensure_fresh()
+    skill_ids = list(profile.skills.values_list('id', flat=True))
+    changed_at = profile.match_scores_changed_at.timestamp() if profile.match_scores_changed_at else 0
+    scope = SkillJobIndex.skill_versions_digest(skill_ids) if skill_ids else f'all{SkillJobIndex.current_version()}'
+    cache_key = f'job_recommendations:{profile.user_id}:{changed_at}:{scope}:{limit}'
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    shortlist = SkillJobIndex.shortlist(snapshot, skill_ids, limit * settings.RECOMMENDATION_SHORTLIST_FACTOR)
+
+    if not shortlist:
+        # No skill overlap at all: fall back to the newest openings
+        job_ids = Job.active_objects.filter(status=Job.Status.PUBLISHED).order_by(
+            '-created_at'
+        ).values_list('id', flat=True)[:limit]
+        recommendations = [(job_id, 0.0) for job_id in job_ids]
+    else:
+        matrix = JobMatrix.load(Job.active_objects.filter(id__in=[job_id for _, _, job_id in shortlist]))
+        candidate = next(Candidate.iter_batches(matrix.vocabulary, Profile.objects.filter(id=profile.id)))[0]
+        overall = MatchScoringEngine(matrix).score(candidate)['overall_score']
+        recommendations = heapq.nlargest(
+            limit,
+            zip(matrix.job_ids, (round(float(score), 2) for score in overall)),
+            key=lambda item: item[1]
+        )
+
+    # Computed from an index that is behind: keep it only until the next rebuild is allowed
+    timeout = settings.RECOMMENDATION_CACHE_TIMEOUT if is_current else settings.RECOMMENDATION_INDEX_REBUILD_SECONDS
+    cache.set(cache_key, recommendations, timeout=timeout)
+    return recommendations
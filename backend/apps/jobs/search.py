@@ -0,0 +1,190 @@
+import logging
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import Count, F
+from elasticsearch import ApiError, TransportError
+
+from apps.core.prefetch import plan_queryset
+from apps.jobs.filters import SEARCH_CONFIG, apply_job_filters
+from apps.jobs.models import Job
+from apps.jobs.serializers import JobSerializer
+
+logger = logging.getLogger(__name__)
+
+HIGHLIGHT_PRE_TAG = '<mark>'
+HIGHLIGHT_POST_TAG = '</mark>'
+HIGHLIGHT_FIELDS = ('title', 'description', 'requirements')
+FACET_SIZE = 20
+
+
+class JobSearchService:
+    """
+    Full text job search with facets and highlighting.
+
+    Queries the Elasticsearch ``jobs`` index and falls back to Postgres full
+    text search when Elasticsearch is disabled or unreachable.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.query = params.get('q', '').strip()
+        self.page = params.get('page', 1)
+        self.page_size = params.get('page_size', 10)
+
+    @property
+    def offset(self):
+        return (self.page - 1) * self.page_size
+
+    def search(self):
+        if settings.ELASTICSEARCH_ENABLED:
+            try:
+                return self.search_elasticsearch()
+            except (ApiError, TransportError) as exc:
+                logger.warning(f"Elasticsearch job search failed, falling back to Postgres: {exc}")
+        return self.search_postgres()
+
+    def _serialize(self, job_ids, highlights):
+        jobs = plan_queryset(Job.active_objects.filter(id__in=job_ids), JobSerializer)
+        jobs_by_id = {str(job.id): job for job in jobs}
+
+        results = []
+        for job_id in job_ids:
+            job = jobs_by_id.get(str(job_id))
+            if job is None:
+                # Index is ahead of the database (e.g. job deleted since indexing)
+                continue
+            data = JobSerializer(job).data
+            data['highlight'] = highlights.get(str(job_id), {})
+            results.append(data)
+        return results
+
+    def _response(self, backend, count, results, facets):
+        return {
+            'backend': backend,
+            'count': count,
+            'page': self.page,
+            'page_size': self.page_size,
+            'facets': facets,
+            'results': results,
+        }
+
+    def search_elasticsearch(self):
+        from apps.jobs.documents import JobDocument
+
+        search = JobDocument.search().filter(
+            'term', status=Job.Status.PUBLISHED
+        ).filter('term', is_deleted=False)
+
+        if self.query:
+            search = search.query(
+                'multi_match',
+                query=self.query,
+                fields=['title^3', 'requirements^2', 'description', 'company.company_name'],
+                fuzziness='AUTO',
+            )
+
+        params = self.params
+        if params.get('skills'):
+            search = search.filter(
+                'nested', path='skills',
+                query={'terms': {'skills.id': [str(skill) for skill in params['skills']]}}
+            )
+        if params.get('employment_type'):
+            search = search.filter('terms', employment_type=params['employment_type'])
+        if params.get('experience_level'):
+            search = search.filter('terms', experience_level=params['experience_level'])
+        if params.get('is_remote') is not None:
+            search = search.filter('term', is_remote=params['is_remote'])
+        if params.get('salary_min') is not None:
+            search = search.filter('range', salary_max={'gte': params['salary_min']})
+        if params.get('location'):
+            search = search.filter('term', location_id=str(params['location']))
+
+        search.aggs.bucket('employment_type', 'terms', field='employment_type')
+        search.aggs.bucket('experience_level', 'terms', field='experience_level')
+        search.aggs.bucket('is_remote', 'terms', field='is_remote')
+        search.aggs.bucket('skills', 'nested', path='skills').bucket(
+            'names', 'terms', field='skills.name.raw', size=FACET_SIZE
+        )
+
+        search = search.highlight(*HIGHLIGHT_FIELDS, fragment_size=150, number_of_fragments=2)
+        search = search.highlight_options(pre_tags=[HIGHLIGHT_PRE_TAG], post_tags=[HIGHLIGHT_POST_TAG])
+        search = search.source(False)[self.offset:self.offset + self.page_size]
+
+        response = search.execute()
+
+        job_ids = [hit.meta.id for hit in response]
+        highlights = {
+            hit.meta.id: hit.meta.highlight.to_dict()
+            for hit in response if getattr(hit.meta, 'highlight', None)
+        }
+
+        aggs = response.aggregations
+        facets = {
+            'employment_type': [{'value': b.key, 'count': b.doc_count} for b in aggs.employment_type.buckets],
+            'experience_level': [{'value': b.key, 'count': b.doc_count} for b in aggs.experience_level.buckets],
+            'is_remote': [{'value': bool(b.key), 'count': b.doc_count} for b in aggs.is_remote.buckets],
+            'skills': [{'value': b.key, 'count': b.doc_count} for b in aggs.skills.names.buckets],
+        }
+
+        return self._response(
+            'elasticsearch', response.hits.total.value, self._serialize(job_ids, highlights), facets
+        )
+
+    def search_postgres(self):
+        queryset = Job.active_objects.filter(status=Job.Status.PUBLISHED)
+        queryset = apply_job_filters(queryset, self.params)
+
+        search_query = None
+        if self.query:
+            search_query = SearchQuery(self.query, config=SEARCH_CONFIG, search_type='websearch')
+            queryset = queryset.filter(search_vector=search_query)
+            ranked = queryset.annotate(
+                search_rank=SearchRank(F('search_vector'), search_query)
+            ).order_by('-search_rank', '-created_at')
+        else:
+            ranked = queryset.order_by('-created_at')
+
+        count = queryset.count()
+        job_ids = list(
+            ranked.values_list('id', flat=True)[self.offset:self.offset + self.page_size]
+        )
+
+        highlights = {}
+        if search_query is not None and job_ids:
+            headline_options = {
+                'config': SEARCH_CONFIG,
+                'start_sel': HIGHLIGHT_PRE_TAG,
+                'stop_sel': HIGHLIGHT_POST_TAG,
+                'max_fragments': 2,
+            }
+            rows = Job.objects.filter(id__in=job_ids).annotate(**{
+                f'{field}_headline': SearchHeadline(field, search_query, **headline_options)
+                for field in HIGHLIGHT_FIELDS
+            }).values('id', *[f'{field}_headline' for field in HIGHLIGHT_FIELDS])
+            for row in rows:
+                highlights[str(row['id'])] = {
+                    field: [row[f'{field}_headline']]
+                    for field in HIGHLIGHT_FIELDS
+                    if HIGHLIGHT_PRE_TAG in (row[f'{field}_headline'] or '')
+                }
+
+        facets = {
+            'employment_type': self._postgres_facet(queryset, 'employment_type'),
+            'experience_level': self._postgres_facet(queryset, 'experience_level'),
+            'is_remote': self._postgres_facet(queryset, 'is_remote'),
+            'skills': self._postgres_facet(queryset, 'required_skills__name', size=FACET_SIZE),
+        }
+
+        return self._response('postgres', count, self._serialize(job_ids, highlights), facets)
+
+    @staticmethod
+    def _postgres_facet(queryset, field, size=None):
+        rows = queryset.order_by().filter(**{f'{field}__isnull': False}).values(field).annotate(
+            count=Count('id', distinct=True)
+        ).order_by('-count', field)
+        if size is not None:
+            # LIMIT in the query, so Postgres keeps a top-N instead of returning every group
+            rows = rows[:size]
+        return [{'value': row[field], 'count': row['count']} for row in rows]
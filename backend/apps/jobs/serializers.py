@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from apps.core.serializers import LocationSerializer
 from apps.core.models import Location
@@ -32,7 +34,7 @@ class JobSerializer(serializers.ModelSerializer):
         queryset=Location.objects.all(), source='location', write_only=True, required=False
     )
     skill_ids = serializers.ListField(
-        child=serializers.IntegerField(), write_only=True, required=False
+        child=serializers.UUIDField(), write_only=True, required=False
     )
 
     class Meta:
@@ -43,23 +45,83 @@ class JobSerializer(serializers.ModelSerializer):
             'experience_level', 'employment_type', 'required_skills',
             'status', 'created_at', 'published_by', 'skill_ids', 'application_count', 'view_count'
         ]
+        read_only_fields = ['application_count', 'view_count']
 
     def create(self, validated_data):
         skill_ids = validated_data.pop('skill_ids', [])
-        job = Job.objects.create(**validated_data)
-        if skill_ids:
-            job.required_skills.set(skill_ids)
+        if validated_data.get('status') == Job.Status.PUBLISHED:
+            validated_data['published_at'] = timezone.now()
+        # One transaction, so on-commit work queued by the post_save signals
+        # (instant search alerts) sees the job with its skills
+        with transaction.atomic():
+            job = Job.objects.create(**validated_data)
+            if skill_ids:
+                job.required_skills.set(skill_ids)
         return job
 
     def update(self, instance, validated_data):
         skill_ids = validated_data.pop('skill_ids', None)
-        if skill_ids is not None:
-            instance.required_skills.set(skill_ids)
+        if validated_data.get('status') == Job.Status.PUBLISHED and instance.status != Job.Status.PUBLISHED:
+            validated_data['published_at'] = timezone.now()
 
-        return super().update(instance, validated_data)
+        with transaction.atomic():
+            if skill_ids is not None:
+                instance.required_skills.set(skill_ids)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            # Only write what changed: the counters are updated concurrently with F() expressions
+            instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
 
 
 class SavedJobSerializer(serializers.ModelSerializer):
     class Meta:
         model = SavedJob
-        fields = ['id', 'job', 'user']
\ No newline at end of file
+        fields = ['id', 'job', 'user']
+
+
+class SavedJobListSerializer(serializers.ModelSerializer):
+    job = JobSerializer(read_only=True)
+
+    class Meta:
+        model = SavedJob
+        fields = ['id', 'job', 'created_at']
+
+
+class JobSearchRequestSerializer(serializers.Serializer):
+    q = serializers.CharField(required=False, allow_blank=True, default='')
+    skills = serializers.ListField(child=serializers.UUIDField(), required=False)
+    employment_type = serializers.ListField(
+        child=serializers.ChoiceField(choices=Job.EmploymentType.choices), required=False
+    )
+    experience_level = serializers.ListField(
+        child=serializers.ChoiceField(choices=Job.ExperienceLevel.choices), required=False
+    )
+    is_remote = serializers.BooleanField(required=False, allow_null=True, default=None)
+    salary_min = serializers.IntegerField(required=False, min_value=0)
+    location = serializers.UUIDField(required=False)
+    page = serializers.IntegerField(required=False, min_value=1, default=1)
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=100, default=10)
+
+
+class JobNearbyRequestSerializer(serializers.Serializer):
+    lat = serializers.FloatField(required=False, min_value=-90, max_value=90)
+    lng = serializers.FloatField(required=False, min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(required=False, min_value=0.1, max_value=1000)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100, default=20)
+    include_remote = serializers.BooleanField(required=False, default=False)
+    cluster = serializers.BooleanField(required=False, default=False)
+    precision = serializers.IntegerField(required=False, min_value=1, max_value=8)
+    skills = serializers.ListField(child=serializers.UUIDField(), required=False)
+    employment_type = serializers.ListField(
+        child=serializers.ChoiceField(choices=Job.EmploymentType.choices), required=False
+    )
+    experience_level = serializers.ListField(
+        child=serializers.ChoiceField(choices=Job.ExperienceLevel.choices), required=False
+    )
+    salary_min = serializers.IntegerField(required=False, min_value=0)
+
+    def validate(self, attrs):
+        if ('lat' in attrs) != ('lng' in attrs):
+            raise serializers.ValidationError('lat and lng must be given together.')
+        return attrs
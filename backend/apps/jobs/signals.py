@@ -0,0 +1,65 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.jobs.models import Job, SavedSearch, Skill, SkillAlias
+from apps.jobs.percolator import InstantSearchIndex
+from apps.jobs.recommendations import SkillJobIndex
+from apps.jobs.taxonomy import SkillMatcher
+
+INDEXED_JOB_FIELDS = {'status', 'is_deleted'}
+
+
+@receiver(post_save, sender=Job)
+def invalidate_recommendation_index_on_job_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        # Skills are added afterwards and invalidate their own versions
+        SkillJobIndex.invalidate()
+    elif update_fields is None or not INDEXED_JOB_FIELDS.isdisjoint(update_fields):
+        SkillJobIndex.invalidate(instance.required_skills.values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Job.required_skills.through)
+def invalidate_recommendation_index_on_skills_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # instance is the Skill
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            SkillJobIndex.invalidate([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        SkillJobIndex.invalidate(pk_set or ())
+    elif action == 'pre_clear':
+        # The skills being removed are only known before the clear
+        SkillJobIndex.invalidate(instance.required_skills.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Job)
+def invalidate_recommendation_index_on_job_delete(sender, instance, **kwargs):
+    SkillJobIndex.invalidate(instance.required_skills.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Skill)
+def invalidate_recommendation_index_on_skill_delete(sender, instance, **kwargs):
+    SkillJobIndex.invalidate([instance.pk])
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def invalidate_skill_matcher(sender, **kwargs):
+    SkillMatcher.invalidate()
+
+
+@receiver(post_save, sender=Job)
+def match_instant_searches_on_publish(sender, instance, created, update_fields=None, **kwargs):
+    # Publishing always writes published_at, so this fires once per publish
+    if instance.status != Job.Status.PUBLISHED:
+        return
+    if created or (update_fields is not None and 'published_at' in update_fields):
+        from apps.jobs.tasks import notify_instant_searches
+        notify_instant_searches.delay_on_commit(str(instance.pk))
+
+
+@receiver(post_delete, sender=SavedSearch)
+def invalidate_instant_search_index(sender, **kwargs):
+    # Saves are picked up from updated_at; a deleted row leaves nothing to sync from
+    InstantSearchIndex.invalidate()
@@ -0,0 +1,90 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from apps.core.email_templates import render_emails
+from apps.core.services import EmailService
+from apps.jobs import alerts, percolator
+from apps.jobs.models import Job
+from apps.notifications.services import NotificationType, notify
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def run_job_alerts(frequency):
+    return alerts.run_alerts(frequency)
+
+
+@shared_task(ignore_result=True)
+def notify_instant_searches(job_id):
+    job = Job.active_objects.filter(id=job_id, status=Job.Status.PUBLISHED).first()
+    if job is None:
+        return
+    created = percolator.notify_instant_searches(job)
+    logger.info(f"Created {created} instant alert notifications for job {job_id}")
+
+
+@shared_task(ignore_result=True)
+def notify_job_closed(job_id):
+    job = Job.objects.filter(id=job_id).first()
+    if job is None:
+        return
+    candidate_ids = job.applications.values_list('candidate_id', flat=True)
+    notify(
+        candidate_ids,
+        NotificationType.JOB_CLOSED,
+        'Job closed',
+        f'{job.title} is no longer accepting applications.',
+        target=job,
+    )
+
+
+@shared_task(ignore_result=True)
+def send_job_alert_digests(digests):
+    """
+    Send one digest email per user. ``digests`` is a batch of
+    ``{'user_id', 'searches': [{'search_id', 'query', 'job_ids', 'total'}]}``
+    built by ``alerts.run_alerts``; users and jobs for the whole batch are
+    loaded in two queries. Ids arrive as strings, so both are keyed by ``str(pk)``.
+    """
+    user_ids = [digest['user_id'] for digest in digests]
+    users = {str(user.pk): user for user in User.objects.filter(is_active=True, id__in=user_ids)}
+    job_ids = {job_id for digest in digests for search in digest['searches'] for job_id in search['job_ids']}
+    jobs = {str(job.pk): job for job in Job.objects.select_related('company', 'location').filter(id__in=job_ids)}
+
+    # Each job's block is identical in every digest it appears in, so it is rendered once per batch
+    job_list = list(jobs.values())
+    job_blocks = dict(zip(
+        list(jobs),
+        render_emails(
+            'partials/job_alert_job.html',
+            [{'job': job, 'url': f'{settings.FRONTEND_URL}/jobs/{job.id}'} for job in job_list],
+        ),
+    ))
+
+    messages = []
+    for digest in digests:
+        user = users.get(digest['user_id'])
+        if user is None:
+            continue
+        sections = []
+        for search in digest['searches']:
+            blocks = [job_blocks[job_id] for job_id in search['job_ids'] if job_id in job_blocks]
+            if blocks:
+                sections.append({
+                    'label': alerts.describe_query(search['query']),
+                    'jobs': blocks,
+                    'more': max(search['total'] - len(blocks), 0),
+                })
+        if not sections:
+            continue
+        total = sum(search['total'] for search in digest['searches'])
+        subject = f'{total} new job{"" if total == 1 else "s"} matching your saved searches'
+        messages.append((subject, {'user': user, 'sections': sections}, user.email))
+
+    queued = EmailService.send_template_emails(messages, 'job_alert_digest.html')
+    logger.info(f"Queued {queued} job alert digests")
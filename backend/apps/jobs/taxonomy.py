@@ -0,0 +1,205 @@
+"""
+Skill taxonomy: canonical skills, their aliases and a multi-pattern matcher.
+
+Every canonical ``Skill.name`` and ``SkillAlias.name`` is normalized and
+compiled into one Aho-Corasick automaton, so all known skills can be found in
+a resume or job description in a single linear pass over the text. The
+compiled matcher lives in process and is rebuilt when the shared version key
+is bumped by a Skill or SkillAlias change.
+"""
+import re
+import threading
+import unicodedata
+from collections import deque
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.jobs.models import Job, Skill, SkillAlias
+from apps.users.models import Profile
+
+VERSION_KEY = 'skills:taxonomy_version'
+
+# Characters that are part of skill names (C++, C#, .NET, Node.js) rather than separators
+_SEPARATOR_RE = re.compile(r'[^\w+#.]+')
+
+
+def normalize_skill_name(name):
+    """Casefold, strip accents and collapse separators: '  Node.JS ' -> 'node.js'."""
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return _SEPARATOR_RE.sub(' ', name.casefold()).strip().rstrip('.')
+
+
+def _is_boundary(text, index):
+    if index < 0 or index >= len(text):
+        return True
+    char = text[index]
+    if char == '.':
+        # A full stop ends a word, the dot in 'node.js' doesn't
+        return not (index + 1 < len(text) and text[index + 1].isalnum())
+    return not (char.isalnum() or char in '+#')
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher; ``patterns`` maps each pattern to a value."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append((len(pattern), value))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield ``(start, end, value)`` for every occurrence of every pattern in ``text``."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, value in self.output[state]:
+                yield index - length + 1, index + 1, value
+
+
+class SkillMatcher:
+    def __init__(self):
+        self.version = None
+        self.lookup = {}
+        self.automaton = AhoCorasick({})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current_version():
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, timeout=None)
+            version = cache.get(VERSION_KEY, 1)
+        return version
+
+    @staticmethod
+    def _bump_version():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 1, timeout=None)
+
+    @classmethod
+    def invalidate(cls):
+        # Bumping before the writer commits would let a concurrent rebuild
+        # read the old rows and cache them under the new version.
+        transaction.on_commit(cls._bump_version)
+
+    def ensure_fresh(self):
+        version = self.current_version()
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    self.rebuild(version)
+        return self
+
+    def rebuild(self, version):
+        lookup = {}
+        for alias, skill_id in SkillAlias.objects.values_list('normalized_name', 'skill_id'):
+            lookup[alias] = skill_id
+        # Canonical names win over an alias that happens to normalize the same way
+        for name, skill_id in Skill.objects.values_list('name', 'id'):
+            lookup[normalize_skill_name(name)] = skill_id
+        lookup.pop('', None)
+
+        self.lookup = lookup
+        self.automaton = AhoCorasick(lookup)
+        self.version = version
+
+    def resolve(self, name):
+        """The id of the canonical skill ``name`` refers to, or ``None``."""
+        return self.lookup.get(normalize_skill_name(name))
+
+    def match(self, text):
+        """Ids of every skill mentioned in ``text``, in order of first mention."""
+        text = normalize_skill_name(text)
+        found = {}
+        for start, end, skill_id in self.automaton.iter_matches(text):
+            if _is_boundary(text, start - 1) and _is_boundary(text, end):
+                found.setdefault(skill_id, start)
+        return list(found)
+
+
+_matcher = SkillMatcher()
+
+
+def get_skill_matcher():
+    return _matcher.ensure_fresh()
+
+
+def extract_skills(text):
+    """``Skill`` rows mentioned in ``text``, in order of first mention."""
+    skill_ids = get_skill_matcher().match(text)
+    skills = Skill.objects.in_bulk(skill_ids)
+    return [skills[skill_id] for skill_id in skill_ids if skill_id in skills]
+
+
+@transaction.atomic
+def merge_skills(canonical, duplicates):
+    """
+    Fold ``duplicates`` into ``canonical``: jobs and profiles are re-pointed,
+    the duplicate names (and their aliases) become aliases of ``canonical``
+    and the duplicate rows are deleted.
+    """
+    duplicates = [skill for skill in duplicates if skill.pk != canonical.pk]
+    if not duplicates:
+        return 0
+    duplicate_ids = [skill.pk for skill in duplicates]
+
+    for through, owner in ((Job.required_skills.through, 'job_id'), (Profile.skills.through, 'profile_id')):
+        owner_ids = through.objects.filter(skill_id__in=duplicate_ids).values_list(owner, flat=True).distinct()
+        through.objects.bulk_create(
+            [through(**{owner: owner_id, 'skill_id': canonical.pk}) for owner_id in owner_ids],
+            ignore_conflicts=True,
+        )
+
+    SkillAlias.objects.filter(skill_id__in=duplicate_ids).update(skill=canonical)
+    canonical_name = normalize_skill_name(canonical.name)
+    for skill in duplicates:
+        normalized = normalize_skill_name(skill.name)
+        if normalized != canonical_name and not SkillAlias.objects.filter(normalized_name=normalized).exists():
+            SkillAlias.objects.create(skill=canonical, name=skill.name)
+
+    # The cascades remove the old through rows; signals mark affected scores stale
+    Skill.objects.filter(pk__in=duplicate_ids).delete()
+    return len(duplicates)
+
+
+def merge_duplicate_skills():
+    """Merge skills whose names normalize identically, keeping the oldest. Returns rows merged."""
+    groups = {}
+    for skill in Skill.objects.order_by('created_at'):
+        groups.setdefault(normalize_skill_name(skill.name), []).append(skill)
+
+    merged = 0
+    for skills in groups.values():
+        if len(skills) > 1:
+            merged += merge_skills(skills[0], skills[1:])
+    return merged
@@ -0,0 +1,95 @@
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.core.models import OutboundEmail
+from apps.core.tests.factories import make_employer, make_job, make_user
+from apps.jobs import alerts
+from apps.jobs.models import Job, SavedSearch
+from apps.jobs.tasks import send_job_alert_digests
+
+
+class QueryTests(SimpleTestCase):
+    def test_parse_query_params_is_canonical(self):
+        skills = sorted(str(uuid.uuid4()) for _ in range(2))
+        params = alerts.parse_query_params({
+            'q': '  Senior   PYTHON ', 'skills': f'{skills[1]},{skills[0]}', 'is_remote': True, 'page': 3,
+        })
+        self.assertEqual(params, {'q': 'senior python', 'skills': skills, 'is_remote': True})
+        self.assertIsNone(alerts.parse_query_params({'employment_type': ['NOPE']}))
+
+    def test_describe_query(self):
+        self.assertEqual(
+            alerts.describe_query({'q': 'django', 'employment_type': ['FULL_TIME'], 'is_remote': True}),
+            '"django" · Full Time · Remote',
+        )
+        self.assertEqual(alerts.describe_query({}), 'All jobs')
+
+
+class JobAlertDigestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = employer, company = make_employer()
+        published_at = timezone.now() - timedelta(hours=1)
+        cls.python_job = make_job(employer, company, title='Python developer', published_at=published_at)
+        cls.go_job = make_job(employer, company, title='Go developer', is_remote=True, published_at=published_at)
+        cls.old_job = make_job(
+            employer, company, title='Python lead', published_at=timezone.now() - timedelta(days=3)
+        )
+
+        cls.seeker = make_user()
+        SavedSearch.objects.create(user=cls.seeker, query_params={'q': 'python'})
+        SavedSearch.objects.create(user=cls.seeker, query_params={'is_remote': True})
+        SavedSearch.objects.create(user=make_user(), query_params={'q': 'rust'})
+        SavedSearch.objects.create(user=make_user(is_active=False), query_params={'q': 'python'})
+
+    def setUp(self):
+        cache.clear()
+
+    def run_alerts(self, now=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return alerts.run_alerts(SavedSearch.Frequency.DAILY, now=now)
+
+    def test_run_alerts_emails_one_digest_per_user(self):
+        self.assertEqual(self.run_alerts(), (4, 2))
+
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to_email, self.seeker.email)
+        self.assertEqual(email.subject, '2 new jobs matching your saved searches')
+        self.assertIn('Python developer', email.html_body)
+        self.assertIn('Go developer', email.html_body)
+        # Published before the window
+        self.assertNotIn('Python lead', email.html_body)
+
+    def test_watermark_prevents_repeats(self):
+        self.run_alerts()
+        self.assertEqual(self.run_alerts(), (0, 0))
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    def test_job_published_during_a_run_is_sent_once(self):
+        now = timezone.now()
+        make_job(self.employer, self.company, title='Python architect', published_at=now + timedelta(seconds=30))
+        self.run_alerts(now=now)
+        self.run_alerts(now=now + timedelta(days=1))
+
+        bodies = [email.html_body for email in OutboundEmail.objects.order_by('created_at')]
+        self.assertEqual(len(bodies), 2)
+        self.assertNotIn('Python architect', bodies[0])
+        self.assertIn('Python architect', bodies[1])
+
+    def test_digest_skips_missing_jobs_and_users(self):
+        Job.objects.filter(pk=self.go_job.pk).delete()
+        send_job_alert_digests([
+            {'user_id': str(self.seeker.id), 'searches': [
+                {'search_id': 's', 'query': {}, 'job_ids': [str(self.go_job.id), str(self.python_job.id)], 'total': 5},
+            ]},
+            {'user_id': str(self.go_job.id), 'searches': [
+                {'search_id': 't', 'query': {}, 'job_ids': [str(self.python_job.id)], 'total': 1},
+            ]},
+        ])
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.subject, '5 new jobs matching your saved searches')
+        self.assertIn('Python developer', email.html_body)
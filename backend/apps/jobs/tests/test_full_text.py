@@ -0,0 +1,60 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.tests.factories import make_employer, make_job
+from apps.jobs.filters import search_jobs
+from apps.jobs.models import Job
+from apps.jobs.search import JobSearchService
+
+
+class FullTextSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        # Same term in the title (weight A), requirements (B) and description (C)
+        cls.in_title = make_job(cls.employer, cls.company, title='Kubernetes engineer')
+        cls.in_requirements = make_job(
+            cls.employer, cls.company, title='Platform engineer', requirements='Kubernetes in production.'
+        )
+        cls.in_description = make_job(
+            cls.employer, cls.company, title='Site engineer', description='You will look after our kubernetes.'
+        )
+        cls.unrelated = make_job(cls.employer, cls.company, title='Designer')
+
+    def test_rank_follows_field_weights(self):
+        ranked = search_jobs(Job.objects.all(), 'kubernetes').order_by('-search_rank')
+        self.assertEqual(
+            list(ranked.values_list('id', flat=True)),
+            [self.in_title.id, self.in_requirements.id, self.in_description.id],
+        )
+
+    def test_stemming_and_websearch_syntax(self):
+        self.assertEqual(search_jobs(Job.objects.all(), 'engineers -site').count(), 2)
+        self.assertEqual(search_jobs(Job.objects.all(), '"platform engineer"').get(), self.in_requirements)
+
+    def test_search_vector_follows_updates(self):
+        self.unrelated.title = 'Kubernetes designer'
+        self.unrelated.save(update_fields=['title'])
+        self.assertIn(self.unrelated, search_jobs(Job.objects.all(), 'kubernetes'))
+
+    def test_postgres_search_highlights_matches(self):
+        result = JobSearchService({'q': 'kubernetes'}).search_postgres()
+        self.assertEqual(result['count'], 3)
+        highlights = {job['id']: job['highlight'] for job in result['results']}
+        self.assertIn('<mark>Kubernetes</mark>', highlights[str(self.in_title.id)]['title'][0])
+        self.assertNotIn('title', highlights[str(self.in_description.id)])
+
+    def test_public_list_orders_by_rank_unless_ordering_given(self):
+        client = APIClient()
+        response = client.get(reverse('job-public-list'), {'search': 'kubernetes'})
+        self.assertEqual(
+            [job['id'] for job in response.data['results']],
+            [str(self.in_title.id), str(self.in_requirements.id), str(self.in_description.id)],
+        )
+
+        response = client.get(reverse('job-public-list'), {'search': 'kubernetes', 'ordering': 'title'})
+        self.assertEqual(
+            [job['title'] for job in response.data['results']],
+            ['Kubernetes engineer', 'Platform engineer', 'Site engineer'],
+        )
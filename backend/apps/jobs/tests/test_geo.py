@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.tests.factories import make_employer, make_job, make_location
+from apps.jobs import geo
+from apps.jobs.models import Job
+
+BERLIN = {'lng': 13.405, 'lat': 52.52}
+
+
+class GeohashPrecisionTests(SimpleTestCase):
+    def test_larger_radius_gives_coarser_cells(self):
+        self.assertEqual([geo.geohash_precision(radius) for radius in (2000, 300, 60, 20, 1)], [2, 3, 4, 5, 6])
+
+
+class NearbyJobsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer, company = make_employer()
+        cls.berlin = make_job(employer, company, location=make_location())
+        cls.potsdam = make_job(employer, company, location=make_location('Potsdam', 13.0645, 52.3906))
+        cls.hamburg = make_job(employer, company, location=make_location('Hamburg', 9.9937, 53.5511))
+        cls.remote = make_job(employer, company, is_remote=True)
+        make_job(employer, company, location=make_location(), status=Job.Status.DRAFT)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def get(self, **params):
+        response = self.client.get(reverse('job-nearby'), {**BERLIN, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def nearest(self, limit=10):
+        return geo.nearest_jobs(Job.objects.filter(status=Job.Status.PUBLISHED), limit=limit, **BERLIN)
+
+    def test_nearest_jobs_are_ordered_by_distance(self):
+        rows = self.nearest()
+        self.assertEqual([job_id for job_id, _ in rows], [self.berlin.id, self.potsdam.id, self.hamburg.id])
+        self.assertAlmostEqual(rows[1][1], 27, delta=2)
+        self.assertAlmostEqual(rows[2][1], 255, delta=5)
+
+    def test_nearest_jobs_widen_past_locations_without_matches(self):
+        # No location holds two published jobs, so a one-location pass comes up short
+        with mock.patch.object(geo, 'NEAREST_LOCATIONS_FIRST', 1), self.assertNumQueries(4):
+            rows = self.nearest(limit=2)
+        self.assertEqual([job_id for job_id, _ in rows], [self.berlin.id, self.potsdam.id])
+
+    def test_nearest_jobs_fall_back_to_sorting_every_job(self):
+        with mock.patch.object(geo, 'NEAREST_LOCATIONS_MAX', 0):
+            rows = self.nearest(limit=2)
+        self.assertEqual([job_id for job_id, _ in rows], [self.berlin.id, self.potsdam.id])
+
+    def test_limit_nearest(self):
+        data = self.get(limit=2)
+        self.assertEqual([job['id'] for job in data['results']], [str(self.berlin.id), str(self.potsdam.id)])
+        self.assertEqual(data['results'][0]['distance_km'], 0.0)
+
+    def test_radius(self):
+        data = self.get(radius_km=50)
+        self.assertEqual([job['id'] for job in data['results']], [str(self.berlin.id), str(self.potsdam.id)])
+
+        data = self.get(radius_km=50, include_remote=True)
+        self.assertEqual(data['results'][-1]['id'], str(self.remote.id))
+        self.assertIsNone(data['results'][-1]['distance_km'])
+
+    def test_radius_respects_limit(self):
+        data = self.get(radius_km=500, limit=1)
+        self.assertEqual([job['id'] for job in data['results']], [str(self.berlin.id)])
+
+    @override_settings(GEO_CLUSTER_THRESHOLD=2)
+    def test_large_results_are_clustered(self):
+        data = self.get(radius_km=500)
+        self.assertTrue(data['clustered'])
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['remote_count'], 0)
+        self.assertEqual(sum(cluster['count'] for cluster in data['clusters']), 3)
+        self.assertEqual(data['precision'], 3)
+
+    def test_remote_jobs_are_counted_beside_the_clusters(self):
+        data = self.get(radius_km=500, include_remote=True, cluster=True)
+        self.assertEqual((data['count'], data['remote_count']), (3, 1))
+        self.assertEqual(sum(cluster['count'] for cluster in data['clusters']), 3)
+
+    def test_point_is_required_without_a_profile_location(self):
+        response = self.client.get(reverse('job-nearby'))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,134 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.tests.factories import make_employer, make_job, make_skill, make_user
+from apps.jobs import percolator
+from apps.jobs.models import Job, SavedSearch
+from apps.jobs.percolator import InstantSearchIndex, job_values
+from apps.notifications.models import Notification
+from apps.users.models import Experience
+
+
+class CandidatesTests(SimpleTestCase):
+    def setUp(self):
+        self.index = InstantSearchIndex()
+        self.index._add('python', 'u1', {'skills': ['py', 'dj']})
+        self.index._add('remote-python', 'u2', {'skills': ['py'], 'is_remote': True})
+        self.index._add('contract', 'u3', {'employment_type': ['CONTRACT']})
+        self.index._add('everything', 'u4', {'q': 'engineer'})
+
+    def values(self, skills=(), remote=False, employment_type='FULL_TIME'):
+        return {
+            'skills': set(skills), 'employment_type': {employment_type}, 'experience_level': {'MID'},
+            'is_remote': {remote}, 'location': set(),
+        }
+
+    def test_every_constrained_dimension_must_be_hit(self):
+        self.assertCountEqual(self.index.candidates(self.values(['dj'])), ['python', 'everything'])
+        self.assertCountEqual(
+            self.index.candidates(self.values(['py'], remote=True)), ['python', 'remote-python', 'everything']
+        )
+        self.assertCountEqual(
+            self.index.candidates(self.values(employment_type='CONTRACT')), ['contract', 'everything']
+        )
+
+    def test_remove_cleans_postings(self):
+        self.index._remove('python')
+        self.index._remove('everything')
+        self.assertEqual(self.index.candidates(self.values(['dj'])), [])
+        self.assertNotIn('dj', self.index.postings['skills'])
+        self.assertEqual(set(self.index.postings['skills']['py']), {'remote-python'})
+
+
+class InstantSearchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        cls.python = make_skill('Python')
+        cls.job = make_job(cls.employer, cls.company, skills=[cls.python], title='Python engineer', salary_max=90000)
+
+    def setUp(self):
+        cache.clear()
+        self.index = InstantSearchIndex()
+
+    def search(self, query_params, **fields):
+        fields.setdefault('user', make_user())
+        return SavedSearch.objects.create(
+            query_params=query_params, alert_frequency=SavedSearch.Frequency.INSTANT, **fields
+        )
+
+    def test_match_applies_salary_and_text(self):
+        matching = self.search({'skills': [str(self.python.id)], 'q': 'python', 'salary_min': 80000})
+        self.search({'skills': [str(self.python.id)], 'salary_min': 120000})
+        self.search({'q': 'golang'})
+        self.assertEqual(self.index.ensure_fresh().match(self.job), {matching.id: matching.user_id})
+
+    def test_sync_follows_edits(self):
+        search = self.search({'q': 'golang'})
+        self.index.ensure_fresh()
+        self.assertEqual(self.index.match(self.job), {})
+
+        search.query_params = {'q': 'python'}
+        search.save()
+        self.assertEqual(self.index.ensure_fresh().match(self.job), {search.id: search.user_id})
+
+        search.is_active = False
+        search.save()
+        self.assertEqual(self.index.ensure_fresh().match(self.job), {})
+        self.assertNotIn(search.id, self.index.searches)
+
+    def test_sync_follows_deletes(self):
+        search = self.search({})
+        self.index.ensure_fresh()
+        self.assertIn(search.id, self.index.unconstrained)
+        with self.captureOnCommitCallbacks(execute=True):
+            search.delete()
+        self.index.ensure_fresh()
+        self.assertEqual(self.index.searches, {})
+        self.assertEqual(self.index.unconstrained, set())
+
+    def test_job_values(self):
+        values = job_values(self.job, [self.python.id])
+        self.assertEqual(values['skills'], {str(self.python.id)})
+        self.assertEqual(values['location'], set())
+
+
+class PublishNotifiesInstantSearchesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        Experience.objects.create(
+            user=cls.employer, company=cls.company, title='Recruiter',
+            start_date=datetime.date(2024, 1, 1), is_current=True,
+        )
+        cls.python = make_skill('Python')
+        cls.seeker = make_user()
+        SavedSearch.objects.create(
+            user=cls.seeker, query_params={'skills': [str(cls.python.id)]},
+            alert_frequency=SavedSearch.Frequency.INSTANT,
+        )
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(percolator, 'instant_index', InstantSearchIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_job_created_published_is_matched_with_its_skills(self):
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(reverse('job-list-create'), {
+                'title': 'Backend engineer', 'description': 'APIs', 'status': Job.Status.PUBLISHED,
+                'experience_level': Job.ExperienceLevel.MID, 'employment_type': Job.EmploymentType.FULL_TIME,
+                'skill_ids': [str(self.python.id)],
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+        notification = Notification.objects.get(recipient=self.seeker)
+        self.assertEqual(str(notification.object_id), response.data['id'])
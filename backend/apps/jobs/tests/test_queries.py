@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.prefetch import get_queryset_plan
+from apps.core.tests.factories import make_employer, make_job, make_location, make_skill, make_user
+from apps.jobs.models import Job, SavedJob
+from apps.jobs.serializers import JobSerializer, SavedJobListSerializer
+from apps.users.services import RoleService
+
+
+class QuerysetPlanTests(TestCase):
+    def test_job_serializer_plan(self):
+        self.assertEqual(
+            get_queryset_plan(JobSerializer, Job),
+            (('company', 'employer', 'location'), ('required_skills',)),
+        )
+
+    def test_nested_serializer_plan_is_prefixed(self):
+        self.assertEqual(
+            get_queryset_plan(SavedJobListSerializer, SavedJob),
+            (('job', 'job__company', 'job__employer', 'job__location'), ('job__required_skills',)),
+        )
+
+
+class JobQueryCountTests(TestCase):
+    """The read endpoints run a fixed number of queries however many jobs and skills they return."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        location = make_location()
+        skills = [make_skill() for _ in range(3)]
+        cls.jobs = [
+            make_job(cls.employer, cls.company, skills=skills[:index + 1], location=location)
+            for index in range(3)
+        ]
+        cls.seeker = make_user()
+        for job in cls.jobs:
+            SavedJob.objects.create(user=cls.seeker, job=job)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def as_employer(self):
+        self.client.force_authenticate(self.employer)
+        # Resolve the role up front; its queries are covered by the users tests
+        RoleService.resolve(self.employer)
+
+    def test_employer_job_list(self):
+        self.as_employer()
+        # COUNT, the page with its joins, the skills prefetch
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('job-list-create'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_employer_job_list_keyset(self):
+        self.as_employer()
+        # No COUNT with cursor pagination
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('job-list-create'), {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_employer_job_detail(self):
+        self.as_employer()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('job-retrieve-update-destroy', args=[self.jobs[2].id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['required_skills']), 3)
+
+    def test_public_job_list(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('job-public-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+
+    @override_settings(COUNTER_FLUSH_SECONDS=60 * 60, COUNTER_MAX_PENDING=10 ** 6)
+    def test_public_job_detail(self):
+        # The view count is buffered, so no UPDATE on the request path
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('job-public-detail', args=[self.jobs[0].id]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_saved_job_list(self):
+        self.client.force_authenticate(self.seeker)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('saved-jobs'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertTrue(all(item['job']['required_skills'] for item in response.data['results']))
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core.tests.factories import make_employer, make_job, make_job_seeker, make_skill
+from apps.jobs import recommendations
+from apps.jobs.models import Job
+from apps.jobs.recommendations import IndexSnapshot, SkillJobIndex, recommend_jobs
+
+
+class ShortlistTests(SimpleTestCase):
+    def test_orders_by_coverage_then_shared_skills(self):
+        snapshot = IndexSnapshot(1, 0.0, {'a': ['j1', 'j2', 'j3'], 'b': ['j1', 'j3']}, {'j1': 2, 'j2': 4, 'j3': 3})
+        self.assertEqual(
+            SkillJobIndex.shortlist(snapshot, ['a', 'b'], 2),
+            [(1.0, 2, 'j1'), (2 / 3, 2, 'j3')],
+        )
+        self.assertEqual(SkillJobIndex.shortlist(snapshot, ['unknown'], 2), [])
+
+
+class SkillJobIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        cls.python, cls.go = make_skill('Python'), make_skill('Go')
+        cls.job = make_job(cls.employer, cls.company, skills=[cls.python, cls.go])
+        make_job(cls.employer, cls.company, skills=[cls.python], status=Job.Status.DRAFT)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_rebuild_swaps_in_a_new_snapshot(self):
+        index = SkillJobIndex()
+        old = index.snapshot
+        snapshot, is_current = index.ensure_fresh()
+        self.assertTrue(is_current)
+        self.assertIsNot(snapshot, old)
+        self.assertIs(index.snapshot, snapshot)
+        # Drafts are not indexed
+        self.assertEqual(snapshot.postings, {self.python.id: [self.job.id], self.go.id: [self.job.id]})
+        self.assertEqual(snapshot.skill_counts, {self.job.id: 2})
+        # The old snapshot is left untouched for readers still holding it
+        self.assertEqual(old.postings, {})
+
+    def test_rebuilds_are_rate_limited(self):
+        index = SkillJobIndex()
+        snapshot, _ = index.ensure_fresh()
+        with self.captureOnCommitCallbacks(execute=True):
+            SkillJobIndex.invalidate()
+        self.assertEqual(index.ensure_fresh(), (snapshot, False))
+        with override_settings(RECOMMENDATION_INDEX_REBUILD_SECONDS=0):
+            rebuilt, is_current = index.ensure_fresh()
+        self.assertTrue(is_current)
+        self.assertGreater(rebuilt.version, snapshot.version)
+
+    def test_skill_versions_change_only_for_affected_skills(self):
+        python = SkillJobIndex.skill_versions_digest([self.python.id])
+        go = SkillJobIndex.skill_versions_digest([self.go.id])
+        other = make_skill('Rust')
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.employer, self.company, skills=[other])
+        self.assertEqual(SkillJobIndex.skill_versions_digest([self.python.id]), python)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.required_skills.remove(self.go)
+        self.assertEqual(SkillJobIndex.skill_versions_digest([self.python.id]), python)
+        self.assertNotEqual(SkillJobIndex.skill_versions_digest([self.go.id]), go)
+
+        self.job.status = Job.Status.CLOSED
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.save(update_fields=['status', 'updated_at'])
+        self.assertNotEqual(SkillJobIndex.skill_versions_digest([self.python.id]), python)
+
+    def test_versions_change_when_the_writer_commits(self):
+        version = SkillJobIndex.current_version()
+        python = SkillJobIndex.skill_versions_digest([self.python.id])
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.required_skills.clear()
+        # A rebuild before the commit would read the old rows, so it must
+        # not be able to cache them under a new version
+        self.assertEqual(SkillJobIndex.current_version(), version)
+        self.assertEqual(SkillJobIndex.skill_versions_digest([self.python.id]), python)
+
+        for callback in callbacks:
+            callback()
+        self.assertGreater(SkillJobIndex.current_version(), version)
+        # The cleared skills were read before the rows went away
+        self.assertNotEqual(SkillJobIndex.skill_versions_digest([self.python.id]), python)
+
+
+@override_settings(RECOMMENDATION_INDEX_REBUILD_SECONDS=0)
+class RecommendJobsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        cls.python, cls.go, cls.rust = make_skill('Python'), make_skill('Go'), make_skill('Rust')
+        cls.python_job = make_job(cls.employer, cls.company, skills=[cls.python])
+        cls.mixed_job = make_job(cls.employer, cls.company, skills=[cls.python, cls.go])
+        cls.seeker = make_job_seeker(skills=[cls.python])
+
+    def setUp(self):
+        cache.clear()
+        self.index = mock.patch.object(recommendations, 'skill_job_index', SkillJobIndex())
+        self.index.start()
+        self.addCleanup(self.index.stop)
+
+    def test_best_coverage_first(self):
+        job_ids = [job_id for job_id, _ in recommend_jobs(self.seeker.profile, 5)]
+        self.assertEqual(job_ids, [self.python_job.id, self.mixed_job.id])
+
+    def test_unrelated_job_changes_keep_the_cache(self):
+        recommend_jobs(self.seeker.profile, 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.employer, self.company, skills=[self.rust])
+        with mock.patch.object(SkillJobIndex, 'shortlist') as shortlist:
+            recommend_jobs(self.seeker.profile, 5)
+        shortlist.assert_not_called()
+
+    def test_related_job_changes_drop_the_cache(self):
+        recommend_jobs(self.seeker.profile, 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            new_job = make_job(self.employer, self.company, skills=[self.python])
+        job_ids = [job_id for job_id, _ in recommend_jobs(self.seeker.profile, 5)]
+        self.assertIn(new_job.id, job_ids)
+
+    def test_falls_back_to_newest_jobs_without_overlap(self):
+        seeker = make_job_seeker(skills=[self.rust])
+        self.assertEqual(
+            recommend_jobs(seeker.profile, 1),
+            [(self.mixed_job.id, 0.0)],
+        )
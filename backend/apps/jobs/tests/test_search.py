@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from elasticsearch import TransportError
+from rest_framework.test import APIClient
+
+from apps.core.tests.factories import make_employer, make_job, make_skill
+from apps.jobs import search
+from apps.jobs.models import Job
+from apps.jobs.search import JobSearchService
+
+
+class JobSearchServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.company = make_employer()
+        cls.python = make_skill('Python')
+        cls.go = make_skill('Go')
+        cls.remote = make_job(
+            cls.employer, cls.company, skills=[cls.python], title='Python developer', is_remote=True,
+            employment_type=Job.EmploymentType.CONTRACT,
+        )
+        cls.office = make_job(cls.employer, cls.company, skills=[cls.python, cls.go], title='Go developer')
+        cls.draft = make_job(cls.employer, cls.company, title='Python intern', status=Job.Status.DRAFT)
+
+    @override_settings(ELASTICSEARCH_ENABLED=True)
+    def test_falls_back_to_postgres_when_elasticsearch_fails(self):
+        with mock.patch.object(
+            JobSearchService, 'search_elasticsearch', side_effect=TransportError('connection refused')
+        ):
+            result = JobSearchService({'q': 'python'}).search()
+        self.assertEqual(result['backend'], 'postgres')
+        self.assertEqual([job['id'] for job in result['results']], [str(self.remote.id)])
+
+    def test_serialize_keeps_index_order_and_skips_missing_jobs(self):
+        self.office.is_deleted = True
+        self.office.save(update_fields=['is_deleted'])
+        job_ids = [str(self.office.id), str(self.remote.id), str(self.draft.id)]
+        results = JobSearchService({})._serialize(job_ids, {str(self.remote.id): {'title': ['<mark>Python</mark>']}})
+        self.assertEqual([job['id'] for job in results], [str(self.remote.id), str(self.draft.id)])
+        self.assertEqual(results[0]['highlight'], {'title': ['<mark>Python</mark>']})
+        self.assertEqual(results[1]['highlight'], {})
+
+    def test_filters_and_facets(self):
+        result = JobSearchService({'skills': [self.python.id], 'is_remote': None}).search()
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(
+            {facet['value']: facet['count'] for facet in result['facets']['skills']},
+            {'Python': 2, 'Go': 1},
+        )
+        self.assertEqual(
+            {facet['value']: facet['count'] for facet in result['facets']['employment_type']},
+            {Job.EmploymentType.CONTRACT: 1, Job.EmploymentType.FULL_TIME: 1},
+        )
+
+        result = JobSearchService({'is_remote': True, 'employment_type': [Job.EmploymentType.CONTRACT]}).search()
+        self.assertEqual([job['id'] for job in result['results']], [str(self.remote.id)])
+
+    def test_skills_facet_is_limited_in_the_query(self):
+        with mock.patch.object(search, 'FACET_SIZE', 1), CaptureQueriesContext(connection) as queries:
+            result = JobSearchService({}).search()
+        self.assertEqual(result['facets']['skills'], [{'value': 'Python', 'count': 2}])
+        [facet_sql] = [query['sql'] for query in queries.captured_queries if 'GROUP BY "skills"."name"' in query['sql']]
+        self.assertIn('LIMIT 1', facet_sql)
+
+    def test_pagination(self):
+        result = JobSearchService({'page': 2, 'page_size': 1}).search()
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(len(result['results']), 1)
+
+    def test_endpoint_validates_filters(self):
+        response = APIClient().get(reverse('job-search'), {'employment_type': 'FULL_TIME,NOPE'})
+        self.assertEqual(response.status_code, 400)
+
+        response = APIClient().get(reverse('job-search'), {'q': 'developer', 'employment_type': 'CONTRACT'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
@@ -0,0 +1,136 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.tests.factories import make_employer, make_job, make_job_seeker, make_skill, make_user
+from apps.jobs.models import Skill, SkillAlias
+from apps.jobs.taxonomy import (
+    AhoCorasick, SkillMatcher, extract_skills, merge_duplicate_skills, merge_skills, normalize_skill_name,
+)
+
+
+def matcher(lookup):
+    instance = SkillMatcher()
+    instance.lookup = lookup
+    instance.automaton = AhoCorasick(lookup)
+    return instance
+
+
+class NormalizeSkillNameTests(SimpleTestCase):
+    def test_keeps_name_punctuation(self):
+        self.assertEqual(normalize_skill_name('  Node.JS '), 'node.js')
+        self.assertEqual(normalize_skill_name('C++ / C#'), 'c++ c#')
+        self.assertEqual(normalize_skill_name('Résumé-writing.'), 'resume writing')
+
+
+class AhoCorasickTests(SimpleTestCase):
+    def test_finds_overlapping_matches(self):
+        automaton = AhoCorasick({'he': 1, 'she': 2, 'his': 3, 'hers': 4})
+        self.assertEqual(
+            sorted(automaton.iter_matches('ushers')),
+            [(1, 4, 2), (2, 4, 1), (2, 6, 4)],
+        )
+
+    def test_no_patterns(self):
+        self.assertEqual(list(AhoCorasick({}).iter_matches('anything')), [])
+
+
+class SkillMatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.matcher = matcher({'java': 'java', 'javascript': 'js', 'c': 'c', 'c++': 'cpp', 'node.js': 'node',
+                                'go': 'go', 'machine learning': 'ml'})
+
+    def test_matches_whole_words_only(self):
+        self.assertEqual(self.matcher.match('JavaScript and Java'), ['js', 'java'])
+        self.assertEqual(self.matcher.match('Good at Django'), [])
+
+    def test_names_with_symbols(self):
+        self.assertEqual(self.matcher.match('C++, C and Node.js'), ['cpp', 'c', 'node'])
+
+    def test_full_stop_ends_a_word(self):
+        self.assertEqual(self.matcher.match('I write Go.'), ['go'])
+
+    def test_multi_word_names_and_first_mention_order(self):
+        self.assertEqual(self.matcher.match('Go, machine-learning, go again'), ['go', 'ml'])
+
+    def test_resolve(self):
+        self.assertEqual(self.matcher.resolve(' NODE.JS '), 'node')
+        self.assertIsNone(self.matcher.resolve('rust'))
+
+
+class TaxonomyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = make_skill('Python')
+        cls.kubernetes = make_skill('Kubernetes')
+        SkillAlias.objects.create(skill=cls.python, name='python3')
+        SkillAlias.objects.create(skill=cls.kubernetes, name='K8s')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_extract_skills_follows_aliases(self):
+        self.assertEqual(extract_skills('Deploys python3 services on k8s.'), [self.python, self.kubernetes])
+
+    def test_new_aliases_are_picked_up(self):
+        self.assertEqual(extract_skills('py scripts'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            SkillAlias.objects.create(skill=self.python, name='Py')
+        self.assertEqual(extract_skills('py scripts'), [self.python])
+
+    def test_merge_repoints_jobs_and_profiles(self):
+        duplicate = make_skill('Python 3')
+        employer, company = make_employer()
+        job = make_job(employer, company, skills=[duplicate])
+        both = make_job(employer, company, skills=[duplicate, self.python])
+        seeker = make_job_seeker(skills=[duplicate])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(merge_skills(self.python, [duplicate]), 1)
+        self.assertFalse(Skill.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual(list(job.required_skills.all()), [self.python])
+        self.assertEqual(list(both.required_skills.all()), [self.python])
+        self.assertEqual(list(seeker.profile.skills.all()), [self.python])
+        self.assertEqual(extract_skills('Python 3'), [self.python])
+
+    def test_merge_duplicate_skills_keeps_the_oldest(self):
+        make_skill('kubernetes ')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(merge_duplicate_skills(), 1)
+        self.assertEqual(list(Skill.objects.filter(name__istartswith='kubernetes')), [self.kubernetes])
+
+
+class SkillEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = make_skill('Python')
+        SkillAlias.objects.create(skill=cls.python, name='python3')
+        cls.user = make_user()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_list_is_public_and_create_needs_a_login(self):
+        self.assertEqual(self.client.get(reverse('skills')).status_code, 200)
+        self.assertEqual(self.client.post(reverse('skills'), {'name': 'Rust'}).status_code, 401)
+
+    def test_create_returns_the_existing_skill_for_known_names(self):
+        self.client.force_authenticate(self.user)
+        for name in ('python3', 'Python'):
+            with self.subTest(name=name):
+                response = self.client.post(reverse('skills'), {'name': name})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['id'], str(self.python.id))
+
+        response = self.client.post(reverse('skills'), {'name': 'Rust', 'category': 'Languages'})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Skill.objects.filter(name='Rust').exists())
+
+    def test_extract(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse('skills-extract'), {'text': 'Python3 and SQL'}, format='json')
+        self.assertEqual([skill['name'] for skill in response.data], ['Python'])
+        response = self.client.post(reverse('skills-extract'), {'text': ['Python']}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -1,12 +1,21 @@
 from django.urls import path
 
+from apps.applications.views import JobCandidateRankingView
+
 from apps.jobs.views import (
     JobListCreateAPIView,
     JobRetrieveUpdateDestroyView,
     JobPublishAPIView,
     JobCloseAPIView,
     SkillsListView,
-    JobSaveAPIView
+    JobSaveAPIView,
+    SavedJobListAPIView,
+    JobSearchAPIView,
+    PublicJobListAPIView,
+    PublicJobRetrieveAPIView,
+    JobRecommendationsAPIView,
+    JobNearbyAPIView,
+    SkillExtractAPIView
 )
 
 
@@ -16,6 +25,14 @@ urlpatterns = [
          name='job-retrieve-update-destroy'),
     path('<uuid:id>/publish/', view=JobPublishAPIView.as_view(), name='job-publish'),
     path('<uuid:id>/close/', view=JobCloseAPIView.as_view(), name='job-close'),
+    path('<uuid:id>/candidates/', view=JobCandidateRankingView.as_view(), name='job-candidates'),
     path('skills/', view=SkillsListView.as_view(), name='skills'),
+    path('skills/extract/', view=SkillExtractAPIView.as_view(), name='skills-extract'),
+    path('saved/', view=SavedJobListAPIView.as_view(), name='saved-jobs'),
+    path('search/', view=JobSearchAPIView.as_view(), name='job-search'),
+    path('public/', view=PublicJobListAPIView.as_view(), name='job-public-list'),
+    path('public/<uuid:id>/', view=PublicJobRetrieveAPIView.as_view(), name='job-public-detail'),
+    path('recommended/', view=JobRecommendationsAPIView.as_view(), name='job-recommended'),
+    path('nearby/', view=JobNearbyAPIView.as_view(), name='job-nearby'),
     path('<uuid:id>/save/', view=JobSaveAPIView.as_view(), name='job-save')
 ]
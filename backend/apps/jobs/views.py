@@ -4,8 +4,11 @@ from rest_framework import generics
 from rest_framework import permissions
 from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError as DRFValidationError
 
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 
@@ -13,50 +16,56 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
 
 from apps.jobs.models import Job, Skill, SavedJob
-from apps.jobs.serializers import JobSerializer, SkillSerializer, SavedJobSerializer
-
-from apps.core.permissions import IsEmployer
-from apps.core.pagination import VariableResultsSetPagination
+from apps.jobs.serializers import (
+    JobSerializer, SkillSerializer, SavedJobSerializer, SavedJobListSerializer, JobSearchRequestSerializer,
+    JobNearbyRequestSerializer
+)
+from apps.jobs import geo
+from apps.jobs.taxonomy import extract_skills, get_skill_matcher
+from apps.jobs.search import JobSearchService
+from apps.jobs.filters import JobSearchRankFilter, apply_job_filters
+from apps.jobs.recommendations import recommend_jobs
+from apps.jobs.tasks import notify_job_closed
+
+from apps.core.permissions import IsEmployer, IsJobSeeker
+from apps.core.pagination import KeysetPaginationMixin, VariableResultsSetPagination
+from apps.core.prefetch import QuerysetPlannerMixin, plan_queryset
+from apps.core.counters import CounterBuffer
 
 
 User = get_user_model()
 
+job_views = CounterBuffer(Job, 'view_count')
+
 
-class JobListCreateAPIView(generics.ListCreateAPIView):
+class JobListCreateAPIView(KeysetPaginationMixin, QuerysetPlannerMixin, generics.ListCreateAPIView):
     queryset = Job.active_objects.all()
     serializer_class = JobSerializer
     permission_classes = [IsEmployer]
     lookup_field = 'id'
+    keyset_ordering = ('-updated_at', '-id')
 
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, JobSearchRankFilter]
     filterset_fields = ['status', 'is_remote', 'employment_type',
                         'experience_level', 'company', 'created_at']
     ordering_fields = ['created_at', 'updated_at', 'title',
                        'salary_min', 'salary_max', 'company__company_name']
     ordering = ['-updated_at', '-created_at']
-    search_fields = ['title']
 
     def perform_create(self, serializer):
         user = self.request.user
-        company = None
-
-        # Check if user is currently working at a company
-        experience = user.experiences.filter(
-            is_current=True,
-            company__isnull=False
-        ).first()
 
-        if experience:
-            company = experience.company
+        # Resolved once per request by IsEmployer, so this doesn't hit the database again
+        company_id = user.current_company_id
 
-        if not company:
+        if not company_id:
             raise ValidationError(
                 {"company": "You must have an active employment record at a company to post a job."}
             )
 
         serializer.save(
             employer=user,
-            company=company
+            company_id=company_id
         )
 
     def get_queryset(self):
@@ -74,7 +83,32 @@ class JobListCreateAPIView(generics.ListCreateAPIView):
         return queryset
 
 
-class JobRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class PublicJobListAPIView(QuerysetPlannerMixin, generics.ListAPIView):
+    queryset = Job.active_objects.filter(status=Job.Status.PUBLISHED)
+    serializer_class = JobSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = VariableResultsSetPagination
+
+    filter_backends = [DjangoFilterBackend, OrderingFilter, JobSearchRankFilter]
+    filterset_fields = ['is_remote', 'employment_type', 'experience_level', 'company', 'location']
+    ordering_fields = ['created_at', 'title', 'salary_min', 'salary_max']
+    ordering = ['-created_at']
+
+
+class PublicJobRetrieveAPIView(QuerysetPlannerMixin, generics.RetrieveAPIView):
+    queryset = Job.active_objects.filter(status=Job.Status.PUBLISHED)
+    serializer_class = JobSerializer
+    permission_classes = [permissions.AllowAny]
+    lookup_field = 'id'
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        # Buffered and flushed in bulk, so busy job pages never write to the row
+        job_views.incr(instance.pk)
+        return Response(self.get_serializer(instance).data)
+
+
+class JobRetrieveUpdateDestroyView(QuerysetPlannerMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Job.active_objects.all()
     serializer_class = JobSerializer
     permission_classes = [IsEmployer]
@@ -85,12 +119,19 @@ class JobRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
 
     def perform_destroy(self, instance):
         instance.is_deleted = True
-        instance.save()
+        instance.save(update_fields=['is_deleted', 'updated_at'])
 
 
-class SkillListCreateAPIView(generics.CreateAPIView):
-    queryset = Skill.objects.all()
-    serializer_class = SkillSerializer
+class SkillExtractAPIView(APIView):
+    """Known skills mentioned in a block of text, e.g. a job description being written."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        text = request.data.get('text', '')
+        if not isinstance(text, str):
+            raise DRFValidationError({'text': 'Must be a string.'})
+        skills = extract_skills(text[:settings.SKILL_EXTRACT_MAX_CHARS])
+        return Response(SkillSerializer(skills, many=True).data, status=status.HTTP_200_OK)
 
 
 class JobPublishAPIView(APIView):
@@ -106,7 +147,8 @@ class JobPublishAPIView(APIView):
             return Response({"status": "Job is already published"}, status=status.HTTP_400_BAD_REQUEST)
 
         job.status = Job.Status.PUBLISHED
-        job.save()
+        job.published_at = timezone.now()
+        job.save(update_fields=['status', 'published_at', 'updated_at'])
         return Response({"status": "Job published successfully"}, status=status.HTTP_200_OK)
 
 
@@ -123,17 +165,46 @@ class JobCloseAPIView(APIView):
             return Response({"status": "Job is already closed"}, status=status.HTTP_400_BAD_REQUEST)
 
         job.status = Job.Status.CLOSED
-        job.save()
+        job.save(update_fields=['status', 'updated_at'])
+        notify_job_closed.delay_on_commit(str(job.id))
         return Response({"status": "Job closed successfully"}, status=status.HTTP_200_OK)
 
 
-class SkillsListView(generics.ListAPIView):
+class SkillsListView(KeysetPaginationMixin, generics.ListCreateAPIView):
     queryset = Skill.objects.all().order_by('name')
     serializer_class = SkillSerializer
-    permission_classes = [permissions.AllowAny]
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [SearchFilter]
     search_fields = ['name', 'category']
     pagination_class = VariableResultsSetPagination
+    keyset_ordering = ('name', 'id')
+
+    def create(self, request, *args, **kwargs):
+        # 'python3' or 'Py' resolve to the existing Python skill instead of a new row.
+        # Checked before validation, which would reject an exact duplicate name.
+        name = request.data.get('name')
+        skill_id = get_skill_matcher().resolve(name) if isinstance(name, str) else None
+        if skill_id is not None:
+            skill = get_object_or_404(Skill, id=skill_id)
+            return Response(self.get_serializer(skill).data, status=status.HTTP_200_OK)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class SavedJobListAPIView(QuerysetPlannerMixin, generics.ListAPIView):
+    queryset = SavedJob.objects.all()
+    serializer_class = SavedJobListSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = VariableResultsSetPagination
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            user=self.request.user,
+            job__is_deleted=False
+        ).order_by('-created_at')
 
 
 class JobSaveAPIView(APIView):
@@ -149,4 +220,118 @@ class JobSaveAPIView(APIView):
             return Response({'message': 'Job removed from saved', "status_code": status.HTTP_200_OK}, status=status.HTTP_200_OK)
         else:
             saved_job = SavedJob.objects.create(user=request.user, job=job)
-            return Response({'message': 'Job saved successfully', "status_code": status.HTTP_201_CREATED}, status=status.HTTP_201_CREATED)
\ No newline at end of file
+            return Response({'message': 'Job saved successfully', "status_code": status.HTTP_201_CREATED}, status=status.HTTP_201_CREATED)
+
+
+def filter_query_data(request):
+    """Query params as serializer data; multi-valued filters may be repeated or comma separated."""
+    data = {}
+    for key in request.query_params:
+        values = request.query_params.getlist(key)
+        if key in ('skills', 'employment_type', 'experience_level'):
+            data[key] = [value for item in values for value in item.split(',') if value]
+        else:
+            data[key] = values[-1]
+    return data
+
+
+class JobSearchAPIView(APIView):
+    permission_classes = [permissions.AllowAny]
+    serializer_class = JobSearchRequestSerializer
+
+    def get(self, request):
+        serializer = self.serializer_class(data=filter_query_data(request))
+        serializer.is_valid(raise_exception=True)
+
+        return Response(JobSearchService(serializer.validated_data).search(), status=status.HTTP_200_OK)
+
+
+class JobRecommendationsAPIView(APIView):
+    permission_classes = [IsJobSeeker]
+    default_limit = 20
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+
+        recommendations = recommend_jobs(request.user.profile, max(limit, 1))
+
+        scores = {str(job_id): score for job_id, score in recommendations}
+        jobs = plan_queryset(Job.active_objects.filter(id__in=list(scores)), JobSerializer)
+        jobs_by_id = {str(job.id): job for job in jobs}
+
+        results = []
+        for job_id, score in scores.items():
+            job = jobs_by_id.get(job_id)
+            if job is not None:
+                data = JobSerializer(job).data
+                data['match_score'] = score
+                results.append(data)
+
+        return Response({'count': len(results), 'results': results}, status=status.HTTP_200_OK)
+
+
+class JobNearbyAPIView(APIView):
+    """
+    The ``limit`` nearest published jobs to a point, only those within
+    ``radius_km`` when given. Defaults to the job seeker's profile location. Radius
+    searches matching more than ``GEO_CLUSTER_THRESHOLD`` jobs (or any search
+    with ``cluster=true``) return geohash clusters instead of jobs. ``count``
+    then covers the clustered jobs, and ``remote_count`` covers the remote jobs
+    without a location that ``include_remote`` matched.
+    """
+    permission_classes = [permissions.AllowAny]
+    serializer_class = JobNearbyRequestSerializer
+
+    def get_point(self, request, params):
+        if 'lat' in params:
+            return params['lng'], params['lat']
+        profile = getattr(request.user, 'profile', None) if request.user.is_authenticated else None
+        if profile is not None and profile.location is not None:
+            return profile.location.x, profile.location.y
+        raise DRFValidationError({'lat': 'lat and lng are required without a profile location.'})
+
+    def get(self, request):
+        serializer = self.serializer_class(data=filter_query_data(request))
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        lng, lat = self.get_point(request, params)
+
+        queryset = apply_job_filters(Job.active_objects.filter(status=Job.Status.PUBLISHED), params)
+        radius_km = params.get('radius_km')
+
+        if radius_km is None:
+            rows = geo.nearest_jobs(queryset, lng, lat, params['limit'])
+            return Response(self.serialize(rows), status=status.HTTP_200_OK)
+
+        jobs = geo.jobs_within(queryset, lng, lat, radius_km, include_remote=params['include_remote'])
+        located, remote = geo.count_located(jobs)
+        if params['cluster'] or located + remote > settings.GEO_CLUSTER_THRESHOLD:
+            precision = params.get('precision') or geo.geohash_precision(radius_km)
+            return Response({
+                'clustered': True,
+                'count': located,
+                'remote_count': remote,
+                'precision': precision,
+                'clusters': geo.cluster_jobs(jobs, precision),
+            }, status=status.HTTP_200_OK)
+
+        rows = jobs.values_list('id', 'distance_km')[:params['limit']]
+        return Response(self.serialize(rows), status=status.HTTP_200_OK)
+
+    @staticmethod
+    def serialize(rows):
+        """``rows`` are ``(job_id, distance_km)`` pairs, nearest first."""
+        distances = dict(rows)
+        by_id = {job.id: job for job in plan_queryset(Job.active_objects.filter(id__in=list(distances)), JobSerializer)}
+
+        results = []
+        for job_id, distance in distances.items():
+            if job_id in by_id:
+                data = JobSerializer(by_id[job_id]).data
+                data['distance_km'] = round(distance, 2) if distance is not None else None
+                results.append(data)
+        return {'clustered': False, 'count': len(results), 'results': results}
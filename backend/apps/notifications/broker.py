@@ -0,0 +1,190 @@
+"""
+Pub/sub for the notification stream.
+
+Publishers (request handlers and Celery tasks, all synchronous) call
+``publish(user_ids, event, data)``, or ``publish_each(event, data_by_user)``
+when every user gets their own payload. Each ASGI worker keeps at most one
+subscriber connection to Redis, shared by every open stream in the process:
+channels are subscribed when a user's first stream opens and unsubscribed when
+their last one closes, and a single reader task routes messages to the local
+streams. Without ``NOTIFICATION_STREAM_REDIS_URL`` events are delivered in
+process only, which is enough for a single development server.
+
+Every stream has a bounded queue. A client that can't keep up has its oldest
+events dropped and is told to resync over the REST endpoints instead of
+letting the queue grow without limit.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'notifications:user:'
+
+
+def channel_name(user_id):
+    return f'{CHANNEL_PREFIX}{user_id}'
+
+
+class Subscription:
+    def __init__(self, user_id, loop):
+        self.user_id = str(user_id)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        """Queue ``message`` from the subscription's event loop, dropping the oldest when full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.overflowed = True
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout):
+        """The next message, or ``None`` if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    def __init__(self):
+        self.subscriptions = {}
+        self._lock = threading.Lock()
+
+    async def subscribe(self, user_id):
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self.subscriptions.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self.subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.user_id, None)
+
+    def deliver(self, user_id, message):
+        with self._lock:
+            subscriptions = list(self.subscriptions.get(str(user_id), ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.put, message)
+
+    def publish(self, messages):
+        """Deliver ``(user_id, message)`` pairs."""
+        for user_id, message in messages:
+            self.deliver(user_id, message)
+
+
+class RedisBroker(InProcessBroker):
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._pubsub = None
+        self._reader = None
+        self._ready = None
+
+    def _publisher(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def publish(self, messages):
+        # One round trip for the whole fan-out
+        pipeline = self._publisher().pipeline(transaction=False)
+        for user_id, message in messages:
+            pipeline.publish(channel_name(user_id), message)
+        pipeline.execute()
+
+    async def _ensure_reader(self):
+        if self._ready is None:
+            self._ready = ready = asyncio.get_running_loop().create_future()
+            try:
+                import redis.asyncio as aioredis
+                pubsub = aioredis.Redis.from_url(self.url).pubsub(ignore_subscribe_messages=True)
+                # The reader needs at least one subscription before it can listen
+                await pubsub.subscribe(f'{CHANNEL_PREFIX}_')
+            except BaseException:
+                # Fail the streams waiting on this attempt and let the next one retry
+                self._ready = None
+                ready.set_exception(ConnectionError('Could not connect to the notification stream broker'))
+                ready.exception()
+                raise
+            self._pubsub = pubsub
+            self._reader = asyncio.create_task(self._read())
+            ready.set_result(None)
+        # Shielded so a stream that goes away while waiting doesn't cancel it for the others
+        await asyncio.shield(self._ready)
+
+    async def _read(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message['type'] == 'message':
+                        channel = message['channel'].decode()
+                        self.deliver(channel[len(CHANNEL_PREFIX):], message['data'].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification stream reader failed, reconnecting")
+                await asyncio.sleep(1)
+
+    async def subscribe(self, user_id):
+        await self._ensure_reader()
+        subscription = await super().subscribe(user_id)
+        if len(self.subscriptions.get(subscription.user_id, ())) == 1:
+            try:
+                await self._pubsub.subscribe(channel_name(subscription.user_id))
+            except BaseException:
+                await super().unsubscribe(subscription)
+                raise
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        await super().unsubscribe(subscription)
+        if subscription.user_id not in self.subscriptions:
+            await self._pubsub.unsubscribe(channel_name(subscription.user_id))
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        url = settings.NOTIFICATION_STREAM_REDIS_URL
+        _broker = RedisBroker(url) if url else InProcessBroker()
+    return _broker
+
+
+def _publish(event, messages):
+    if not messages:
+        return
+    try:
+        get_broker().publish(messages)
+    except Exception:
+        # Streams are best effort: clients resync from the REST endpoints
+        logger.exception(f"Failed to publish {event} to {len(messages)} users")
+
+
+def _encode(event, data):
+    return json.dumps({'event': event, 'data': data}, default=str)
+
+
+def publish(user_ids, event, data):
+    """Send ``event`` with JSON ``data`` to every open stream of the users in ``user_ids``."""
+    message = _encode(event, data)
+    _publish(event, [(user_id, message) for user_id in user_ids])
+
+
+def publish_each(event, data_by_user):
+    """Send ``event`` to every user in ``data_by_user`` with that user's own JSON data."""
+    _publish(event, [(user_id, _encode(event, data)) for user_id, data in data_by_user.items()])
@@ -20,3 +20,11 @@ class Notification(TimeStampedModel):
 
     def __str__(self):
         return f"Notification for {self.recipient.email}: {self.title}"
+
+    class Meta:
+        indexes = [
+            # Unread badge counts and the newest-first list, per recipient
+            models.Index(fields=['recipient', 'is_read', '-created_at'], name='notifications_unread_idx'),
+            # The default listing, which pages by (-created_at, -id) across read and unread
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notifications_recent_idx'),
+        ]
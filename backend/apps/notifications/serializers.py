@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from apps.notifications.models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    target_type = serializers.SlugRelatedField(source='content_type', slug_field='model', read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = (
+            'id', 'notification_type', 'title', 'message', 'target_type', 'object_id',
+            'is_read', 'read_at', 'created_at'
+        )
+        read_only_fields = fields
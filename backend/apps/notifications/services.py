@@ -0,0 +1,160 @@
+"""
+Notification fan-out and unread counters.
+
+``notify`` creates one row per recipient with ``bulk_create`` and bumps each
+recipient's unread counter once the rows are committed. Counters live in the
+shared cache so the unread badge is a cache read; a counter that is missing
+(expired, evicted or dropped after a large fan-out) is recomputed from the
+``(recipient, is_read, created_at)`` index on the next read.
+
+A recount can race with a change committed while it runs, whose increment or
+decrement then finds no counter. Every such miss writes a fresh token to the
+user's generation key, and a recount whose generation changed while it was
+counting drops the value it cached, so a stale count is never kept. Committed
+notifications are also pushed to the recipients' open streams, each with its
+own row's id.
+"""
+import uuid
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notifications import broker
+from apps.notifications.models import Notification
+from apps.notifications.serializers import NotificationSerializer
+
+UNREAD_KEY = 'notifications:unread:{}'
+GENERATION_KEY = 'notifications:unread_generation:{}'
+
+
+class NotificationType:
+    APPLICATION_RECEIVED = 'application_received'
+    APPLICATION_STATUS = 'application_status'
+    JOB_CLOSED = 'job_closed'
+    JOB_ALERT = 'job_alert'
+
+
+def unread_key(user_id):
+    return UNREAD_KEY.format(user_id)
+
+
+def generation_key(user_id):
+    return GENERATION_KEY.format(user_id)
+
+
+def unread_count(user_id):
+    count = cache.get(unread_key(user_id))
+    if count is None:
+        generation = cache.get(generation_key(user_id))
+        count = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+        # Checked after the add: a change that misses the counter before the
+        # add bumps the generation, and one that lands after it updates it
+        if (
+            cache.add(unread_key(user_id), count, timeout=settings.NOTIFICATION_UNREAD_TTL)
+            and cache.get(generation_key(user_id)) != generation
+        ):
+            cache.delete(unread_key(user_id))
+    return count
+
+
+def _bump_generations(user_ids):
+    """Tell recounts running for ``user_ids`` that they may have missed a change."""
+    token = uuid.uuid4().hex
+    cache.set_many(
+        {generation_key(user_id): token for user_id in user_ids},
+        timeout=settings.NOTIFICATION_UNREAD_TTL,
+    )
+
+
+def _incr_unread(counts):
+    if len(counts) > settings.NOTIFICATION_COUNTER_INCR_LIMIT:
+        # Two round trips instead of one per recipient; readers recount lazily
+        cache.delete_many([unread_key(user_id) for user_id in counts])
+        _bump_generations(counts)
+        return
+    missed = []
+    for user_id, amount in counts.items():
+        try:
+            cache.incr(unread_key(user_id), amount)
+        except ValueError:
+            # Not cached: the next read counts from the table
+            missed.append(user_id)
+    if missed:
+        _bump_generations(missed)
+
+
+def _decr_unread(user_id, amount):
+    try:
+        if cache.decr(unread_key(user_id), amount) < 0:
+            cache.delete(unread_key(user_id))
+    except ValueError:
+        _bump_generations([user_id])
+
+
+def notify(recipient_ids, notification_type, title, message, target=None):
+    """
+    Send the same notification to every user in ``recipient_ids`` (duplicates
+    are dropped), optionally linked to the ``target`` model instance.
+    Returns the number of notifications created.
+    """
+    recipient_ids = set(recipient_ids)
+    if not recipient_ids:
+        return 0
+
+    content_type = ContentType.objects.get_for_model(target) if target is not None else None
+    notifications = [
+        Notification(
+            recipient_id=recipient_id,
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            content_type=content_type,
+            object_id=target.pk if target is not None else None,
+        )
+        for recipient_id in recipient_ids
+    ]
+    Notification.objects.bulk_create(notifications, batch_size=settings.NOTIFICATION_BULK_BATCH_SIZE)
+
+    # bulk_create filled in each row's id and created_at; streamed events match the REST listing
+    events = {
+        notification.recipient_id: NotificationSerializer(notification).data
+        for notification in notifications
+    }
+
+    def on_commit():
+        _incr_unread(dict.fromkeys(recipient_ids, 1))
+        broker.publish_each('notification', events)
+
+    transaction.on_commit(on_commit)
+    return len(notifications)
+
+
+def mark_read(user_id, notification_id):
+    """Mark one notification read. Returns whether it was unread."""
+    updated = Notification.objects.filter(
+        id=notification_id, recipient_id=user_id, is_read=False
+    ).update(is_read=True, read_at=timezone.now())
+    if updated:
+        def on_commit():
+            _decr_unread(user_id, updated)
+            broker.publish([user_id], 'read', {'id': notification_id})
+
+        transaction.on_commit(on_commit)
+    return bool(updated)
+
+
+def mark_all_read(user_id):
+    """Mark every unread notification of the user read in one UPDATE. Returns the count."""
+    updated = Notification.objects.filter(recipient_id=user_id, is_read=False).update(
+        is_read=True, read_at=timezone.now()
+    )
+
+    def on_commit():
+        cache.set(unread_key(user_id), 0, timeout=settings.NOTIFICATION_UNREAD_TTL)
+        broker.publish([user_id], 'read_all', {})
+
+    transaction.on_commit(on_commit)
+    return updated
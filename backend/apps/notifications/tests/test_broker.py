@@ -0,0 +1,99 @@
+import asyncio
+import json
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.notifications import broker, views
+from apps.notifications.broker import InProcessBroker, RedisBroker
+
+# Nothing listens on port 1, so connecting fails straight away
+UNREACHABLE_REDIS_URL = 'redis://127.0.0.1:1/0'
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    async def test_messages_reach_only_the_users_streams(self):
+        hub = InProcessBroker()
+        first, second = await hub.subscribe('a'), await hub.subscribe('a')
+        other = await hub.subscribe('b')
+        hub.publish([('a', 'hello')])
+        self.assertEqual(await first.get(1), 'hello')
+        self.assertEqual(await second.get(1), 'hello')
+        self.assertIsNone(await other.get(0.01))
+
+        await hub.unsubscribe(first)
+        await hub.unsubscribe(second)
+        self.assertNotIn('a', hub.subscriptions)
+
+    @override_settings(NOTIFICATION_STREAM_QUEUE_SIZE=2)
+    async def test_full_queue_drops_the_oldest_message(self):
+        hub = InProcessBroker()
+        subscription = await hub.subscribe('a')
+        hub.publish([('a', 'first'), ('a', 'second'), ('a', 'third')])
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual([await subscription.get(1), await subscription.get(1)], ['second', 'third'])
+
+
+class UnreachableRedisTests(SimpleTestCase):
+    async def test_failed_connect_fails_every_waiting_stream_and_is_retried(self):
+        hub = RedisBroker(UNREACHABLE_REDIS_URL)
+        results = await asyncio.wait_for(
+            asyncio.gather(hub.subscribe('a'), hub.subscribe('b'), return_exceptions=True), 10
+        )
+        self.assertTrue(all(isinstance(result, Exception) for result in results))
+        self.assertIsNone(hub._ready)
+        self.assertEqual(hub.subscriptions, {})
+
+        with self.assertRaises(Exception):
+            await asyncio.wait_for(hub.subscribe('a'), 10)
+        self.assertIsNone(hub._ready)
+
+    async def test_stream_ends_with_unavailable(self):
+        user = mock.Mock(id='a')
+        with mock.patch.object(views, 'authenticate_stream', mock.AsyncMock(return_value=(user, 0))), \
+                mock.patch.object(views, 'get_broker', return_value=RedisBroker(UNREACHABLE_REDIS_URL)), \
+                self.assertLogs(views.logger, 'ERROR'):
+            response = await views.notification_stream(RequestFactory().get('/'))
+            chunks = await asyncio.wait_for(self.collect(response), 10)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(chunks[0].startswith(b'retry: '))
+        self.assertEqual(chunks[1:], [b'event: unavailable\ndata: {}\n\n'])
+
+    async def collect(self, response):
+        return [chunk async for chunk in response]
+
+
+class PublishTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(broker, 'get_broker')
+        self.hub = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def published(self):
+        (messages,), _ = self.hub.publish.call_args
+        return [(user_id, json.loads(message)) for user_id, message in messages]
+
+    def test_publish_sends_the_same_message_to_every_user(self):
+        broker.publish(['a', 'b'], 'read_all', {})
+        self.assertEqual(self.published(), [
+            ('a', {'event': 'read_all', 'data': {}}),
+            ('b', {'event': 'read_all', 'data': {}}),
+        ])
+
+    def test_publish_each_sends_every_user_their_own_data(self):
+        broker.publish_each('notification', {'a': {'id': 1}, 'b': {'id': 2}})
+        self.assertEqual(self.published(), [
+            ('a', {'event': 'notification', 'data': {'id': 1}}),
+            ('b', {'event': 'notification', 'data': {'id': 2}}),
+        ])
+
+    def test_nothing_is_sent_without_users(self):
+        broker.publish([], 'read_all', {})
+        broker.publish_each('notification', {})
+        self.hub.publish.assert_not_called()
+
+    def test_broker_failures_are_swallowed(self):
+        self.hub.publish.side_effect = ConnectionError
+        with self.assertLogs(broker.logger, 'ERROR'):
+            broker.publish(['a'], 'read_all', {})
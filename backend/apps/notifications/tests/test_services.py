@@ -0,0 +1,116 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+
+from apps.core.tests.factories import make_user
+from apps.notifications import broker, services
+from apps.notifications.models import Notification
+from apps.notifications.services import NotificationType, mark_all_read, mark_read, notify, unread_count
+
+
+class UnreadCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.other = make_user()
+
+    def setUp(self):
+        cache.clear()
+
+    def send(self, *recipients):
+        with self.captureOnCommitCallbacks(execute=True):
+            return notify([user.id for user in recipients], NotificationType.JOB_ALERT, 'New job', 'A job')
+
+    def test_counter_follows_notify_and_reads(self):
+        self.assertEqual(unread_count(self.user.id), 0)
+        self.assertEqual(self.send(self.user, self.user, self.other), 2)
+        self.send(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_count(self.user.id), 2)
+
+        notification = Notification.objects.filter(recipient=self.user).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(mark_read(self.user.id, notification.id))
+            self.assertFalse(mark_read(self.user.id, notification.id))
+        self.assertEqual(unread_count(self.user.id), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(mark_all_read(self.user.id), 1)
+        self.assertEqual(unread_count(self.user.id), 0)
+
+    def test_missing_counter_is_recounted(self):
+        self.send(self.user)
+        cache.delete(services.unread_key(self.user.id))
+        self.assertEqual(unread_count(self.user.id), 1)
+
+    def count_during(self, change):
+        """Run ``unread_count`` with ``change`` committed right after its COUNT query."""
+        count = QuerySet.count
+        changes = [change]
+
+        def count_then_change(queryset):
+            result = count(queryset)
+            while changes:
+                changes.pop()()
+            return result
+
+        with mock.patch.object(QuerySet, 'count', autospec=True, side_effect=count_then_change):
+            return unread_count(self.user.id)
+
+    def test_count_that_missed_a_notification_is_not_kept(self):
+        # The notification's increment finds no counter while the count runs
+        self.assertEqual(self.count_during(lambda: self.send(self.user)), 0)
+        self.assertIsNone(cache.get(services.unread_key(self.user.id)))
+        self.assertEqual(unread_count(self.user.id), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_count(self.user.id), 1)
+
+    def test_count_that_missed_a_read_is_not_kept(self):
+        self.send(self.user)
+        cache.delete(services.unread_key(self.user.id))
+        notification = Notification.objects.get(recipient=self.user)
+
+        def read():
+            with self.captureOnCommitCallbacks(execute=True):
+                mark_read(self.user.id, notification.id)
+
+        self.assertEqual(self.count_during(read), 1)
+        self.assertEqual(unread_count(self.user.id), 0)
+
+    def test_change_landing_after_the_recount_is_counted(self):
+        self.assertEqual(unread_count(self.user.id), 0)
+        self.send(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_count(self.user.id), 1)
+
+    @override_settings(NOTIFICATION_COUNTER_INCR_LIMIT=1)
+    def test_large_fan_out_drops_counters(self):
+        unread_count(self.user.id)
+        self.send(self.user, self.other)
+        self.assertIsNone(cache.get(services.unread_key(self.user.id)))
+        self.assertEqual(unread_count(self.user.id), 1)
+
+
+class NotifyEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.other = make_user()
+
+    def test_every_recipient_gets_their_own_notification(self):
+        with mock.patch.object(broker, 'get_broker') as get_broker:
+            with self.captureOnCommitCallbacks(execute=True):
+                notify([self.user.id, self.other.id], NotificationType.JOB_ALERT, 'New job', 'A job')
+        (messages,), _ = get_broker.return_value.publish.call_args
+        events = {user_id: json.loads(message) for user_id, message in messages}
+
+        self.assertEqual(set(events), {self.user.id, self.other.id})
+        for notification in Notification.objects.all():
+            event = events[notification.recipient_id]
+            self.assertEqual(event['event'], 'notification')
+            self.assertEqual(event['data']['id'], str(notification.id))
+            self.assertEqual(event['data']['title'], 'New job')
+            self.assertIsNotNone(event['data']['created_at'])
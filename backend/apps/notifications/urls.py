@@ -0,0 +1,18 @@
+from django.urls import path
+
+from apps.notifications.views import (
+    NotificationListView,
+    NotificationUnreadCountView,
+    NotificationMarkReadView,
+    NotificationMarkAllReadView,
+    notification_stream
+)
+
+
+urlpatterns = [
+    path('', view=NotificationListView.as_view(), name='notification-list'),
+    path('stream/', view=notification_stream, name='notification-stream'),
+    path('unread-count/', view=NotificationUnreadCountView.as_view(), name='notification-unread-count'),
+    path('read-all/', view=NotificationMarkAllReadView.as_view(), name='notification-read-all'),
+    path('<uuid:id>/read/', view=NotificationMarkReadView.as_view(), name='notification-read'),
+]
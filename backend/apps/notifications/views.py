@@ -0,0 +1,149 @@
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import generics, status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from apps.core.pagination import KeysetPagination
+from apps.notifications import services
+from apps.notifications.broker import get_broker
+from apps.notifications.models import Notification
+from apps.notifications.serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationListView(generics.ListAPIView):
+    """The user's notifications, newest first. ``?unread=true`` lists unread ones only."""
+    serializer_class = NotificationSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(recipient=self.request.user).select_related('content_type')
+        if self.request.query_params.get('unread', '').lower() in ('1', 'true'):
+            queryset = queryset.filter(is_read=False)
+        return queryset
+
+
+class NotificationUnreadCountView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        return Response({'unread_count': services.unread_count(request.user.id)}, status=status.HTTP_200_OK)
+
+
+class NotificationMarkReadView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, id):
+        if not services.mark_read(request.user.id, id):
+            if not Notification.objects.filter(id=id, recipient=request.user).exists():
+                return Response({'message': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'message': 'Notification marked as read.'}, status=status.HTTP_200_OK)
+
+
+class NotificationMarkAllReadView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        updated = services.mark_all_read(request.user.id)
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
+
+
+def load_stream_user(validated_token):
+    """
+    The token's user and their unread count. Runs in a worker thread and
+    closes its database connection, so idle streams don't each pin one.
+    """
+    try:
+        user = JWTAuthentication().get_user(validated_token)
+        if not user.is_active:
+            return None, 0
+        return user, services.unread_count(user.id)
+    except AuthenticationFailed:
+        return None, 0
+    finally:
+        connections.close_all()
+
+
+async def authenticate_stream(request):
+    """
+    The user for a stream request and their unread count. ``EventSource``
+    can't send headers, so the access token may also come as ``?token=``.
+    """
+    authenticator = JWTAuthentication()
+    raw_token = request.GET.get('token')
+    if raw_token is None:
+        header = authenticator.get_header(request)
+        raw_token = authenticator.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None, 0
+    try:
+        validated_token = authenticator.get_validated_token(raw_token)
+    except InvalidToken:
+        return None, 0
+    return await sync_to_async(load_stream_user)(validated_token)
+
+
+def sse_message(event, data):
+    return f'event: {event}\ndata: {data}\n\n'
+
+
+async def notification_stream(request):
+    """
+    Server-sent events for the current user: ``notification``, ``read``,
+    ``read_all`` and ``application`` events as they happen, an ``unread``
+    count on connect, and ``resync`` if events had to be dropped because the
+    client fell behind. Connections are closed after
+    ``NOTIFICATION_STREAM_MAX_SECONDS``; ``EventSource`` reconnects on its own.
+    If the broker can't be reached the stream sends ``unavailable`` and ends
+    right away, and clients poll the REST endpoints until a reconnect works.
+    """
+    user, unread = await authenticate_stream(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    async def events():
+        yield f'retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n'
+        try:
+            subscription = await get_broker().subscribe(user.id)
+        except Exception:
+            logger.exception("Could not subscribe a notification stream")
+            yield sse_message('unavailable', '{}')
+            return
+        try:
+            yield sse_message('unread', json.dumps({'unread_count': unread}))
+            deadline = time.monotonic() + settings.NOTIFICATION_STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                message = await subscription.get(timeout=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    yield sse_message('resync', '{}')
+                elif message is None:
+                    # Comment line: keeps proxies from timing out an idle connection
+                    yield ': heartbeat\n\n'
+                else:
+                    payload = json.loads(message)
+                    yield sse_message(payload['event'], json.dumps(payload['data']))
+        finally:
+            await get_broker().unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
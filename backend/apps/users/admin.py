@@ -54,11 +54,12 @@ class ProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'full_name', 'phone', 'is_phone_verified', 'location', 'current_title', 'get_skills',
                     'years_of_experience', 'desired_salary_min', 'desired_salary_max', 'resume', 'is_actively_looking', 'is_open_to_remote')
     list_filter = ('is_phone_verified',
-                   'is_actively_looking', 'is_open_to_remote')
+                   'is_actively_looking', 'is_open_to_remote', 'resume_parse_status')
     search_fields = ('full_name', 'phone', 'current_title',
                      'years_of_experience', 'desired_salary_min', 'desired_salary_max')
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'resume_parse_status', 'resume_parse_error',
+                       'resume_parsed_at', 'resume_parsed')
 
     fieldsets = (
         ("User", {
@@ -74,7 +75,8 @@ class ProfileAdmin(admin.ModelAdmin):
             'fields': ('desired_salary_min', 'desired_salary_max')
         }),
         ('Resume', {
-            'fields': ('resume', 'resume_text')
+            'fields': ('resume', 'resume_text', 'resume_parse_status', 'resume_parse_error',
+                       'resume_parsed_at', 'resume_parsed')
         }),
         ("Skills", {
             'fields': ('skills',)
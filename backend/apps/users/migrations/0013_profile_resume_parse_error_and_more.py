@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_profile_match_scores_changed_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='resume_parse_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='resume_parse_status',
+            field=models.CharField(blank=True, choices=[('PENDING', 'Pending'), ('SUCCESS', 'Success'), ('FAILED', 'Failed')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='resume_parsed',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='resume_parsed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
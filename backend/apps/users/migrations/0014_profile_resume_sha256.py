@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_profile_resume_parse_error_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='resume_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -44,17 +44,30 @@ class User(AbstractUser, TimeStampedModel):
     def __str__(self):
         return self.email
 
+    @property
+    def role_info(self):
+        from apps.users.services import RoleService
+        return RoleService.resolve(self)
+
     @property
     def is_job_seeker(self):
-        return hasattr(self, 'profile')
+        return self.role_info['is_job_seeker']
 
     @property
     def is_employer(self):
-        return self.companies.filter(is_deleted=False).exists() or self.experiences.filter(
-            company__isnull=False, is_current=True).exists()
+        return self.role_info['is_employer']
+
+    @property
+    def current_company_id(self):
+        return self.role_info['current_company_id']
 
 
 class Profile(TimeStampedModel):
+    class ResumeParseStatus(models.TextChoices):
+        PENDING = 'PENDING', _('Pending')
+        SUCCESS = 'SUCCESS', _('Success')
+        FAILED = 'FAILED', _('Failed')
+
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name='profile')
     full_name = models.CharField(max_length=255, blank=True, null=True)
@@ -69,6 +82,14 @@ class Profile(TimeStampedModel):
     desired_salary_max = models.IntegerField(blank=True, null=True)
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
     resume_text = models.TextField(blank=True)
+    # SHA-256 of the resume bytes, the key for the shared parse cache
+    resume_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    # Sections, detected skills, page count and parse duration from the last parse
+    resume_parsed = models.JSONField(default=dict, blank=True)
+    resume_parse_status = models.CharField(
+        max_length=20, choices=ResumeParseStatus.choices, blank=True)
+    resume_parse_error = models.TextField(blank=True)
+    resume_parsed_at = models.DateTimeField(blank=True, null=True)
     skills = models.ManyToManyField(
         'jobs.Skill', related_name='profiles', blank=True)
     is_actively_looking = models.BooleanField(default=True)
@@ -86,6 +107,9 @@ class Profile(TimeStampedModel):
         validators=[MinValueValidator(0), MaxValueValidator(100)]
     )
     visibility_settings = models.JSONField(default=dict, blank=True)
+    # Staleness watermark for this profile's MatchScore rows
+    match_scores_changed_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    match_scores_computed_at = models.DateTimeField(blank=True, null=True)
 
     def __str__(self):
         return f"{self.user.email}'s Profile"
@@ -0,0 +1,144 @@
+"""
+Resume text extraction.
+
+The uploaded PDF is copied from storage chunk by chunk into a spooled
+temporary file, so only ``RESUME_PARSE_SPOOL_BYTES`` are ever held in memory
+whatever the backend (local disk or S3). Pages are then extracted one at a
+time until the page or time budget for the document runs out.
+"""
+import re
+import tempfile
+import time
+
+from django.conf import settings
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+
+from apps.core.content_cache import ContentCache, hash_file
+from apps.jobs.taxonomy import extract_skills
+
+# Bump when the output of parse_resume_file changes so cached parses are ignored
+PARSER_VERSION = 2
+
+PDF_MAGIC = b'%PDF-'
+CHUNK_SIZE = 64 * 1024
+
+SECTION_HEADINGS = {
+    'summary': ('summary', 'profile', 'about me', 'objective', 'professional summary'),
+    'experience': ('experience', 'work experience', 'employment history', 'professional experience'),
+    'education': ('education', 'academic background', 'qualifications'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'technologies'),
+    'projects': ('projects', 'personal projects'),
+    'certifications': ('certifications', 'certificates', 'licenses'),
+}
+
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+HEADING_RE = re.compile(
+    r'^\s*(%s)\s*:?\s*$' % '|'.join(
+        re.escape(heading) for heading in sorted(_HEADING_TO_SECTION, key=len, reverse=True)
+    ),
+    re.IGNORECASE,
+)
+
+
+class ResumeParseError(Exception):
+    """The resume could not be read as a PDF."""
+
+
+# Parses keyed by file content, shared by profile resumes and application snapshots
+resume_cache = ContentCache('resume', version=PARSER_VERSION)
+
+
+def spool_file(field_file):
+    """Copy ``field_file`` into a seekable spooled temporary file without loading it whole."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=settings.RESUME_PARSE_SPOOL_BYTES)
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks(chunk_size=CHUNK_SIZE):
+            spooled.write(chunk)
+    finally:
+        field_file.close()
+    spooled.seek(0)
+    return spooled
+
+
+def extract_pages(stream, max_pages, deadline):
+    """
+    Return ``(pages, page_count)``: the text of each page read before hitting
+    ``max_pages`` or the ``deadline`` (a ``time.monotonic()`` value), and the
+    number of pages in the document.
+    """
+    if stream.read(len(PDF_MAGIC)) != PDF_MAGIC:
+        raise ResumeParseError('File is not a PDF')
+    stream.seek(0)
+
+    pages = []
+    try:
+        reader = PdfReader(stream)
+        page_count = len(reader.pages)
+        for page in reader.pages:
+            if len(pages) >= max_pages or time.monotonic() > deadline:
+                break
+            pages.append(page.extract_text() or '')
+    except PyPdfError as exc:
+        raise ResumeParseError(f'Unreadable PDF: {exc}') from exc
+    return pages, page_count
+
+
+def split_sections(text):
+    """Split resume text into ``{section: text}`` on common heading lines."""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        match = HEADING_RE.match(line)
+        if match:
+            current = _HEADING_TO_SECTION[match.group(1).lower()]
+            sections.setdefault(current, [])
+        elif current is not None and line.strip():
+            sections[current].append(line.strip())
+    return {section: '\n'.join(lines) for section, lines in sections.items()}
+
+
+def detect_skills(text):
+    """Return ``[{'id', 'name'}]`` for every known skill (or alias) mentioned in ``text``."""
+    return [{'id': str(skill.id), 'name': skill.name} for skill in extract_skills(text)]
+
+
+def parse_resume_file(field_file):
+    """
+    Extract text and structure from an uploaded resume.
+
+    Returns a dict with the plain ``text`` plus ``sections``, ``page_count``,
+    ``pages_parsed``, ``truncated`` and ``duration_ms``.
+    """
+    started = time.monotonic()
+    max_pages = settings.RESUME_PARSE_MAX_PAGES
+    deadline = started + settings.RESUME_PARSE_TIME_LIMIT
+
+    with spool_file(field_file) as stream:
+        pages, page_count = extract_pages(stream, max_pages, deadline)
+
+    text = '\n'.join(pages)
+    return {
+        'text': text,
+        'sections': split_sections(text),
+        'page_count': page_count,
+        'pages_parsed': len(pages),
+        'truncated': len(pages) < page_count,
+        'duration_ms': round((time.monotonic() - started) * 1000),
+    }
+
+
+def parse_resume_cached(field_file, digest=None):
+    """
+    Return ``(parsed, digest, hit)`` for ``field_file``, reusing the parse of any
+    earlier upload with the same SHA-256. ``parsed`` is a fresh copy that the
+    caller may modify. Skills are matched against the current taxonomy rather
+    than cached, so they pick up new skills and aliases.
+    """
+    digest = digest or hash_file(field_file)
+    parsed, hit = resume_cache.get_or_compute(digest, lambda: parse_resume_file(field_file))
+    parsed = dict(parsed, skills=detect_skills(parsed['text']))
+    return parsed, digest, hit
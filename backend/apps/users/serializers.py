@@ -95,8 +95,10 @@ class ProfileSerializer(serializers.ModelSerializer):
         model = Profile
         fields = ('id','full_name','headline','summary','phone','is_phone_verified','location','current_title',
                   'years_of_experience','desired_salary_min','desired_salary_max','resume',
-                  'resume_text','skills','is_actively_looking','is_open_to_remote', 'github_url','linkedin_url','twitter_url','instagram_url','website_url')
-        read_only_fields = ('id', 'is_phone_verified', 'full_name')
+                  'resume_text','resume_parsed','resume_parse_status','resume_parse_error','resume_parsed_at',
+                  'skills','is_actively_looking','is_open_to_remote', 'github_url','linkedin_url','twitter_url','instagram_url','website_url')
+        read_only_fields = ('id', 'is_phone_verified', 'full_name', 'resume_parsed', 'resume_parse_status',
+                            'resume_parse_error', 'resume_parsed_at')
 
     def update(self, instance, validated_data):
         skills = validated_data.pop('skills', [])
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class RoleService:
+    """
+    Resolves whether a user is an employer / job seeker and which company
+    they currently work at.
+
+    The result is memoized on the user instance (so it lives for a single
+    request) and stored in the shared cache under a per-user version number.
+    Bumping the version invalidates every cached entry for that user.
+    """
+    ATTR_NAME = '_resolved_role'
+
+    @staticmethod
+    def _version_key(user_id):
+        return f'user_role_version:{user_id}'
+
+    @staticmethod
+    def _role_key(user_id, version):
+        return f'user_role:{user_id}:v{version}'
+
+    @staticmethod
+    def get_version(user_id):
+        key = RoleService._version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, 1, timeout=None)
+            version = cache.get(key, 1)
+        return version
+
+    @staticmethod
+    def compute(user):
+        from apps.users.models import Profile
+
+        current_experience = user.experiences.filter(
+            is_current=True,
+            company__isnull=False
+        ).values('company_id').first()
+
+        owns_company = user.companies.filter(is_deleted=False).exists()
+
+        return {
+            'is_employer': owns_company or current_experience is not None,
+            'is_job_seeker': Profile.objects.filter(user_id=user.pk).exists(),
+            'current_company_id': str(current_experience['company_id']) if current_experience else None,
+        }
+
+    @staticmethod
+    def resolve(user):
+        """Return the role dict for ``user``, hitting the database at most once per request."""
+        resolved = user.__dict__.get(RoleService.ATTR_NAME)
+        if resolved is not None:
+            return resolved
+
+        version = RoleService.get_version(user.pk)
+        key = RoleService._role_key(user.pk, version)
+        resolved = cache.get(key)
+
+        if resolved is None:
+            resolved = RoleService.compute(user)
+            cache.set(key, resolved, timeout=settings.ROLE_CACHE_TIMEOUT)
+
+        user.__dict__[RoleService.ATTR_NAME] = resolved
+        return resolved
+
+    @staticmethod
+    def _bump_versions(user_ids):
+        for user_id in user_ids:
+            key = RoleService._version_key(user_id)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # No version stored yet, so nothing is cached under the old one either
+                cache.add(key, 1, timeout=None)
+
+    @staticmethod
+    def invalidate(*user_ids):
+        user_ids = {user_id for user_id in user_ids if user_id is not None}
+        if user_ids:
+            # After commit, so a request resolving the role meanwhile can't
+            # cache the pre-commit rows under the new version
+            transaction.on_commit(lambda: RoleService._bump_versions(user_ids))
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from apps.users.models import CompanyProfile, Experience, Profile
+from apps.users.services import RoleService
+
+
+@receiver(post_save, sender=CompanyProfile)
+def invalidate_role_on_company_save(sender, instance, **kwargs):
+    RoleService.invalidate(instance.user_id)
+
+
+@receiver(pre_delete, sender=CompanyProfile)
+def invalidate_role_on_company_delete(sender, instance, **kwargs):
+    # Employees' experiences are SET_NULL on delete, so collect them before the row goes away
+    employee_ids = Experience.objects.filter(company=instance).values_list('user_id', flat=True)
+    RoleService.invalidate(instance.user_id, *set(employee_ids))
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def invalidate_role_on_experience_change(sender, instance, **kwargs):
+    RoleService.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_role_on_profile_create(sender, instance, created, **kwargs):
+    # Only creation and deletion change whether the user is a job seeker
+    if created:
+        RoleService.invalidate(instance.user_id)
+
+
+@receiver(post_delete, sender=Profile)
+def invalidate_role_on_profile_delete(sender, instance, **kwargs):
+    RoleService.invalidate(instance.user_id)
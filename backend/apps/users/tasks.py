@@ -1,7 +1,11 @@
+import logging
+
 from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 
 from django.conf import settings
-from apps.users import utils
+from django.utils import timezone
+from apps.users import resume, utils
 from apps.users.models import Profile
 
 from django.core.files.storage import default_storage
@@ -9,9 +13,10 @@ from django.contrib.auth import get_user_model
 from apps.core.services import EmailService
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_welcome_email(user_id):
     try:
         user = User.objects.get(id=user_id)
@@ -20,7 +25,8 @@ def send_welcome_email(user_id):
         # Log this error ideally
         pass
 
-@shared_task
+# Verification emails block sign up, so they overtake bulk work on the io queue
+@shared_task(ignore_result=True, priority=9)
 def send_verification_email(user_id):
     try:
         user = User.objects.get(id=user_id)
@@ -29,7 +35,7 @@ def send_verification_email(user_id):
         # Log this error ideally
         pass
 
-@shared_task
+@shared_task(ignore_result=True, priority=9)
 def resend_verification_email(user_id):
     try:
         user = User.objects.get(id=user_id)
@@ -39,31 +45,50 @@ def resend_verification_email(user_id):
         pass
 
 
-@shared_task
+@shared_task(
+    ignore_result=True,
+    soft_time_limit=settings.RESUME_PARSE_TIME_LIMIT + 15,
+    time_limit=settings.RESUME_PARSE_TIME_LIMIT + 30,
+)
 def parse_resume(profile_id):
-    from pypdf import PdfReader
-    import io
+    """Extract text and structure from the profile's resume. Routed to the ``cpu`` queue."""
     try:
         profile = Profile.objects.get(id=profile_id)
+    except Profile.DoesNotExist:
+        return
 
-        if not profile.resume:
-            return
-        
-        file = io.BytesIO(profile.resume.read())
+    if not profile.resume:
+        return
 
-        pdf_reader = PdfReader(file)
-        text = ''
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        
-        profile.resume_text = text
-        profile.save(update_fields=['resume_text'])
-    
-    except Profile.DoesNotExist:
-        pass
-    except Exception:
-        pass
+    profiles = Profile.objects.filter(id=profile_id)
+    try:
+        parsed, digest, hit = resume.parse_resume_cached(profile.resume, profile.resume_sha256)
+    except (resume.ResumeParseError, SoftTimeLimitExceeded) as exc:
+        logger.warning(f"Failed to parse resume for profile {profile_id}: {exc}")
+        profiles.update(
+            resume_parse_status=Profile.ResumeParseStatus.FAILED,
+            resume_parse_error=str(exc) or exc.__class__.__name__,
+            resume_parsed_at=timezone.now(),
+        )
+        return
+    except Exception as exc:
+        logger.exception(f"Unexpected error parsing resume for profile {profile_id}")
+        profiles.update(
+            resume_parse_status=Profile.ResumeParseStatus.FAILED,
+            resume_parse_error=f"{exc.__class__.__name__}: {exc}",
+            resume_parsed_at=timezone.now(),
+        )
+        raise
+
+    if hit:
+        logger.info(f"Reused cached resume parse {digest} for profile {profile_id}")
 
-    except Exception as e:
-        raise e
-        raise Exception("Failed to parse resume")
\ No newline at end of file
+    # update() rather than save() so a concurrent profile edit isn't overwritten
+    profiles.update(
+        resume_sha256=digest,
+        resume_text=parsed.pop('text'),
+        resume_parsed=parsed,
+        resume_parse_status=Profile.ResumeParseStatus.SUCCESS,
+        resume_parse_error='',
+        resume_parsed_at=timezone.now(),
+    )
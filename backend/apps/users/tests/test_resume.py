@@ -0,0 +1,83 @@
+import io
+import time
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core.tests.factories import make_job_seeker, make_pdf, make_skill
+from apps.users import resume, tasks
+from apps.users.models import Profile
+
+RESUME = make_pdf('Summary', 'Backend developer', 'Skills', 'Python and PostgreSQL')
+
+
+class ResumeExtractionTests(SimpleTestCase):
+    def test_split_sections(self):
+        text = 'Jane Doe\nProfessional Summary:\nBackend developer\n\nWORK EXPERIENCE\nAcme\nBerlin'
+        self.assertEqual(
+            resume.split_sections(text),
+            {'summary': 'Backend developer', 'experience': 'Acme\nBerlin'},
+        )
+
+    def test_rejects_files_that_are_not_pdfs(self):
+        with self.assertRaises(resume.ResumeParseError):
+            resume.extract_pages(io.BytesIO(b'PK\x03\x04 not a pdf'), 10, time.monotonic() + 10)
+
+    def test_rejects_broken_pdfs(self):
+        with self.assertRaises(resume.ResumeParseError):
+            resume.extract_pages(io.BytesIO(b'%PDF-1.4\ngarbage'), 10, time.monotonic() + 10)
+
+    def test_stops_at_the_page_budget(self):
+        pages, page_count = resume.extract_pages(io.BytesIO(RESUME), 2, time.monotonic() + 10)
+        self.assertEqual(pages, ['Summary', 'Backend developer'])
+        self.assertEqual(page_count, 4)
+
+    def test_stops_at_the_deadline(self):
+        pages, page_count = resume.extract_pages(io.BytesIO(RESUME), 10, time.monotonic() - 1)
+        self.assertEqual((pages, page_count), ([], 4))
+
+    @override_settings(RESUME_PARSE_SPOOL_BYTES=16)
+    def test_parse_resume_file(self):
+        parsed = resume.parse_resume_file(ContentFile(RESUME, name='cv.pdf'))
+        self.assertEqual(parsed['sections'], {'summary': 'Backend developer', 'skills': 'Python and PostgreSQL'})
+        self.assertEqual((parsed['page_count'], parsed['pages_parsed'], parsed['truncated']), (4, 4, False))
+
+
+class ParseResumeTaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = make_skill('Python')
+        cls.postgres = make_skill('PostgreSQL')
+
+    def setUp(self):
+        cache.clear()
+
+    def profile_with_resume(self, content):
+        profile = Profile.objects.get(user=make_job_seeker())
+        profile.resume.save('cv.pdf', ContentFile(content))
+        return profile
+
+    def test_stores_text_sections_and_skills(self):
+        profile = self.profile_with_resume(RESUME)
+        tasks.parse_resume(profile.id)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.resume_parse_status, Profile.ResumeParseStatus.SUCCESS)
+        self.assertIn('Python and PostgreSQL', profile.resume_text)
+        self.assertNotIn('text', profile.resume_parsed)
+        self.assertEqual(profile.resume_parsed['sections']['summary'], 'Backend developer')
+        self.assertEqual(
+            {skill['name'] for skill in profile.resume_parsed['skills']},
+            {'Python', 'PostgreSQL'},
+        )
+        self.assertEqual(len(profile.resume_sha256), 64)
+
+    def test_records_failures(self):
+        profile = self.profile_with_resume(b'not a pdf at all')
+        tasks.parse_resume(profile.id)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.resume_parse_status, Profile.ResumeParseStatus.FAILED)
+        self.assertEqual(profile.resume_parse_error, 'File is not a PDF')
+        self.assertIsNotNone(profile.resume_parsed_at)
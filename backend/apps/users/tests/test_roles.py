@@ -0,0 +1,127 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.tests.factories import make_employer, make_job_seeker, make_skill, make_user
+from apps.jobs.models import Job
+from apps.users.models import Experience, User
+from apps.users.services import RoleService
+
+
+def hire(user, company):
+    return Experience.objects.create(
+        user=user, company=company, title='Recruiter',
+        start_date=datetime.date(2024, 1, 1), is_current=True,
+    )
+
+
+class RoleServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner, cls.company = make_employer()
+        cls.recruiter = make_user()
+        hire(cls.recruiter, cls.company)
+        cls.seeker = make_job_seeker()
+
+    def setUp(self):
+        cache.clear()
+
+    def fresh(self, user):
+        """The user as a new request would load it, without the per-request memo."""
+        return User.objects.get(pk=user.pk)
+
+    def test_resolves_roles(self):
+        # The current experience, company ownership and the profile
+        with self.assertNumQueries(3):
+            self.assertEqual(RoleService.resolve(self.fresh(self.owner)), {
+                'is_employer': True, 'is_job_seeker': False, 'current_company_id': None,
+            })
+        self.assertEqual(RoleService.resolve(self.fresh(self.recruiter)), {
+            'is_employer': True, 'is_job_seeker': False, 'current_company_id': str(self.company.id),
+        })
+        self.assertEqual(RoleService.resolve(self.fresh(self.seeker)), {
+            'is_employer': False, 'is_job_seeker': True, 'current_company_id': None,
+        })
+
+    def test_memoized_per_request(self):
+        user = self.fresh(self.recruiter)
+        RoleService.resolve(user)
+        cache.clear()
+        # Served from the instance, so neither the database nor the cache is needed
+        with self.assertNumQueries(0):
+            self.assertTrue(user.is_employer)
+            self.assertEqual(user.current_company_id, str(self.company.id))
+
+    def test_cached_across_requests(self):
+        RoleService.resolve(self.fresh(self.recruiter))
+        user = self.fresh(self.recruiter)
+        with self.assertNumQueries(0):
+            self.assertEqual(RoleService.resolve(user)['current_company_id'], str(self.company.id))
+
+    def test_changes_bump_the_version_on_commit(self):
+        RoleService.resolve(self.fresh(self.seeker))
+        version = RoleService.get_version(self.seeker.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            hire(self.seeker, self.company)
+        # Until the writer commits, requests keep the cached role
+        self.assertEqual(RoleService.get_version(self.seeker.pk), version)
+        user = self.fresh(self.seeker)
+        with self.assertNumQueries(0):
+            self.assertFalse(RoleService.resolve(user)['is_employer'])
+
+        for callback in callbacks:
+            callback()
+        self.assertGreater(RoleService.get_version(self.seeker.pk), version)
+        user = self.fresh(self.seeker)
+        with self.assertNumQueries(3):
+            self.assertEqual(RoleService.resolve(user), {
+                'is_employer': True, 'is_job_seeker': True, 'current_company_id': str(self.company.id),
+            })
+
+    def test_company_delete_drops_employees_roles(self):
+        RoleService.resolve(self.fresh(self.owner))
+        RoleService.resolve(self.fresh(self.recruiter))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.delete()
+        self.assertFalse(RoleService.resolve(self.fresh(self.owner))['is_employer'])
+        self.assertEqual(RoleService.resolve(self.fresh(self.recruiter)), {
+            'is_employer': False, 'is_job_seeker': False, 'current_company_id': None,
+        })
+
+
+class JobCreateCompanyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner, cls.company = make_employer()
+        cls.recruiter = make_user()
+        hire(cls.recruiter, cls.company)
+        cls.python = make_skill('Python')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def post_job(self, user):
+        self.client.force_authenticate(User.objects.get(pk=user.pk))
+        return self.client.post(reverse('job-list-create'), {
+            'title': 'Backend engineer', 'description': 'APIs', 'status': Job.Status.DRAFT,
+            'experience_level': Job.ExperienceLevel.MID, 'employment_type': Job.EmploymentType.FULL_TIME,
+            'skill_ids': [str(self.python.id)],
+        }, format='json')
+
+    def test_job_is_posted_for_the_current_company(self):
+        with mock.patch.object(RoleService, 'compute', side_effect=RoleService.compute) as compute:
+            response = self.post_job(self.recruiter)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Job.objects.get(pk=response.data['id']).company_id, self.company.id)
+        # IsEmployer and perform_create share the request's resolved role
+        compute.assert_called_once()
+
+    def test_owner_without_a_current_position_cannot_post(self):
+        response = self.post_job(self.owner)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('company', response.data)
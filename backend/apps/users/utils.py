@@ -1,10 +1,5 @@
 import jwt
 import uuid
-import io
-
-import PyPDF2
-import pypdf
-from google import genai
 
 from datetime import datetime, timedelta
 from django.conf import settings
@@ -13,9 +8,6 @@ from django.utils import timezone
 from rest_framework.exceptions import AuthenticationFailed
 
 
-client = genai.Client(api_key=settings.GOOGLE_API_KEY)
-
-
 def generate_verification_token(user_id, expires_in_hours=settings.EMAIL_VERIFICATION_TOKEN_DURATION_HOURS):
     """Generate a jwt token with expiry for email verification"""
     payload = {
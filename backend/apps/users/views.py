@@ -12,6 +12,7 @@ from django.utils import timezone
 
 from apps.core.serializers import ResponseSerializer
 from apps.core.permissions import IsEmployer
+from apps.core.content_cache import hash_file
 
 from apps.users.serializers import (
     SignUpSerializer, UserSerializer, LoginRequestSerializer, LogoutRequestSerializer, UserVerifyRequest,
@@ -232,6 +233,10 @@ class PofileCreateView(viewsets.ViewSet):
         serializer.is_valid(raise_exception=True)
         skills = serializer.validated_data.pop('skills', [])
 
+        if serializer.validated_data.get('resume'):
+            serializer.validated_data['resume_parse_status'] = Profile.ResumeParseStatus.PENDING
+            serializer.validated_data['resume_sha256'] = hash_file(serializer.validated_data['resume'])
+
         profile = Profile.objects.create(
             user=user,
             full_name=f"{user.first_name} {user.last_name}",
@@ -260,6 +265,19 @@ class ProfileRetrieveUpdateView(generics.RetrieveUpdateAPIView):
         except Profile.DoesNotExist:
             raise ValidationError("Profile does not exist")
 
+    def perform_update(self, serializer):
+        resume_file = serializer.validated_data.get('resume')
+        if not resume_file:
+            serializer.save()
+            return
+
+        profile = serializer.save(
+            resume_sha256=hash_file(resume_file),
+            resume_parse_status=Profile.ResumeParseStatus.PENDING,
+            resume_parse_error=''
+        )
+        tasks.parse_resume.delay_on_commit(profile.id)
+
 
 class ExperienceView(generics.ListCreateAPIView):
     queryset = Experience.objects.all()
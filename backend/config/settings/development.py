@@ -12,6 +12,8 @@ MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
 
 INTERNAL_IPS = ['127.0.0.1', 'localhost']
 
+REQUEST_METRICS_SERVER_TIMING = env.bool('REQUEST_METRICS_SERVER_TIMING', default=True)
+
 # Celery in eager mode for development (tasks run synchronously)
 CELERY_TASK_ALWAYS_EAGER = False  # Set to True to run tasks synchronously
 CELERY_TASK_EAGER_PROPAGATES = True
\ No newline at end of file
@@ -30,7 +30,8 @@ if env('SENTRY_DSN', default=''):
     sentry_sdk.init(
         dsn=env('SENTRY_DSN'),
         integrations=[DjangoIntegration()],
-        traces_sample_rate=1.0,
+        # Request timings come from RequestMetricsMiddleware; traces are a small sample
+        traces_sample_rate=env.float('SENTRY_TRACES_SAMPLE_RATE', default=0.05),
         send_default_pii=True
     )
 
@@ -47,3 +48,6 @@ CACHES = {
         'LOCATION': env('REDIS_URL', default='redis://redis:6379/1'),
     }
 }
+
+# Notification streams fan out through Redis pub/sub across ASGI workers
+NOTIFICATION_STREAM_REDIS_URL = env('NOTIFICATION_STREAM_REDIS_URL', default=env('REDIS_URL', default='redis://redis:6379/1'))
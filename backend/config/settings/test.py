@@ -0,0 +1,39 @@
+# config/settings/test.py
+# Used with DJANGO_ENV=test, e.g. `DJANGO_ENV=test python manage.py test`
+from .base import *
+
+DEBUG = False
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Tasks run inline; the broker is never contacted
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
+# No Elasticsearch: index updates are skipped and search uses Postgres
+ELASTICSEARCH_ENABLED = False
+ELASTICSEARCH_DSL_AUTOSYNC = False
+ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = 'django_elasticsearch_dsl.signals.BaseSignalProcessor'
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+STORAGES['default'] = {'BACKEND': 'django.core.files.storage.InMemoryStorage'}
+
+AI_BACKEND = 'stub'
+AI_STUB_LATENCY_MS = 0
+
+# Counter and metrics timers would flush from another thread, outside the test transaction
+COUNTER_FLUSH_SECONDS = 60 * 60
+TASK_METRICS_FLUSH_SECONDS = 60 * 60
+REQUEST_METRICS_FLUSH_SECONDS = 60 * 60
+
+# Metrics rows would be flushed at arbitrary points and upset query counts
+TASK_METRICS_ENABLED = False
+REQUEST_METRICS_SAMPLE_RATE = 0.0
+REQUEST_PROFILE_SAMPLE_RATE = 0.0
@@ -27,6 +27,7 @@ urlpatterns = [
     path('api/v1/jobs/', include('apps.jobs.urls')),
     path('api/v1/core/', include('apps.core.urls')),
     path('api/v1/applications/', include('apps.applications.urls')),
+    path('api/v1/notifications/', include('apps.notifications.urls')),
 
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/schema/docs/',